@@ -12,7 +12,7 @@ setup(
     author_email="your.email@company.com",
     packages=find_packages(where="src"),
     package_dir={"": "src"},
-    python_requires=">=3.10",
+    python_requires=">=3.11",
     install_requires=[
         "python-dateutil>=2.8.2",
         "pyyaml>=6.0",
@@ -49,7 +49,6 @@ setup(
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Manufacturing",
         "Topic :: Scientific/Engineering :: Information Analysis",
-        "Programming Language :: Python :: 3.10",
         "Programming Language :: Python :: 3.11",
         "Programming Language :: Python :: 3.12",
     ],
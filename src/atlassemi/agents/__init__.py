@@ -1,4 +1,10 @@
-"""Agents module for ATLASsemi."""
+"""Agents module for ATLASsemi.
+
+Agent classes are imported on first access (PEP 562), so importing one
+agent does not pay the import cost of the others.
+"""
+
+import importlib
 
 from .base import (
     BaseAgent,
@@ -7,10 +13,22 @@ from .base import (
     ProblemMode,
     SecurityTier
 )
-from .narrative_agent import NarrativeAgent, NarrativeAnalysis
-from .clarification_agent import ClarificationAgent, ClarificationSet
-from .analysis_agent import AnalysisAgent, EightDReport, EightDPhaseAnalysis
-from .prevention_agent import PreventionAgent
+
+# Lazily exported name -> defining submodule
+_LAZY_EXPORTS = {
+    "NarrativeAgent": ".narrative_agent",
+    "NarrativeAnalysis": ".narrative_agent",
+    "ClarificationAgent": ".clarification_agent",
+    "ClarificationSet": ".clarification_agent",
+    "AnalysisAgent": ".analysis_agent",
+    "EightDReport": ".analysis_agent",
+    "EightDPhaseAnalysis": ".analysis_agent",
+    "PreventionAgent": ".prevention_agent",
+    "run_pipeline": ".pipeline",
+    "ActionCache": ".cache",
+    "MemoryActionCache": ".cache",
+    "SQLiteActionCache": ".cache"
+}
 
 __all__ = [
     "BaseAgent",
@@ -25,5 +43,24 @@ __all__ = [
     "AnalysisAgent",
     "EightDReport",
     "EightDPhaseAnalysis",
-    "PreventionAgent"
+    "PreventionAgent",
+    "run_pipeline",
+    "ActionCache",
+    "MemoryActionCache",
+    "SQLiteActionCache"
 ]
+
+
+def __getattr__(name):
+    """Import a lazily exported name on first access."""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
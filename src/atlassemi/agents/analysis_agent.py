@@ -5,100 +5,24 @@ Maps problem to 8D methodology and performs structured analysis
 with LLM + knowledge graph integration.
 """
 
-from typing import Dict, Any, List, Optional
+import json
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
+from types import MappingProxyType
 
-from .base import BaseAgent, AgentInput, AgentOutput, ProblemMode
+from .base import (
+    BaseAgent,
+    AgentInput,
+    AgentOutput,
+    ProblemMode,
+    STRING_LIST_SCHEMA,
+    format_list,
+    json_object_schema
+)
 
 
-@dataclass
-class EightDPhaseAnalysis:
-    """Analysis for a single 8D phase."""
-
-    phase: str  # D0-D8
-    title: str
-    findings: List[str]
-    recommendations: List[str]
-    confidence: str  # "high", "medium", "low"
-    data_sources: List[str]
-
-
-@dataclass
-class EightDReport:
-    """Complete 8D analysis report."""
-
-    phases: List[EightDPhaseAnalysis] = field(default_factory=list)
-    facts: List[str] = field(default_factory=list)
-    hypotheses: List[str] = field(default_factory=list)
-    gaps: List[str] = field(default_factory=list)  # What's missing
-    next_steps: List[str] = field(default_factory=list)
-
-
-class AnalysisAgent(BaseAgent):
-    """
-    Phase 2: Structured 8D Analysis Agent
-
-    Purpose:
-    - Map problem to 8D methodology (D0-D8)
-    - Separate facts from hypotheses
-    - Query knowledge graph for similar cases
-    - Generate structured analysis report
-
-    8D Phases:
-    - D0: Preparation (problem detection, team formation trigger)
-    - D1: Team (who should be involved - recommend expertise)
-    - D2: Problem Definition (scope, timeline, impact)
-    - D3: Interim Containment (stop the bleeding now)
-    - D4: Root Cause Analysis (why did this happen)
-    - D5: Permanent Corrective Actions (fix the root cause)
-    - D6: Validation (prove the fix works)
-    - D7: Prevention (how to avoid this systemically)
-    - D8: Lessons Learned (document and share)
-    """
-
-    def __init__(self, model_router=None):
-        super().__init__(agent_type="analysis", model_router=model_router)
-
-    def generate_prompt(self, agent_input: AgentInput) -> str:
-        """
-        Generate 8D analysis prompt.
-
-        Args:
-            agent_input: Contains narrative + clarifications
-
-        Returns:
-            Prompt for comprehensive 8D analysis
-        """
-        mode = agent_input.mode
-        narrative = agent_input.context.get('narrative', '')
-        narrative_analysis = agent_input.context.get('narrative_analysis', {})
-        clarifications = agent_input.context.get('clarifications', {})
-
-        # Extract context
-        observations = narrative_analysis.get('observations', [])
-        suspected_causes = narrative_analysis.get('suspected_causes', [])
-        constraints = narrative_analysis.get('constraints', [])
-
-        prompt = f"""You are a semiconductor fab problem-solving expert conducting an 8D analysis.
-
-**Problem Mode:** {mode.value}
-
-**User Narrative:**
-{narrative}
-
-**Observations (Facts):**
-{self._format_list(observations)}
-
-**Suspected Causes (Hypotheses to validate):**
-{self._format_list(suspected_causes)}
-
-**Constraints:**
-{self._format_list(constraints)}
-
-**Clarifications:**
-{self._format_clarifications(clarifications)}
-
-**Your Task:**
+# Instructions shared by every 8D analysis prompt
+_8D_INTRO = """**Your Task:**
 
 Conduct a structured 8D (Eight Disciplines) analysis of this problem.
 
@@ -110,55 +34,71 @@ For each applicable 8D phase, provide:
 
 **8D Phases to Address:**
 
-**D0: Preparation**
+"""
+
+# Per-phase instructions (in phase order)
+_8D_PHASE_SECTIONS = {
+    "D0": """**D0: Preparation**
 - How was this detected? (SPC alert, defect inspection, customer complaint)
 - What triggered the investigation?
 - Urgency assessment
 
-**D1: Team**
+""",
+    "D1": """**D1: Team**
 - Who should be involved? (process engineer, equipment engineer, yield, quality)
 - What expertise is needed?
 - Who owns which parts of the investigation?
 
-**D2: Problem Definition**
+""",
+    "D2": """**D2: Problem Definition**
 - WHAT is the problem? (specific symptom)
 - WHERE is it occurring? (tool, chamber, product, step)
 - WHEN did it start? (timeline, first occurrence)
 - HOW BIG is it? (magnitude, impact, scope)
 - IS vs IS NOT analysis
 
-**D3: Interim Containment Actions**
+""",
+    "D3": """**D3: Interim Containment Actions**
 - What can we do NOW to stop the bleeding?
 - Lot holds? Tool holds? Rework?
 - How to prevent more defects before root cause is found?
 
-**D4: Root Cause Analysis**
+""",
+    "D4": """**D4: Root Cause Analysis**
 - Why did this happen? (5 Whys, fishbone)
 - Potential root causes (ranked by likelihood)
 - Data needed to validate each hypothesis
 - What experiments or analyses to run?
 
-**D5: Permanent Corrective Actions** (if root cause is clear)
+""",
+    "D5": """**D5: Permanent Corrective Actions** (if root cause is clear)
 - How to fix the root cause permanently?
 - Recipe changes? Tool fixes? Process improvements?
 - Implementation plan
 
-**D6: Validation** (if corrective action is proposed)
+""",
+    "D6": """**D6: Validation** (if corrective action is proposed)
 - How to prove the fix works?
 - Test plan, acceptance criteria
 - Monitoring plan
 
-**D7: Prevention**
+""",
+    "D7": """**D7: Prevention**
 - How to prevent this systemically?
 - SOP updates? Preventive maintenance? Automated checks?
 - Process control improvements
 
-**D8: Lessons Learned**
+""",
+    "D8": """**D8: Lessons Learned**
 - What should be documented?
 - What should be shared with the team?
 - Knowledge base updates
 
-**Important Guidelines:**
+"""
+}
+
+# Guidelines and output schema shared by every 8D analysis prompt
+_8D_OUTPUT_SPEC = """**Important Guidelines:**
 - Separate FACTS (what we know for sure) from HYPOTHESES (what we suspect)
 - Be explicit about confidence levels (high/medium/low)
 - Identify gaps (what data is missing)
@@ -167,47 +107,310 @@ For each applicable 8D phase, provide:
 **Output Format:**
 
 Return JSON:
-{{
+{
   "phases": [
-    {{
+    {
       "phase": "D0",
       "title": "Preparation",
       "findings": [...],
       "recommendations": [...],
       "confidence": "high|medium|low",
       "data_sources": [...]
-    }},
+    },
     ...
   ],
   "facts": [...],  // Confirmed facts only
   "hypotheses": [...],  // Unconfirmed theories
   "gaps": [...],  // Missing information
   "next_steps": [...]  // Immediate actions
-}}
+}
 """
 
-        return prompt
 
-    def _format_list(self, items: List[str]) -> str:
-        """Format list for prompt."""
-        if not items:
-            return "- (None provided)"
-        return "\n".join([f"- {item}" for item in items])
+def _build_8d_body(skip: Tuple[str, ...] = ()) -> str:
+    """Assemble the static prompt body, leaving out the phases in skip."""
+    return _8D_INTRO + "".join(
+        section for phase, section in _8D_PHASE_SECTIONS.items()
+        if phase not in skip
+    ) + _8D_OUTPUT_SPEC
+
+
+# Static prompt body per mode: improvement work rarely needs interim
+# containment (D3), and operations issues rarely reach permanent
+# corrective action and validation (D5/D6)
+_TPL_EXCURSION = _build_8d_body()
+_TPL_IMPROVEMENT = _build_8d_body(skip=("D3",))
+_TPL_OPERATIONS = _build_8d_body(skip=("D5", "D6"))
+
+_MODE_TEMPLATES = MappingProxyType({
+    ProblemMode.EXCURSION: _TPL_EXCURSION,
+    ProblemMode.IMPROVEMENT: _TPL_IMPROVEMENT,
+    ProblemMode.OPERATIONS: _TPL_OPERATIONS
+})
+
+# Opening of the prompt per mode (static, so part of the system prompt)
+_INTROS = MappingProxyType({
+    mode: "You are a semiconductor fab problem-solving expert conducting "
+    f"an 8D analysis.\n\n**Problem Mode:** {mode.value}\n\n"
+    for mode in ProblemMode
+})
+
+# System prompt per mode when split (built once rather than on every call)
+_SYSTEM_PROMPTS = MappingProxyType({
+    mode: _INTROS[mode] + _MODE_TEMPLATES.get(mode, _TPL_EXCURSION)
+    for mode in ProblemMode
+})
+
+# Structure of the LLM response (see _8D_OUTPUT_SPEC)
+_RESPONSE_SCHEMA = json_object_schema({
+    "phases": {"type": "array", "items": json_object_schema({
+        "phase": {"type": "string"},
+        "title": {"type": "string"},
+        "findings": STRING_LIST_SCHEMA,
+        "recommendations": STRING_LIST_SCHEMA,
+        "confidence": {"type": "string", "enum": ["high", "medium", "low"]},
+        "data_sources": STRING_LIST_SCHEMA
+    })},
+    "facts": STRING_LIST_SCHEMA,
+    "hypotheses": STRING_LIST_SCHEMA,
+    "gaps": STRING_LIST_SCHEMA,
+    "next_steps": STRING_LIST_SCHEMA
+})
+
+
+# Static opening of every rendered 8D report
+_REPORT_HEADER = "# 8D Analysis Report (Phase 2)\n\n---\n"
+
+
+def _phase_block(phase: "EightDPhaseAnalysis") -> str:
+    """
+    Render one 8D phase section of the report.
+
+    Args:
+        phase: Phase analysis to render
+
+    Returns:
+        Section text (joined once, without trailing newline)
+    """
+    lines = [
+        f"## {phase.phase}: {phase.title}",
+        "",
+        f"**Confidence:** {phase.confidence}",
+        ""
+    ]
+    ex = lines.extend
+
+    if phase.findings:
+        ex(("**Findings:**", *(f"- {f}" for f in phase.findings), ""))
+
+    if phase.recommendations:
+        ex((
+            "**Recommendations:**",
+            *(f"- {rec}" for rec in phase.recommendations),
+            ""
+        ))
+
+    if phase.data_sources:
+        ex(("**Data Sources:**", *(f"- {ds}" for ds in phase.data_sources), ""))
+
+    ex(("---", ""))
+    return "\n".join(lines)
+
+
+def _summary_block(report: "EightDReport") -> str:
+    """
+    Render the facts / hypotheses / gaps / next steps sections.
+
+    Args:
+        report: Report to summarize
+
+    Returns:
+        Summary text, or "" if the report has no summary items
+    """
+    lines = []
+    ex = lines.extend
+
+    if report.facts:
+        ex(("## Confirmed Facts", "", *(f"✓ {fact}" for fact in report.facts), ""))
+
+    if report.hypotheses:
+        ex((
+            "## Hypotheses to Validate",
+            "",
+            *(f"? {hyp}" for hyp in report.hypotheses),
+            ""
+        ))
+
+    if report.gaps:
+        ex(("## Information Gaps", "", *(f"⚠ {gap}" for gap in report.gaps), ""))
+
+    if report.next_steps:
+        ex((
+            "## Recommended Next Steps",
+            "",
+            *(f"{i}. {step}" for i, step in enumerate(report.next_steps, 1)),
+            ""
+        ))
+
+    return "\n".join(lines)
+
+
+@dataclass(slots=True)
+class EightDPhaseAnalysis:
+    """Analysis for a single 8D phase."""
+
+    # Defaults apply to keys missing from the LLM response
+    phase: str = ""  # D0-D8
+    title: str = ""
+    findings: List[str] = field(default_factory=list)
+    recommendations: List[str] = field(default_factory=list)
+    confidence: str = "low"  # "high", "medium", "low"
+    data_sources: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class EightDReport:
+    """Complete 8D analysis report."""
+
+    phases: List[EightDPhaseAnalysis] = field(default_factory=list)
+    facts: List[str] = field(default_factory=list)
+    hypotheses: List[str] = field(default_factory=list)
+    gaps: List[str] = field(default_factory=list)  # What's missing
+    next_steps: List[str] = field(default_factory=list)
+
+
+def _report_from_dict(report_dict: Dict[str, Any]) -> EightDReport:
+    """
+    Build an 8D report from a parsed JSON response.
+
+    Args:
+        report_dict: Parsed LLM response
+
+    Returns:
+        EightDReport (missing keys take the dataclass defaults)
+    """
+    phases = [
+        EightDPhaseAnalysis(
+            phase=phase_dict.get("phase", ""),
+            title=phase_dict.get("title", ""),
+            findings=phase_dict.get("findings", []),
+            recommendations=phase_dict.get("recommendations", []),
+            confidence=phase_dict.get("confidence", "low"),
+            data_sources=phase_dict.get("data_sources", [])
+        )
+        for phase_dict in report_dict.get("phases", [])
+    ]
+
+    return EightDReport(
+        phases=phases,
+        facts=report_dict.get("facts", []),
+        hypotheses=report_dict.get("hypotheses", []),
+        gaps=report_dict.get("gaps", []),
+        next_steps=report_dict.get("next_steps", [])
+    )
+
+
+class AnalysisAgent(BaseAgent):
+    """
+    Phase 2: Structured 8D Analysis Agent
+
+    Purpose:
+    - Map problem to 8D methodology (D0-D8)
+    - Separate facts from hypotheses
+    - Query knowledge graph for similar cases
+    - Generate structured analysis report
+
+    8D Phases:
+    - D0: Preparation (problem detection, team formation trigger)
+    - D1: Team (who should be involved - recommend expertise)
+    - D2: Problem Definition (scope, timeline, impact)
+    - D3: Interim Containment (stop the bleeding now)
+    - D4: Root Cause Analysis (why did this happen)
+    - D5: Permanent Corrective Actions (fix the root cause)
+    - D6: Validation (prove the fix works)
+    - D7: Prevention (how to avoid this systemically)
+    - D8: Lessons Learned (document and share)
+    """
+
+    dependencies = frozenset({"narrative", "clarification"})
+    response_schema = _RESPONSE_SCHEMA
+    response_type = EightDReport
+
+    def __init__(
+        self,
+        model_router=None,
+        response_cache=None,
+        enable_cache=True,
+        action_cache=None
+    ):
+        super().__init__(
+            agent_type="analysis",
+            model_router=model_router,
+            response_cache=response_cache,
+            enable_cache=enable_cache,
+            action_cache=action_cache
+        )
+
+    def generate_prompt(self, agent_input: AgentInput) -> str:
+        """
+        Generate 8D analysis prompt.
+
+        Args:
+            agent_input: Contains narrative + clarifications
+
+        Returns:
+            Prompt for comprehensive 8D analysis
+        """
+        mode = agent_input.mode
+        return (
+            _INTROS[mode]
+            + self._format_problem(agent_input)
+            + _MODE_TEMPLATES.get(mode, _TPL_EXCURSION)
+        )
+
+    def split_prompt(self, agent_input: AgentInput) -> Tuple[Optional[str], str]:
+        """Static intro and 8D instructions as system prompt, problem as prompt."""
+        return _SYSTEM_PROMPTS[agent_input.mode], self._format_problem(agent_input)
+
+    def _format_problem(self, agent_input: AgentInput) -> str:
+        """Format the per-request part of the prompt (narrative + context)."""
+        narrative = agent_input.context.get('narrative', '')
+        narrative_analysis = agent_input.context.get('narrative_analysis', {})
+        clarifications = agent_input.context.get('clarifications', {})
+
+        # Extract context
+        observations = narrative_analysis.get('observations', [])
+        suspected_causes = narrative_analysis.get('suspected_causes', [])
+        constraints = narrative_analysis.get('constraints', [])
+
+        return f"""**User Narrative:**
+{narrative}
+
+**Observations (Facts):**
+{format_list(observations)}
+
+**Suspected Causes (Hypotheses to validate):**
+{format_list(suspected_causes)}
+
+**Constraints:**
+{format_list(constraints)}
+
+**Clarifications:**
+{self._format_clarifications(clarifications)}
+
+"""
 
     def _format_clarifications(self, clarifications: Dict[str, Any]) -> str:
         """Format clarifications for prompt."""
         if not clarifications:
             return "(None provided)"
 
-        lines = []
-        for key, qa in clarifications.get('clarifications', {}).items():
-            q = qa.get('question', '')
-            a = qa.get('answer', '')
-            lines.append(f"**Q:** {q}")
-            lines.append(f"**A:** {a}")
-            lines.append("")
+        text = "\n".join(
+            f"**Q:** {qa.get('question', '')}\n**A:** {qa.get('answer', '')}\n"
+            for qa in clarifications.get('clarifications', {}).values()
+        )
 
-        return "\n".join(lines) if lines else "(None provided)"
+        return text or "(None provided)"
 
     def process_response(
         self,
@@ -224,40 +427,20 @@ Return JSON:
         Returns:
             AgentOutput with 8D analysis
         """
-        import json
-
         try:
-            report_dict = json.loads(response)
+            parsed, warnings = self._parse_json_response(response)
+            report = (
+                parsed if isinstance(parsed, EightDReport)
+                else _report_from_dict(parsed)
+            )
         except json.JSONDecodeError:
+            warnings = ("Response was not valid JSON",)
             # Fallback if JSON parsing fails
-            report_dict = {
-                "phases": [],
-                "facts": ["Unable to parse 8D analysis"],
-                "hypotheses": [],
-                "gaps": ["JSON parsing failed"],
-                "next_steps": ["Re-run analysis"]
-            }
-
-        # Create 8D report
-        report = EightDReport()
-
-        # Parse phases
-        for phase_dict in report_dict.get("phases", []):
-            phase_analysis = EightDPhaseAnalysis(
-                phase=phase_dict.get("phase", ""),
-                title=phase_dict.get("title", ""),
-                findings=phase_dict.get("findings", []),
-                recommendations=phase_dict.get("recommendations", []),
-                confidence=phase_dict.get("confidence", "low"),
-                data_sources=phase_dict.get("data_sources", [])
+            report = EightDReport(
+                facts=["Unable to parse 8D analysis"],
+                gaps=["JSON parsing failed"],
+                next_steps=["Re-run analysis"]
             )
-            report.phases.append(phase_analysis)
-
-        # Extract summary lists
-        report.facts = report_dict.get("facts", [])
-        report.hypotheses = report_dict.get("hypotheses", [])
-        report.gaps = report_dict.get("gaps", [])
-        report.next_steps = report_dict.get("next_steps", [])
 
         # Format for output
         content = self._format_report(report)
@@ -276,79 +459,22 @@ Return JSON:
             facts=report.facts,
             hypotheses=report.hypotheses,
             open_questions=report.gaps,
-            cost_usd=0.0  # Will be updated by caller
+            cost_usd=0.0,  # Will be updated by caller
+            warnings=warnings
         )
 
     def _format_report(self, report: EightDReport) -> str:
         """Format 8D report for display."""
 
-        lines = [
-            "# 8D Analysis Report (Phase 2)",
-            "",
-            "---",
-            ""
-        ]
-
-        # Phases
-        for phase in report.phases:
-            lines.extend([
-                f"## {phase.phase}: {phase.title}",
-                "",
-                f"**Confidence:** {phase.confidence}",
-                ""
-            ])
-
-            if phase.findings:
-                lines.append("**Findings:**")
-                for finding in phase.findings:
-                    lines.append(f"- {finding}")
-                lines.append("")
-
-            if phase.recommendations:
-                lines.append("**Recommendations:**")
-                for rec in phase.recommendations:
-                    lines.append(f"- {rec}")
-                lines.append("")
-
-            if phase.data_sources:
-                lines.append("**Data Sources:**")
-                for ds in phase.data_sources:
-                    lines.append(f"- {ds}")
-                lines.append("")
-
-            lines.append("---")
-            lines.append("")
-
-        # Summary sections
-        if report.facts:
-            lines.append("## Confirmed Facts")
-            lines.append("")
-            for fact in report.facts:
-                lines.append(f"✓ {fact}")
-            lines.append("")
-
-        if report.hypotheses:
-            lines.append("## Hypotheses to Validate")
-            lines.append("")
-            for hyp in report.hypotheses:
-                lines.append(f"? {hyp}")
-            lines.append("")
-
-        if report.gaps:
-            lines.append("## Information Gaps")
-            lines.append("")
-            for gap in report.gaps:
-                lines.append(f"⚠ {gap}")
-            lines.append("")
-
-        if report.next_steps:
-            lines.append("## Recommended Next Steps")
-            lines.append("")
-            for i, step in enumerate(report.next_steps, 1):
-                lines.append(f"{i}. {step}")
-            lines.append("")
-
-        return "\n".join(lines)
+        # One pre-joined block per section, joined once at the end
+        blocks = [_REPORT_HEADER]
+        blocks.extend(_phase_block(phase) for phase in report.phases)
+
+        summary = _summary_block(report)
+        if summary:
+            blocks.append(summary)
+
+        return "\n".join(blocks)
 
     def get_max_tokens(self) -> int:
         """8D analysis needs larger token budget."""
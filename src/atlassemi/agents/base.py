@@ -5,11 +5,133 @@ All specialized agents (narrative, clarification, analysis, prevention)
 inherit from BaseAgent.
 """
 
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, field
+import asyncio
+import functools
+import hashlib
+import json
+import re
+import reprlib
+from collections import OrderedDict
+from typing import (
+    Any, AsyncIterator, Callable, Dict, FrozenSet, Generator, Iterator, List,
+    Mapping, Optional, Sequence, Tuple
+)
+from dataclasses import dataclass, field, fields, is_dataclass, replace
 from abc import ABC, abstractmethod
 from enum import Enum
 
+try:
+    import ahocorasick
+except ImportError:  # Optional: single-pass 8D keyword scan
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON parsing of LLM responses
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # Optional: decode LLM responses straight into types
+    msgspec = None
+
+from atlassemi.telemetry import COUNTERS
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+# handle parse failures the same way with either parser
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Default cap on concurrent LLM calls in aexecute_batch()
+MAX_CONCURRENT_LLM_CALLS = 5
+
+# Model task type used for each agent type (default: "reasoning")
+_TASK_TYPE_MAP = {
+    'narrative': 'reasoning',
+    'clarification': 'reasoning',
+    'analysis': 'deep_analysis',
+    'prevention': 'synthesis'
+}
+
+# Maximum responses kept per agent by the in-memory memo (LRU)
+RESPONSE_MEMO_SIZE = 512
+
+# Keywords indicating which 8D phases a text addresses (in phase order)
+EIGHT_D_KEYWORDS = {
+    "D0": ["preparation", "trigger", "alert", "initiated"],
+    "D1": ["team", "owner", "responsible", "lead"],
+    "D2": ["problem definition", "symptom", "scope", "timeline"],
+    "D3": ["containment", "hold", "interim", "temporary"],
+    "D4": ["root cause", "why", "analysis", "hypothesis"],
+    "D5": ["permanent", "corrective action", "solution", "fix"],
+    "D6": ["validation", "verification", "confirm", "test"],
+    "D7": ["prevention", "systemic", "process change", "SOP"],
+    "D8": ["lessons learned", "documentation", "share"]
+}
+
+
+# Keyword (lowercase) -> 8D phase
+_EIGHT_D_TERMS = {
+    term.lower(): phase
+    for phase, terms in EIGHT_D_KEYWORDS.items()
+    for term in terms
+}
+
+# Inflections still counted as the keyword ("teams", "fixed", "testing")
+_KEYWORD_SUFFIXES = ("", "s", "es", "d", "ed", "ing")
+
+# Whole-word keyword match on lowercased text (longest keyword first)
+_EIGHT_D_RE = re.compile(
+    r"\b("
+    + "|".join(map(re.escape, sorted(_EIGHT_D_TERMS, key=len, reverse=True)))
+    + r")(?:" + "|".join(_KEYWORD_SUFFIXES[1:]) + r")?\b"
+)
+
+
+def _build_eight_d_automaton() -> Optional[Any]:
+    """Build an Aho-Corasick automaton over EIGHT_D_KEYWORDS (if available)."""
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for term, phase in _EIGHT_D_TERMS.items():
+        automaton.add_word(term, (phase, len(term)))
+    automaton.make_automaton()
+    return automaton
+
+
+_EIGHT_D_AUTOMATON = _build_eight_d_automaton()
+
+
+def _is_word_char(text: str, index: int) -> bool:
+    """Check whether text[index] exists and is a word character."""
+    return 0 <= index < len(text) and (text[index].isalnum() or text[index] == "_")
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """
+    Check that text[start:end] is a whole word, allowing an inflection.
+
+    Mirrors the boundaries of _EIGHT_D_RE for Aho-Corasick matches.
+    """
+    if _is_word_char(text, start - 1):
+        return False
+    return any(
+        text.startswith(suffix, end)
+        and not _is_word_char(text, end + len(suffix))
+        for suffix in _KEYWORD_SUFFIXES
+    )
+
+
+# Maximum characters of previous analysis included in a prompt
+MAX_CONTEXT_CHARS = 500
+
+# Bounded repr for previous analysis of arbitrary type
+_CONTEXT_REPR = reprlib.Repr()
+_CONTEXT_REPR.maxstring = MAX_CONTEXT_CHARS
+_CONTEXT_REPR.maxother = MAX_CONTEXT_CHARS
+_CONTEXT_REPR.maxlist = 5
+
 
 class ProblemMode(Enum):
     """Problem-solving modes."""
@@ -25,13 +147,15 @@ class SecurityTier(Enum):
     TOP_SECRET = 3           # On-prem only, no external
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentInput:
     """Input to an agent."""
 
     mode: ProblemMode
     security_tier: SecurityTier
-    context: Dict[str, Any]  # Narrative, clarifications, data, etc.
+    # Narrative, clarifications, data, etc. (any mapping; the orchestrator
+    # layers per-phase ChainMaps over read-only context shared by phases)
+    context: Mapping[str, Any]
     instructions: Optional[str] = None
 
     # 8D phase context
@@ -42,7 +166,7 @@ class AgentInput:
     timestamp: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentOutput:
     """Output from an agent."""
 
@@ -50,13 +174,13 @@ class AgentOutput:
     content: str
     metadata: Dict[str, Any]
 
-    # 8D mapping
-    eight_d_phases_addressed: List[str] = field(default_factory=list)
+    # 8D mapping (read-only; empty defaults share the () singleton)
+    eight_d_phases_addressed: Sequence[str] = ()
 
     # Facts vs hypotheses
-    facts: List[str] = field(default_factory=list)
-    hypotheses: List[str] = field(default_factory=list)
-    open_questions: List[str] = field(default_factory=list)
+    facts: Sequence[str] = ()
+    hypotheses: Sequence[str] = ()
+    open_questions: Sequence[str] = ()
 
     # Cost tracking
     cost_usd: float = 0.0
@@ -64,6 +188,271 @@ class AgentOutput:
     # Quality metrics
     quality_metrics: Dict[str, float] = field(default_factory=dict)
 
+    # Problems handled while processing the response (e.g. salvaged JSON)
+    warnings: Sequence[str] = ()
+
+    # Served from the action cache (no LLM call; see agents.cache)
+    cache_hit: bool = False
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize to compact UTF-8 JSON (e.g. for transport or storage).
+
+        Uses msgspec or orjson when installed (dataclasses in metadata,
+        such as NarrativeAnalysis, are encoded as objects), else the
+        stdlib. All three decode to the same values, but the bytes can
+        differ (e.g. 8e-05 vs 0.00008), so do not compare or hash them.
+
+        Returns:
+            JSON bytes
+        """
+        if msgspec is not None:
+            return msgspec.json.encode(self, enc_hook=_encode_default)
+        if orjson is not None:
+            return orjson.dumps(
+                self, default=_encode_default, option=orjson.OPT_NON_STR_KEYS
+            )
+        return json.dumps(
+            self, default=_encode_default, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+
+
+def _encode_default(obj: Any) -> Any:
+    """Convert values the JSON encoders do not handle natively."""
+    if is_dataclass(obj):
+        # Only reached by the stdlib encoder
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)  # Iteration order, as msgspec encodes sets
+    return str(obj)
+
+
+# JSON schema for a list of strings (building block for response schemas)
+STRING_LIST_SCHEMA = {"type": "array", "items": {"type": "string"}}
+
+
+def json_object_schema(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a strict JSON schema for an object with the given properties.
+
+    All properties are required and no others are allowed, which is what
+    strict structured-output modes (e.g. OpenAI json_schema) accept.
+
+    Args:
+        properties: Property name -> JSON schema
+
+    Returns:
+        JSON schema dict
+    """
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False
+    }
+
+
+@functools.lru_cache(maxsize=128)
+def _format_items(items: Tuple[Any, ...]) -> str:
+    """Format items as a markdown bullet list (memoized across prompts)."""
+    return "\n".join(f"- {item}" for item in items) or "- (None provided)"
+
+
+def format_list(items: Sequence[Any]) -> str:
+    """
+    Format items as a markdown bullet list for a prompt.
+
+    Args:
+        items: Items to list
+
+    Returns:
+        One "- item" line per item, or "- (None provided)" if empty
+    """
+    items = tuple(items)
+    try:
+        return _format_items(items)
+    except TypeError:  # Unhashable items (e.g. dicts from the LLM)
+        return _format_items.__wrapped__(items)
+
+
+def _short_repr(value: Any) -> str:
+    """
+    Summarize a previous analysis in at most MAX_CONTEXT_CHARS characters.
+
+    Avoids stringifying the whole object just to truncate it: strings are
+    sliced, 8D reports are reduced to phase titles and confidences, and
+    anything else goes through a bounded reprlib.Repr.
+
+    Args:
+        value: Previous analysis (str, EightDReport, dict, ...)
+
+    Returns:
+        Bounded summary string
+    """
+    if isinstance(value, str):
+        text = value
+    elif hasattr(value, "phases"):  # EightDReport (not imported: cycle)
+        text = "\n".join(
+            f"- {p.phase} {p.title} (confidence: {p.confidence})"
+            for p in value.phases[:9]
+        )
+    else:
+        text = _CONTEXT_REPR.repr(value)
+
+    if len(text) > MAX_CONTEXT_CHARS:
+        return text[:MAX_CONTEXT_CHARS] + "..."
+    return text
+
+
+def _next_chunk(
+    stream: Iterator[str]
+) -> Tuple[Optional[str], Optional[Tuple[int, ...]]]:
+    """
+    Advance a client response stream by one chunk.
+
+    Returns:
+        (chunk, None) while streaming, then (None, usage) with the
+        generator's return value, (input_tokens, output_tokens[,
+        cached_input_tokens])
+    """
+    try:
+        return next(stream), None
+    except StopIteration as stop:
+        return None, stop.value or (0, 0)
+
+
+async def _athread_chunks(
+    stream: Iterator[str]
+) -> AsyncIterator[Tuple[Optional[str], Optional[Tuple[int, ...]]]]:
+    """
+    Pull a client response stream from worker threads.
+
+    For clients without agenerate_stream(); yields items in the same
+    form, (chunk, None) while streaming, then (None, usage) once.
+    """
+    while True:
+        chunk, usage = await asyncio.to_thread(_next_chunk, stream)
+        yield chunk, usage
+        if usage is not None:
+            return
+
+
+class StreamedArrayItems:
+    """
+    Incrementally extract the items of a JSON array field from streamed text.
+
+    Items are returned by feed() as soon as the text after them (a comma
+    or the closing bracket) has arrived, so a partially streamed item is
+    never decoded.
+    """
+
+    _DECODER = json.JSONDecoder()
+    _SEPARATORS = " \t\r\n,"
+
+    def __init__(self, key: str):
+        self.key = key
+        self._start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._buffer = ""
+        self._pos: Optional[int] = None  # Next unread array position
+        self._done = False
+
+    def feed(self, text: str) -> List[Any]:
+        """
+        Add streamed text and return the array items it completed.
+
+        Args:
+            text: Next chunk of the response
+
+        Returns:
+            Newly completed items (in array order)
+        """
+        self._buffer += text
+        if self._done:
+            return []
+
+        if self._pos is None:
+            match = self._start.search(self._buffer)
+            if match is None:
+                return []
+            self._pos = match.end()
+
+        buffer = self._buffer
+        items = []
+        while True:
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in self._SEPARATORS:
+                pos += 1
+            self._pos = pos
+
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                self._done = True
+                break
+
+            try:
+                item, end = self._DECODER.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # Item not fully streamed yet
+            if end >= len(buffer):
+                break  # A number may continue in the next chunk
+
+            items.append(item)
+            self._pos = end
+
+        return items
+
+    @property
+    def consumed(self) -> int:
+        """Length of the fed text up to the end of the last completed item."""
+        return self._pos or 0
+
+
+def parse_tolerant(text: str, array_keys: Sequence[str] = ()) -> Tuple[Any, int]:
+    """
+    Parse the JSON object in an LLM response, salvaging what is valid.
+
+    Prose or markdown fences around the object are skipped. If the object
+    itself is broken (e.g. cut off at max_tokens), the completed items of
+    the given top-level array fields are kept.
+
+    Args:
+        text: Response text
+        array_keys: Top-level array fields to salvage from a broken object
+
+    Returns:
+        (value, consumed): the parsed object (or a dict of the salvaged
+        arrays) and how many characters of text it was parsed from
+
+    Raises:
+        json.JSONDecodeError: If nothing could be recovered
+    """
+    start = text.find("{")
+    if start < 0:
+        raise json.JSONDecodeError("No JSON object in response", text, 0)
+
+    try:
+        return StreamedArrayItems._DECODER.raw_decode(text, start)
+    except json.JSONDecodeError as e:
+        error = e
+
+    partial: Dict[str, Any] = {}
+    consumed = 0
+    for key in array_keys:
+        items = StreamedArrayItems(key)
+        found = items.feed(text)
+        if found:
+            partial[key] = found
+            consumed = max(consumed, items.consumed)
+
+    if not partial:
+        raise error
+    return partial, consumed
+
 
 class BaseAgent(ABC):
     """
@@ -76,10 +465,41 @@ class BaseAgent(ABC):
     - State management
     """
 
+    # Agent types whose outputs this agent consumes (see run_pipeline);
+    # None means "the previous agent in the pipeline"
+    dependencies: Optional[FrozenSet[str]] = None
+
+    # JSON schema the LLM response must follow (constrained decoding on
+    # providers that support it); None for free-form responses
+    response_schema: Optional[Dict[str, Any]] = None
+
+    # Type the JSON response is decoded into when msgspec is installed
+    # (see _parse_json_response); None keeps plain JSON values
+    response_type: Optional[type] = None
+
+    # Part of the action cache key: bump when generate_prompt() or
+    # process_response() change so stale cached outputs are not reused
+    prompt_version: str = "1"
+
+    # msgspec decoder for response_type, built once per class
+    _response_decoder: Optional[Any] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if msgspec is not None and cls.response_type is not None:
+            cls._response_decoder = msgspec.json.Decoder(
+                cls.response_type, strict=False
+            )
+
     def __init__(
         self,
         agent_type: str,
-        model_router: Optional[Any] = None  # ModelRouter from config
+        model_router: Optional[Any] = None,  # ModelRouter from config
+        response_cache: Optional[Any] = None,  # ResponseCache from config
+        semantic_cache: Optional[Any] = None,  # SemanticCache from config
+        enable_cache: bool = True,
+        action_cache: Optional[Any] = None,  # ActionCache from agents.cache
+        similarity_threshold: Optional[float] = None
     ):
         """
         Initialize base agent.
@@ -87,9 +507,27 @@ class BaseAgent(ABC):
         Args:
             agent_type: Type of agent (narrative, clarification, analysis, prevention)
             model_router: ModelRouter for LLM calls (handles tier enforcement)
+            response_cache: Optional ResponseCache for reusing LLM responses
+            semantic_cache: Optional SemanticCache for reusing responses to
+                similar inputs (see get_semantic_cache_text)
+            enable_cache: Reuse responses to repeated prompts from an
+                in-memory LRU (independent of response_cache)
+            action_cache: Optional ActionCache for reusing complete outputs
+                of deterministic (temperature 0) calls
+            similarity_threshold: Minimum cosine similarity for a
+                semantic_cache hit (defaults to the cache's threshold)
         """
         self.agent_type = agent_type
+        self._task_type = _TASK_TYPE_MAP.get(agent_type, 'reasoning')
         self.model_router = model_router
+        self.response_cache = response_cache
+        self.semantic_cache = semantic_cache
+        self.enable_cache = enable_cache
+        self.action_cache = action_cache
+        self.similarity_threshold = similarity_threshold
+
+        # sha256(agent, model, max_tokens, system prompt, prompt) -> response
+        self._response_memo: "OrderedDict[str, str]" = OrderedDict()
 
     @abstractmethod
     def generate_prompt(self, agent_input: AgentInput) -> str:
@@ -106,6 +544,25 @@ class BaseAgent(ABC):
         """
         pass
 
+    def split_prompt(self, agent_input: AgentInput) -> Tuple[Optional[str], str]:
+        """
+        Split the prompt into static instructions and per-request content.
+
+        The static part is sent as the system prompt, which providers
+        cache across calls (Anthropic via cache_control, OpenAI
+        automatically for long prefixes). Subclasses whose prompts are
+        mostly fixed instructions override this; together the two parts
+        carry the same content as generate_prompt().
+
+        Args:
+            agent_input: Input for this agent
+
+        Returns:
+            (system_prompt, prompt), where system_prompt is None if the
+            prompt has no static part
+        """
+        return None, self.generate_prompt(agent_input)
+
     @abstractmethod
     def process_response(
         self,
@@ -152,36 +609,604 @@ class BaseAgent(ABC):
         Returns:
             AgentOutput with results
         """
+        response = self.local_response(agent_input)
+        if response is not None:
+            return self.process_response(response, agent_input)
+
         # Generate prompt
-        prompt = self.generate_prompt(agent_input)
+        system_prompt, prompt = self.split_prompt(agent_input)
+        client = self._get_client(agent_input)
+        max_tokens = self.get_max_tokens()
+
+        output, action_key = self._lookup_output(
+            agent_input, prompt, client, max_tokens, system_prompt
+        )
+        if output is not None:
+            return output
+
+        response, cache_key, semantic_key = self._lookup_cached(
+            agent_input, prompt, client, max_tokens, system_prompt,
+            action_key
+        )
+
+        if response is None:
+            # Execute LLM call
+            response = self._call_llm(
+                prompt=prompt,
+                client=client,
+                max_tokens=max_tokens,
+                system_prompt=system_prompt
+            )
+            self._store_cached(response, cache_key, semantic_key)
+
+        # Process response
+        output = self.process_response(response, agent_input)
+        self._store_output(output, action_key)
+
+        return output
+
+    def _execute_streaming(
+        self,
+        agent_input: AgentInput,
+        key: str,
+        final_items: Callable[[AgentOutput], Sequence[Any]]
+    ) -> Generator[Any, None, AgentOutput]:
+        """
+        Execute agent workflow, yielding the items of one response array
+        as each is complete.
+
+        Same steps as execute(), but the LLM response is streamed and the
+        complete items of its top-level `key` array are yielded while the
+        rest is still being generated. Responses not streamed (local,
+        cached, action cache hits) yield their items at once.
+
+        Args:
+            agent_input: Input for this agent
+            key: Top-level array in the JSON response to stream
+            final_items: Gets the items from the processed output (used
+                for whatever was not yielded while streaming, e.g.
+                fallbacks when the response is not JSON)
+
+        Yields:
+            Items, in order
+
+        Returns:
+            AgentOutput with results (same as execute())
+        """
+        streamed = 0
+        output = None
+        action_key = None
+        response = self.local_response(agent_input)
+        if response is None:
+            system_prompt, prompt = self.split_prompt(agent_input)
+            client = self._get_client(agent_input)
+            max_tokens = self.get_max_tokens()
+
+            output, action_key = self._lookup_output(
+                agent_input, prompt, client, max_tokens, system_prompt
+            )
+            if output is None:
+                response, cache_key, semantic_key = self._lookup_cached(
+                    agent_input, prompt, client, max_tokens, system_prompt,
+                    action_key
+                )
+
+                if response is None:
+                    items = StreamedArrayItems(key)
+                    stream = self._stream_llm(
+                        prompt=prompt,
+                        client=client,
+                        max_tokens=max_tokens,
+                        system_prompt=system_prompt
+                    )
+                    while True:
+                        try:
+                            chunk = next(stream)
+                        except StopIteration as stop:
+                            response = stop.value
+                            break
+                        for item in items.feed(chunk):
+                            streamed += 1
+                            yield item
+
+                    self._store_cached(response, cache_key, semantic_key)
+
+        if output is None:
+            output = self.process_response(response, agent_input)
+            self._store_output(output, action_key)
+
+        # Items not seen while streaming
+        yield from final_items(output)[streamed:]
+
+        return output
+
+    async def aexecute(
+        self,
+        agent_input: AgentInput,
+        on_chunk: Optional[Callable[[str], None]] = None
+    ) -> AgentOutput:
+        """
+        Execute agent workflow without blocking the event loop.
+
+        Same steps as execute(), but the LLM response is streamed from a
+        worker thread so several agents can wait on the network at once.
+        The number of streamed chunks is recorded in
+        metadata["stream_chunks"].
+
+        Args:
+            agent_input: Input for this agent
+            on_chunk: Called (on the event loop) with each piece of
+                response text as it arrives; cached and non-streamed
+                responses arrive as one piece, and outputs served from
+                the action cache not at all
+
+        Returns:
+            AgentOutput with results
+        """
+        response = self.local_response(agent_input)
+        if response is not None:
+            if on_chunk is not None:
+                on_chunk(response)
+            return self.process_response(response, agent_input)
+
+        system_prompt, prompt = self.split_prompt(agent_input)
+        client = self._get_client(agent_input)
+        max_tokens = self.get_max_tokens()
+
+        output, action_key = self._lookup_output(
+            agent_input, prompt, client, max_tokens, system_prompt
+        )
+        if output is not None:
+            return output
+
+        response, cache_key, semantic_key = self._lookup_cached(
+            agent_input, prompt, client, max_tokens, system_prompt,
+            action_key
+        )
+
+        stream_chunks = None
+        if response is None:
+            response, stream_chunks = await self._astream_llm(
+                prompt=prompt,
+                client=client,
+                max_tokens=max_tokens,
+                system_prompt=system_prompt,
+                on_chunk=on_chunk
+            )
+            self._store_cached(response, cache_key, semantic_key)
+        elif on_chunk is not None:
+            on_chunk(response)
+
+        output = self.process_response(response, agent_input)
+        self._store_output(output, action_key)
+
+        if stream_chunks is not None:
+            output.metadata["stream_chunks"] = stream_chunks
+
+        return output
+
+    async def arun(self, agent_input: AgentInput) -> AgentOutput:
+        """
+        Execute agent workflow through the router's micro-batching queue.
+
+        Same steps as execute(), but the LLM call goes through
+        ModelRouter.ainvoke(), so concurrent arun() calls from any agents
+        that target the same model are dispatched together. Falls back
+        to aexecute() when the router does not support ainvoke().
+
+        Args:
+            agent_input: Input for this agent
+
+        Returns:
+            AgentOutput with results
+        """
+        if not hasattr(self.model_router, "ainvoke"):
+            return await self.aexecute(agent_input)
+
+        response = self.local_response(agent_input)
+        if response is not None:
+            return self.process_response(response, agent_input)
+
+        system_prompt, prompt = self.split_prompt(agent_input)
+        client = self._get_client(agent_input)
+        max_tokens = self.get_max_tokens()
+
+        output, action_key = self._lookup_output(
+            agent_input, prompt, client, max_tokens, system_prompt
+        )
+        if output is not None:
+            return output
+
+        response, cache_key, semantic_key = self._lookup_cached(
+            agent_input, prompt, client, max_tokens, system_prompt,
+            action_key
+        )
+
+        if response is None:
+            response = await self._ainvoke_llm(
+                prompt=prompt,
+                client=client,
+                max_tokens=max_tokens,
+                system_prompt=system_prompt,
+                tier=agent_input.security_tier
+            )
+            self._store_cached(response, cache_key, semantic_key)
+
+        output = self.process_response(response, agent_input)
+        self._store_output(output, action_key)
+        return output
+
+    async def aexecute_batch(
+        self,
+        inputs: Sequence[AgentInput],
+        max_concurrency: int = MAX_CONCURRENT_LLM_CALLS
+    ) -> List[AgentOutput]:
+        """
+        Execute agent workflow for several inputs concurrently.
+
+        Args:
+            inputs: Inputs to execute
+            max_concurrency: Maximum LLM calls in flight at once
+
+        Returns:
+            AgentOutputs in the same order as inputs
+        """
+        # Created per batch: asyncio primitives bind to the running loop
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def controlled(agent_input: AgentInput) -> AgentOutput:
+            async with semaphore:
+                return await self.aexecute(agent_input)
+
+        return list(await asyncio.gather(*(controlled(i) for i in inputs)))
+
+    def execute_batch(self, inputs: Sequence[AgentInput]) -> List[AgentOutput]:
+        """
+        Execute agent workflow for several inputs as one offline batch.
+
+        Cache misses are grouped by model client and sent through the
+        client's generate_batch(), which uses the provider Batch API
+        where available: cheaper, but results may take hours. Use
+        aexecute_batch() when latency matters.
+
+        Args:
+            inputs: Inputs to execute
+
+        Returns:
+            AgentOutputs in the same order as inputs
+
+        Raises:
+            RuntimeError: If any request in the batch failed
+        """
+        max_tokens = self.get_max_tokens()
+        responses: List[Optional[str]] = []
+        # id(client) -> (client, [(input index, request, cache_key, semantic_key)])
+        pending: Dict[int, Tuple[Any, List[Tuple[int, Any, Any, Any]]]] = {}
+
+        for i, agent_input in enumerate(inputs):
+            local = self.local_response(agent_input)
+            if local is not None:
+                responses.append(local)
+                continue
+
+            system_prompt, prompt = self.split_prompt(agent_input)
+            client = self._get_client(agent_input)
+
+            response, cache_key, semantic_key = self._lookup_cached(
+                agent_input, prompt, client, max_tokens, system_prompt
+            )
+            if response is None and client is None:
+                response = self._call_llm(
+                    prompt=prompt,
+                    client=client,
+                    max_tokens=max_tokens,
+                    system_prompt=system_prompt
+                )
+            responses.append(response)
+
+            if response is None:
+                request = (
+                    prompt,
+                    system_prompt,
+                    max_tokens,
+                    self._schema_kwargs(client).get("response_schema")
+                )
+                pending.setdefault(id(client), (client, []))[1].append(
+                    (i, request, cache_key, semantic_key)
+                )
+
+        for client, entries in pending.values():
+            results = client.generate_batch([request for _, request, _, _ in entries])
+
+            for (i, _, cache_key, semantic_key), result in zip(entries, results):
+                if isinstance(result, BaseException):
+                    raise RuntimeError(f"LLM call failed: {result}") from result
+
+                response, *usage = result
+                self._track_usage(
+                    client, *usage, cost_factor=client.batch_cost_factor
+                )
+                self._store_cached(response, cache_key, semantic_key)
+                responses[i] = response
+
+        return [
+            self.process_response(response, agent_input)
+            for response, agent_input in zip(responses, inputs)
+        ]
+
+    def _get_client(self, agent_input: AgentInput) -> Optional[Any]:
+        """
+        Get model client for this agent (tier-aware).
+
+        Args:
+            agent_input: Input with security tier
 
-        # Get model client (tier-aware)
+        Returns:
+            Model client, or None when running without a router
+        """
         if self.model_router:
-            client = self.model_router.get_model_client(
+            return self.model_router.get_model_client(
                 task_type=self._get_task_type(),
                 tier=agent_input.security_tier
             )
-        else:
-            # Fallback for testing without router
-            client = None
 
-        # Execute LLM call
-        response = self._call_llm(
-            prompt=prompt,
-            client=client,
-            max_tokens=self.get_max_tokens()
+        # Fallback for testing without router
+        return None
+
+    def _lookup_cached(
+        self,
+        agent_input: AgentInput,
+        prompt: str,
+        client: Optional[Any],
+        max_tokens: int,
+        system_prompt: Optional[str] = None,
+        action_key: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Look up a cached response (only for real model calls).
+
+        Args:
+            agent_input: Input for this agent
+            prompt: Generated prompt
+            client: Model client
+            max_tokens: Maximum tokens to generate
+            system_prompt: Static instructions (see split_prompt)
+            action_key: Key of this call's action cache miss, if any (the
+                call's cache lookup is counted once, here)
+
+        Returns:
+            (response, cache_key, semantic_key) where response is None on
+            a miss and the keys are needed to store the new response
+        """
+        cache_key = None
+        semantic_key = None
+        cached = None
+        if client is not None:
+            if self.response_cache is not None:
+                cache_key = self.response_cache.make_key(
+                    agent_type=self.agent_type,
+                    model_id=client.config.model_id,
+                    temperature=client.config.temperature,
+                    max_tokens=max_tokens,
+                    response_schema=self.response_schema,
+                    system_prompt=system_prompt,
+                    prompt=prompt
+                )
+                cached = self.response_cache.get(cache_key)
+
+            if self.semantic_cache is not None:
+                semantic_text = self.get_semantic_cache_text(agent_input)
+                if semantic_text:
+                    semantic_key = (
+                        semantic_text,
+                        self._semantic_namespace(agent_input, client)
+                    )
+                    if cached is None:
+                        cached = self.semantic_cache.lookup(
+                            semantic_text,
+                            namespace=semantic_key[1],
+                            threshold=self.similarity_threshold
+                        )
+
+            if (
+                cache_key is not None
+                or semantic_key is not None
+                or action_key is not None
+            ):
+                self._track_cache_lookup(hit=cached is not None)
+
+        response = cached["response"] if cached is not None else None
+        return response, cache_key, semantic_key
+
+    def _lookup_output(
+        self,
+        agent_input: AgentInput,
+        prompt: str,
+        client: Optional[Any],
+        max_tokens: int,
+        system_prompt: Optional[str] = None
+    ) -> Tuple[Optional[AgentOutput], Optional[str]]:
+        """
+        Look up a complete output in the action cache.
+
+        Only deterministic model calls (temperature 0, e.g. a ModelRouter
+        created with deterministic=True) are cached: at any other
+        temperature a re-run is expected to give a new answer. Only hits
+        are counted here; a miss is counted by _lookup_cached(), so each
+        call records one lookup.
+
+        Args:
+            agent_input: Input for this agent
+            prompt: Generated prompt
+            client: Model client
+            max_tokens: Maximum tokens to generate
+            system_prompt: Static instructions (see split_prompt)
+
+        Returns:
+            (output, action_key) where output is None on a miss and
+            action_key (None when not cacheable) is needed to store the
+            new output
+        """
+        if (
+            self.action_cache is None
+            or client is None
+            or client.config.temperature != 0
+        ):
+            return None, None
+
+        from .cache import make_action_key  # cache imports this module
+
+        action_key = make_action_key(
+            agent_type=self.agent_type,
+            prompt_version=self.prompt_version,
+            mode=agent_input.mode.value,
+            security_tier=agent_input.security_tier.name,
+            model_id=client.config.model_id,
+            max_tokens=max_tokens,
+            response_schema=self.response_schema,
+            system_prompt=system_prompt,
+            prompt=prompt
         )
+        cached = self.action_cache.get(action_key)
+        if cached is None:
+            return None, action_key
+        self._track_cache_lookup(hit=True)
+
+        # Copy the metadata so callers cannot mutate the cached entry
+        return replace(cached, metadata=dict(cached.metadata), cache_hit=True), None
+
+    def _store_output(self, output: AgentOutput, action_key: Optional[str]) -> None:
+        """Store a fresh output in the action cache if it was looked up there."""
+        if action_key is not None:
+            self.action_cache.set(
+                action_key, replace(output, metadata=dict(output.metadata))
+            )
 
-        # Process response
-        output = self.process_response(response, agent_input)
+    def _semantic_namespace(self, agent_input: AgentInput, client: Any) -> str:
+        """
+        Get the semantic cache namespace for a request.
 
-        return output
+        Entries are shared only between requests with the same agent,
+        security tier, mode and model, so a response generated under one
+        tier is never served to another.
+
+        Args:
+            agent_input: Input for this agent
+            client: Model client
+
+        Returns:
+            Namespace name
+        """
+        return (
+            f"{self.agent_type}/{agent_input.security_tier.name}/"
+            f"{agent_input.mode.value}/{client.config.model_id}"
+        )
+
+    def _store_cached(
+        self,
+        response: str,
+        cache_key: Optional[str],
+        semantic_key: Optional[Tuple[str, str]]
+    ) -> None:
+        """Store a fresh LLM response in the caches it was looked up in."""
+        if cache_key is not None:
+            self.response_cache.set(cache_key, {"response": response})
+        if semantic_key is not None:
+            semantic_text, namespace = semantic_key
+            self.semantic_cache.add(
+                semantic_text, {"response": response}, namespace=namespace
+            )
+
+    def _parse_json_response(self, response: str) -> Tuple[Any, Tuple[str, ...]]:
+        """
+        Parse an LLM JSON response.
+
+        With msgspec installed and response_type set, the response is
+        decoded and validated straight into response_type in one pass
+        (by a decoder compiled once per agent class).
+        Responses that do not fit response_type (e.g. a missing field or
+        a string where a list is expected), and all responses without
+        msgspec, are parsed as plain JSON. Invalid JSON is salvaged with
+        parse_tolerant() where possible (e.g. trailing prose, or the
+        complete items of a truncated response).
+
+        Args:
+            response: Response text from the LLM
+
+        Returns:
+            (parsed, warnings): response_type instance or parsed JSON
+            value, and a note for each part of the response not used
+
+        Raises:
+            json.JSONDecodeError: If no JSON could be recovered
+        """
+        try:
+            if self._response_decoder is not None:
+                try:
+                    return self._response_decoder.decode(response), ()
+                except msgspec.ValidationError:
+                    pass
+                except msgspec.DecodeError as e:
+                    raise json.JSONDecodeError(str(e), response, 0) from e
+
+            return _json_loads(response), ()
+        except json.JSONDecodeError:
+            pass
+
+        properties = (self.response_schema or {}).get("properties", {})
+        parsed, consumed = parse_tolerant(response, [
+            key for key, schema in properties.items()
+            if schema.get("type") == "array"
+        ])
+
+        warnings = []
+        leading = response[:response.find("{")].strip()
+        if leading:
+            warnings.append(f"Ignored text before the JSON response: {leading[:80]!r}")
+        trailing = response[consumed:].strip()
+        if trailing:
+            warnings.append(f"Ignored text after the parsed JSON: {trailing[:80]!r}")
+        return parsed, tuple(warnings)
+
+    def local_response(self, agent_input: AgentInput) -> Optional[str]:
+        """
+        Get a response computed locally, skipping the LLM call.
+
+        Subclasses can override this for inputs simple enough to answer
+        without a model (e.g. structured alerts). The response goes
+        through process_response() like an LLM response would, and is
+        not cached.
+
+        Args:
+            agent_input: Input for this agent
+
+        Returns:
+            Response text, or None to call the LLM
+        """
+        return None
+
+    def get_semantic_cache_text(self, agent_input: AgentInput) -> Optional[str]:
+        """
+        Get the text used for semantic cache lookups.
+
+        Subclasses whose response is determined by one free-form text
+        (e.g. the user narrative) can override this to enable the
+        semantic cache.
+
+        Args:
+            agent_input: Input for this agent
+
+        Returns:
+            Text to match on, or None to skip the semantic cache
+        """
+        return None
 
     def _call_llm(
         self,
         prompt: str,
         client: Optional[Any],
-        max_tokens: int
+        max_tokens: int,
+        system_prompt: Optional[str] = None
     ) -> str:
         """
         Call LLM with prompt.
@@ -190,6 +1215,7 @@ class BaseAgent(ABC):
             prompt: Prompt string
             client: Model client (tier-aware)
             max_tokens: Maximum tokens to generate
+            system_prompt: Static instructions (see split_prompt)
 
         Returns:
             LLM response string
@@ -198,52 +1224,400 @@ class BaseAgent(ABC):
             # For testing without actual LLM
             return f"[Mock LLM response for: {prompt[:100]}...]"
 
+        memo_key, response_text = self._memo_get(
+            prompt, client, max_tokens, system_prompt
+        )
+        if response_text is not None:
+            return response_text
+
         # Call model via client
         try:
-            response_text, input_tokens, output_tokens = client.generate(
+            response_text, *usage = client.generate(
                 prompt=prompt,
-                max_tokens=max_tokens
+                system_prompt=system_prompt,
+                max_tokens=max_tokens,
+                **self._schema_kwargs(client)
             )
 
-            # Track usage if router is available
-            if self.model_router:
-                cost_usd = self._calculate_cost(
-                    client.config,
-                    input_tokens,
-                    output_tokens
-                )
-                self.model_router.track_usage(
-                    task_type=self._get_task_type(),
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    cost_usd=cost_usd
-                )
+            self._track_usage(client, *usage)
+            self._memo_put(memo_key, response_text)
 
             return response_text
 
         except Exception as e:
             raise RuntimeError(f"LLM call failed: {e}")
 
+    def _schema_kwargs(self, client: Any) -> Dict[str, Any]:
+        """Get the response_schema kwarg for clients that accept it."""
+        if self.response_schema and getattr(client, "supports_response_schema", False):
+            return {"response_schema": self.response_schema}
+        return {}
+
+    def _track_usage(
+        self,
+        client: Any,
+        input_tokens: int,
+        output_tokens: int,
+        cached_input_tokens: int = 0,
+        cost_factor: float = 1.0
+    ) -> None:
+        """
+        Track usage if router is available.
+
+        Args:
+            client: Model client that served the call
+            input_tokens: Input token count (including cached tokens)
+            output_tokens: Output token count
+            cached_input_tokens: Input tokens read from the provider's
+                prompt cache (billed at client.cached_input_cost_factor)
+            cost_factor: Scale for the whole cost (e.g. batch pricing)
+        """
+        if self.model_router:
+            cost_usd = cost_factor * self._calculate_cost(
+                client.config,
+                input_tokens,
+                output_tokens,
+                cached_input_tokens,
+                getattr(client, "cached_input_cost_factor", 1.0)
+            )
+            COUNTERS.incr(f"{self.agent_type}_tokens_in", input_tokens)
+            COUNTERS.incr(f"{self.agent_type}_tokens_out", output_tokens)
+            COUNTERS.incr(f"{self.agent_type}_tokens_in_cached", cached_input_tokens)
+            COUNTERS.incr(f"{self.agent_type}_cost_usd", cost_usd)
+            self.model_router.track_usage(
+                task_type=self._get_task_type(),
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cost_usd=cost_usd
+            )
+
+    def _track_cache_lookup(self, hit: bool) -> None:
+        """
+        Record a response cache hit (zero-cost usage) or miss with the router.
+
+        Args:
+            hit: Response was served from a cache
+        """
+        COUNTERS.incr(
+            f"{self.agent_type}_cache_hits" if hit
+            else f"{self.agent_type}_cache_misses"
+        )
+        if not self.model_router:
+            return
+
+        if hit:
+            self.model_router.track_usage(
+                task_type=self._get_task_type(),
+                input_tokens=0,
+                output_tokens=0,
+                cost_usd=0.0,
+                cache_hit=True
+            )
+        elif hasattr(self.model_router, "track_cache_miss"):
+            self.model_router.track_cache_miss()
+
+    def _memo_get(
+        self,
+        prompt: str,
+        client: Any,
+        max_tokens: int,
+        system_prompt: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look up a response in the in-memory memo.
+
+        A hit is recorded with the router as a zero-cost cache hit.
+
+        Args:
+            prompt: Prompt string
+            client: Model client (tier-aware)
+            max_tokens: Maximum tokens to generate
+            system_prompt: Static instructions (see split_prompt)
+
+        Returns:
+            (memo_key, response) where response is None on a miss and
+            memo_key is None when the memo is disabled
+        """
+        if not self.enable_cache:
+            return None, None
+
+        memo_key = hashlib.sha256(
+            f"{self.agent_type}|{client.config.model_id}|{max_tokens}|"
+            f"{system_prompt}|{prompt}".encode("utf-8")
+        ).hexdigest()
+
+        response = self._response_memo.get(memo_key)
+        if response is not None:
+            self._response_memo.move_to_end(memo_key)
+            self._track_cache_lookup(hit=True)
+
+        return memo_key, response
+
+    def _memo_put(self, memo_key: Optional[str], response: str) -> None:
+        """Store a fresh response in the memo, evicting the oldest entry."""
+        if memo_key is None:
+            return
+
+        self._response_memo[memo_key] = response
+        if len(self._response_memo) > RESPONSE_MEMO_SIZE:
+            self._response_memo.popitem(last=False)
+
+    async def _acall_llm(
+        self,
+        prompt: str,
+        client: Optional[Any],
+        max_tokens: int,
+        system_prompt: Optional[str] = None
+    ) -> str:
+        """
+        Call LLM with prompt from a worker thread.
+
+        Delegates to _call_llm(), so usage tracking and error handling
+        are shared with the sync path.
+
+        Args:
+            prompt: Prompt string
+            client: Model client (tier-aware)
+            max_tokens: Maximum tokens to generate
+            system_prompt: Static instructions (see split_prompt)
+
+        Returns:
+            LLM response string
+        """
+        return await asyncio.to_thread(
+            self._call_llm,
+            prompt=prompt,
+            client=client,
+            max_tokens=max_tokens,
+            system_prompt=system_prompt
+        )
+
+    def _stream_llm(
+        self,
+        prompt: str,
+        client: Optional[Any],
+        max_tokens: int,
+        system_prompt: Optional[str] = None
+    ) -> Generator[str, None, str]:
+        """
+        Call LLM with prompt, yielding response text as it arrives.
+
+        Clients without generate_stream() (and memo hits) yield the full
+        response once via _call_llm().
+
+        Args:
+            prompt: Prompt string
+            client: Model client (tier-aware)
+            max_tokens: Maximum tokens to generate
+            system_prompt: Static instructions (see split_prompt)
+
+        Yields:
+            Response text deltas
+
+        Returns:
+            The full response once exhausted
+        """
+        if client is None or not hasattr(client, "generate_stream"):
+            response = self._call_llm(
+                prompt=prompt,
+                client=client,
+                max_tokens=max_tokens,
+                system_prompt=system_prompt
+            )
+            yield response
+            return response
+
+        memo_key, response = self._memo_get(
+            prompt, client, max_tokens, system_prompt
+        )
+        if response is not None:
+            yield response
+            return response
+
+        try:
+            stream = client.generate_stream(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                max_tokens=max_tokens,
+                **self._schema_kwargs(client)
+            )
+            chunks = []
+            while True:
+                chunk, usage = _next_chunk(stream)
+                if usage is not None:
+                    break
+                chunks.append(chunk)
+                yield chunk
+
+            self._track_usage(client, *usage)
+
+            response = "".join(chunks)
+            self._memo_put(memo_key, response)
+
+            return response
+
+        except Exception as e:
+            raise RuntimeError(f"LLM call failed: {e}")
+
+    async def _astream_llm(
+        self,
+        prompt: str,
+        client: Optional[Any],
+        max_tokens: int,
+        system_prompt: Optional[str] = None,
+        on_chunk: Optional[Callable[[str], None]] = None
+    ) -> Tuple[str, Optional[int]]:
+        """
+        Stream LLM response without blocking the event loop.
+
+        Clients with agenerate_stream() stream on the event loop; for the
+        others each chunk is pulled from generate_stream() in a worker
+        thread. Either way the loop can serve other agents between
+        chunks. Clients without generate_stream() fall back to
+        _acall_llm().
+
+        Args:
+            prompt: Prompt string
+            client: Model client (tier-aware)
+            max_tokens: Maximum tokens to generate
+            system_prompt: Static instructions (see split_prompt)
+            on_chunk: Called with each chunk (or the whole response if
+                it was not streamed)
+
+        Returns:
+            (response, chunk_count) where chunk_count is None if the
+            response was not streamed
+        """
+        if client is None or not hasattr(client, "generate_stream"):
+            response = await self._acall_llm(
+                prompt=prompt,
+                client=client,
+                max_tokens=max_tokens,
+                system_prompt=system_prompt
+            )
+            if on_chunk is not None:
+                on_chunk(response)
+            return response, None
+
+        memo_key, response = self._memo_get(
+            prompt, client, max_tokens, system_prompt
+        )
+        if response is not None:
+            if on_chunk is not None:
+                on_chunk(response)
+            return response, None
+
+        try:
+            request = dict(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                max_tokens=max_tokens,
+                **self._schema_kwargs(client)
+            )
+            # Native async streaming where the client has it (shared async
+            # HTTP pool, no thread hop per chunk)
+            if hasattr(client, "agenerate_stream"):
+                stream = client.agenerate_stream(**request)
+            else:
+                stream = _athread_chunks(client.generate_stream(**request))
+
+            chunks = []
+            usage = (0, 0)
+            async for chunk, final_usage in stream:
+                if final_usage is not None:
+                    usage = final_usage
+                    continue
+                chunks.append(chunk)
+                if on_chunk is not None:
+                    on_chunk(chunk)
+
+            self._track_usage(client, *usage)
+
+            response = "".join(chunks)
+            self._memo_put(memo_key, response)
+
+            return response, len(chunks)
+
+        except Exception as e:
+            raise RuntimeError(f"LLM call failed: {e}")
+
+    async def _ainvoke_llm(
+        self,
+        prompt: str,
+        client: Any,
+        max_tokens: int,
+        system_prompt: Optional[str],
+        tier: SecurityTier
+    ) -> str:
+        """
+        Call LLM through ModelRouter.ainvoke() (micro-batched).
+
+        Args:
+            prompt: Prompt string
+            client: Model client (for memo key and cost)
+            max_tokens: Maximum tokens to generate
+            system_prompt: Static instructions (see split_prompt)
+            tier: Security tier
+
+        Returns:
+            LLM response string
+        """
+        memo_key, response = self._memo_get(
+            prompt, client, max_tokens, system_prompt
+        )
+        if response is not None:
+            return response
+
+        try:
+            response, *usage = await self.model_router.ainvoke(
+                prompt=prompt,
+                task_type=self._task_type,
+                tier=tier,
+                system_prompt=system_prompt,
+                max_tokens=max_tokens,
+                response_schema=self.response_schema
+            )
+        except Exception as e:
+            raise RuntimeError(f"LLM call failed: {e}")
+
+        self._track_usage(client, *usage)
+        self._memo_put(memo_key, response)
+
+        return response
+
     def _calculate_cost(
         self,
         config: Any,
         input_tokens: int,
-        output_tokens: int
+        output_tokens: int,
+        cached_input_tokens: int = 0,
+        cached_input_cost_factor: float = 1.0
     ) -> float:
         """
         Calculate cost for LLM call.
 
         Args:
             config: ModelConfig with pricing
-            input_tokens: Input token count
+            input_tokens: Input token count (including cached tokens)
             output_tokens: Output token count
+            cached_input_tokens: Input tokens read from the prompt cache
+            cached_input_cost_factor: Price of cached input tokens
+                relative to uncached ones
 
         Returns:
             Cost in USD
         """
-        input_cost = (input_tokens / 1000.0) * config.cost_per_1k_input
-        output_cost = (output_tokens / 1000.0) * config.cost_per_1k_output
-        return input_cost + output_cost
+        # Integer nano-USD until the final conversion
+        nano_usd = (
+            input_tokens * config.cost_per_token_input_nano
+            + output_tokens * config.cost_per_token_output_nano
+        )
+        if cached_input_tokens:
+            nano_usd -= round(
+                cached_input_tokens * config.cost_per_token_input_nano
+                * (1.0 - cached_input_cost_factor)
+            )
+        return nano_usd * 1e-9
 
     def _get_task_type(self) -> str:
         """
@@ -252,13 +1626,7 @@ class BaseAgent(ABC):
         Returns:
             Task type string
         """
-        task_type_map = {
-            'narrative': 'reasoning',
-            'clarification': 'reasoning',
-            'analysis': 'deep_analysis',
-            'prevention': 'synthesis'
-        }
-        return task_type_map.get(self.agent_type, 'reasoning')
+        return self._task_type
 
     def format_context(self, agent_input: AgentInput) -> str:
         """
@@ -302,7 +1670,7 @@ class BaseAgent(ABC):
         if 'previous_analysis' in agent_input.context:
             lines.append("## Previous Analysis")
             lines.append("")
-            lines.append(str(agent_input.context['previous_analysis'])[:500] + "...")
+            lines.append(_short_repr(agent_input.context['previous_analysis']))
             lines.append("")
 
         return "\n".join(lines)
@@ -317,26 +1685,22 @@ class BaseAgent(ABC):
         Returns:
             List of 8D phases (e.g., ["D0", "D1", "D2"])
         """
-        # Simple keyword-based extraction
+        # Simple keyword-based extraction (whole words, so "hold" does
+        # not match "threshold")
         # TODO: Make this more sophisticated
-        phases = []
-
-        keywords = {
-            "D0": ["preparation", "trigger", "alert", "initiated"],
-            "D1": ["team", "owner", "responsible", "lead"],
-            "D2": ["problem definition", "symptom", "scope", "timeline"],
-            "D3": ["containment", "hold", "interim", "temporary"],
-            "D4": ["root cause", "why", "analysis", "hypothesis"],
-            "D5": ["permanent", "corrective action", "solution", "fix"],
-            "D6": ["validation", "verification", "confirm", "test"],
-            "D7": ["prevention", "systemic", "process change", "SOP"],
-            "D8": ["lessons learned", "documentation", "share"]
-        }
-
         content_lower = content.lower()
 
-        for phase, terms in keywords.items():
-            if any(term in content_lower for term in terms):
-                phases.append(phase)
+        if _EIGHT_D_AUTOMATON is not None:
+            # One pass over the content for all keywords
+            hits = {
+                phase
+                for end, (phase, length) in _EIGHT_D_AUTOMATON.iter(content_lower)
+                if _is_whole_word(content_lower, end - length + 1, end + 1)
+            }
+        else:
+            hits = {
+                _EIGHT_D_TERMS[m.group(1)]
+                for m in _EIGHT_D_RE.finditer(content_lower)
+            }
 
-        return phases
+        return [phase for phase in EIGHT_D_KEYWORDS if phase in hits]
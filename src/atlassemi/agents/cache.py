@@ -0,0 +1,173 @@
+"""
+Action cache for ATLASsemi agents.
+
+Caches complete AgentOutputs keyed by everything that determines them
+(agent, mode, security tier, model, prompt, ...), so deterministic
+re-runs (replays, idempotent retries, tests) skip the LLM call and the
+response processing. Backends:
+- MemoryActionCache: in-process LRU
+- SQLiteActionCache: on-disk, shared across runs
+
+Only used for temperature-0 models; see BaseAgent._lookup_output.
+"""
+
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Protocol, Union
+
+from .base import AgentOutput
+
+
+DEFAULT_ACTION_CACHE_PATH = Path.home() / ".cache" / "atlassemi" / "actions.sqlite3"
+
+# Default number of outputs kept by MemoryActionCache
+DEFAULT_MEMORY_ENTRIES = 256
+
+
+def make_action_key(**fields: Any) -> str:
+    """
+    Build an action cache key from request fields.
+
+    Args:
+        **fields: Everything that determines the output
+            (agent type, mode, tier, model, prompt, ...)
+
+    Returns:
+        Hex SHA-256 digest of the fields
+    """
+    encoded = json.dumps(
+        fields, sort_keys=True, default=str, separators=(",", ":")
+    ).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ActionCache(Protocol):
+    """Storage for complete agent outputs."""
+
+    def get(self, key: str) -> Optional[AgentOutput]:
+        """Get the output stored under key, or None on miss."""
+        ...
+
+    def set(self, key: str, output: AgentOutput) -> None:
+        """Store an output under key."""
+        ...
+
+
+class MemoryActionCache:
+    """In-process LRU action cache (thread-safe)."""
+
+    def __init__(self, max_entries: int = DEFAULT_MEMORY_ENTRIES):
+        """
+        Initialize memory action cache.
+
+        Args:
+            max_entries: Outputs kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._outputs: "OrderedDict[str, AgentOutput]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[AgentOutput]:
+        """
+        Look up a cached output.
+
+        Args:
+            key: Cache key from make_action_key()
+
+        Returns:
+            Cached output, or None on miss
+        """
+        with self._lock:
+            output = self._outputs.get(key)
+            if output is not None:
+                self._outputs.move_to_end(key)
+            return output
+
+    def set(self, key: str, output: AgentOutput) -> None:
+        """
+        Store an output, evicting the oldest entry when full.
+
+        Args:
+            key: Cache key from make_action_key()
+            output: Output to store
+        """
+        with self._lock:
+            self._outputs[key] = output
+            self._outputs.move_to_end(key)
+            if len(self._outputs) > self.max_entries:
+                self._outputs.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._outputs)
+
+
+class SQLiteActionCache:
+    """
+    On-disk action cache.
+
+    Outputs are pickled into a single SQLite table, so entries survive
+    across runs and can be shared by processes on the same machine.
+    Only open cache files you created: unpickling runs arbitrary code.
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        """
+        Initialize SQLite action cache.
+
+        Args:
+            path: Database file (defaults to ~/.cache/atlassemi/actions.sqlite3;
+                ":memory:" for a throwaway cache)
+        """
+        self.path = str(path) if path is not None else str(DEFAULT_ACTION_CACHE_PATH)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        # Agents may run in worker threads; the lock serializes access
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS outputs "
+                "(key TEXT PRIMARY KEY, output BLOB NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[AgentOutput]:
+        """
+        Look up a cached output.
+
+        Args:
+            key: Cache key from make_action_key()
+
+        Returns:
+            Cached output, or None on miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT output FROM outputs WHERE key = ?", (key,)
+            ).fetchone()
+        return pickle.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, output: AgentOutput) -> None:
+        """
+        Store an output.
+
+        Args:
+            key: Cache key from make_action_key()
+            output: Output to store
+        """
+        blob = pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO outputs (key, output) VALUES (?, ?)",
+                (key, blob)
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
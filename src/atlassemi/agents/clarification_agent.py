@@ -5,13 +5,131 @@ Asks context-appropriate questions to stabilize scope and terminology.
 Mode-aware: different questions for excursion vs improvement vs operations.
 """
 
-from typing import Dict, Any, List
+import json
+from typing import Dict, Any, Generator, List, Optional, Tuple
 from dataclasses import dataclass
+from types import MappingProxyType
+
+from .base import (
+    BaseAgent,
+    AgentInput,
+    AgentOutput,
+    ProblemMode,
+    STRING_LIST_SCHEMA,
+    format_list,
+    json_object_schema
+)
+
+
+# Mode-specific question focus
+_MODE_TEMPLATES = MappingProxyType({
+    ProblemMode.EXCURSION: """**Excursion Mode Focus:**
+- WHEN did the excursion trigger? (exact timeline)
+- WHERE is it localized? (tool, chamber, product, lot)
+- WHAT was normal baseline? (SPC limits, Cpk)
+- WHAT changed? (recipe, material, tool state)
+- CONTAINMENT: What lots are at risk?
+- URGENCY: Production impact?""",
+    ProblemMode.IMPROVEMENT: """**Improvement Mode Focus:**
+- HOW LONG has this been an issue? (chronic pattern)
+- HOW WIDESPREAD? (across tools, products, time)
+- WHAT'S THE VARIABILITY? (tool-to-tool, lot-to-lot)
+- ROOT CAUSES: What's been tried? What didn't work?
+- BASELINE: What's current capability? (Cp, Cpk)
+- GOAL: What's target improvement?""",
+    ProblemMode.OPERATIONS: """**Operations Mode Focus:**
+- WHAT'S BLOCKING? (tool down, queue time, dispatch issue)
+- WHAT'S URGENT? (customer commit, capacity constraint)
+- IMPACT: How many lots affected? Revenue risk?
+- WORKAROUNDS: What temporary solutions exist?
+- ROOT CAUSE: Recurring issue or one-time?
+- PREVENTION: How to avoid next time?"""
+})
+
+# Task, question checklist and output schema; {mode} and
+# {mode_templates} are filled in per mode below
+_INSTRUCTIONS_TEMPLATE = """**Your Task:**
+
+Generate 5-10 clarification questions tailored to the **{mode}** problem mode.
+
+{mode_templates}
 
-from .base import BaseAgent, AgentInput, AgentOutput, ProblemMode
+**Key Questions to Ask:**
+
+1. **Scope Questions:**
+   - When did this surface? (timeline)
+   - Where is this happening? (tools, lots, products)
+   - How widespread? (isolated vs systemic)
+
+2. **Baseline Questions:**
+   - What does "normal" look like?
+   - What looks different now?
+   - Has this happened before?
+
+3. **Data Questions:**
+   - What data is trusted vs uncertain?
+   - What measurements are available?
+   - What's the confidence level?
 
+4. **Context Questions:**
+   - Recent changes? (recipe, tool PM, material lot)
+   - Production impact? (WIP at risk, urgency)
+   - Constraints? (time, access, resources)
 
-@dataclass
+**Output Format:**
+
+Generate a JSON response with:
+{{
+  "questions": [
+    "Question 1",
+    "Question 2",
+    ...
+  ],
+  "rationale": "Why these questions matter for {mode} mode"
+}}
+
+Make questions specific and actionable. Avoid generic questions.
+"""
+
+# Static parts of the prompt per mode (system prompt when split)
+_INTROS = MappingProxyType({
+    mode: "You are helping clarify a semiconductor fab problem.\n\n"
+    f"**Problem Mode:** {mode.value}\n\n"
+    for mode in ProblemMode
+})
+_INSTRUCTIONS = MappingProxyType({
+    mode: _INSTRUCTIONS_TEMPLATE.format(
+        mode=mode.value, mode_templates=_MODE_TEMPLATES[mode]
+    )
+    for mode in ProblemMode
+})
+_SYSTEM_PROMPTS = MappingProxyType({
+    mode: _INTROS[mode] + _INSTRUCTIONS[mode] for mode in ProblemMode
+})
+
+# Per-request part of the prompt (filled by _format_known)
+_KNOWN_TEMPLATE = """**What we know so far:**
+
+Observations:
+%s
+
+Suspected Causes:
+%s
+
+Data Sources Mentioned:
+%s
+
+"""
+
+
+# Structure of the LLM response (see _INSTRUCTIONS_TEMPLATE)
+_RESPONSE_SCHEMA = json_object_schema({
+    "questions": STRING_LIST_SCHEMA,
+    "rationale": {"type": "string"}
+})
+
+
+@dataclass(slots=True, frozen=True)
 class ClarificationSet:
     """Set of clarification questions and answers."""
 
@@ -37,8 +155,23 @@ class ClarificationAgent(BaseAgent):
     - Operations: What's blocking? What's urgent? Impact?
     """
 
-    def __init__(self, model_router=None):
-        super().__init__(agent_type="clarification", model_router=model_router)
+    dependencies = frozenset({"narrative"})
+    response_schema = _RESPONSE_SCHEMA
+
+    def __init__(
+        self,
+        model_router=None,
+        response_cache=None,
+        enable_cache=True,
+        action_cache=None
+    ):
+        super().__init__(
+            agent_type="clarification",
+            model_router=model_router,
+            response_cache=response_cache,
+            enable_cache=enable_cache,
+            action_cache=action_cache
+        )
 
     def generate_prompt(self, agent_input: AgentInput) -> str:
         """
@@ -51,6 +184,14 @@ class ClarificationAgent(BaseAgent):
             Prompt for LLM to generate questions
         """
         mode = agent_input.mode
+        return _INTROS[mode] + self._format_known(agent_input) + _INSTRUCTIONS[mode]
+
+    def split_prompt(self, agent_input: AgentInput) -> Tuple[Optional[str], str]:
+        """Static mode instructions as system prompt, known facts as prompt."""
+        return _SYSTEM_PROMPTS[agent_input.mode], self._format_known(agent_input)
+
+    def _format_known(self, agent_input: AgentInput) -> str:
+        """Format the per-request part of the prompt (what we know so far)."""
         narrative_analysis = agent_input.context.get('narrative_analysis', {})
 
         # Get observations and hypotheses from narrative
@@ -58,106 +199,15 @@ class ClarificationAgent(BaseAgent):
         suspected_causes = narrative_analysis.get('suspected_causes', [])
         data_sources = narrative_analysis.get('data_sources_mentioned', [])
 
-        # Mode-specific question templates
-        mode_templates = self._get_mode_templates(mode)
-
-        prompt = f"""You are helping clarify a semiconductor fab problem.
-
-**Problem Mode:** {mode.value}
-
-**What we know so far:**
-
-Observations:
-{self._format_list(observations)}
-
-Suspected Causes:
-{self._format_list(suspected_causes)}
-
-Data Sources Mentioned:
-{self._format_list(data_sources)}
-
-**Your Task:**
-
-Generate 5-10 clarification questions tailored to the **{mode.value}** problem mode.
-
-{mode_templates}
-
-**Key Questions to Ask:**
-
-1. **Scope Questions:**
-   - When did this surface? (timeline)
-   - Where is this happening? (tools, lots, products)
-   - How widespread? (isolated vs systemic)
-
-2. **Baseline Questions:**
-   - What does "normal" look like?
-   - What looks different now?
-   - Has this happened before?
-
-3. **Data Questions:**
-   - What data is trusted vs uncertain?
-   - What measurements are available?
-   - What's the confidence level?
-
-4. **Context Questions:**
-   - Recent changes? (recipe, tool PM, material lot)
-   - Production impact? (WIP at risk, urgency)
-   - Constraints? (time, access, resources)
-
-**Output Format:**
-
-Generate a JSON response with:
-{{
-  "questions": [
-    "Question 1",
-    "Question 2",
-    ...
-  ],
-  "rationale": "Why these questions matter for {mode.value} mode"
-}}
-
-Make questions specific and actionable. Avoid generic questions.
-"""
-
-        return prompt
+        return _KNOWN_TEMPLATE % (
+            format_list(observations),
+            format_list(suspected_causes),
+            format_list(data_sources)
+        )
 
     def _get_mode_templates(self, mode: ProblemMode) -> str:
         """Get mode-specific question templates."""
-
-        if mode == ProblemMode.EXCURSION:
-            return """**Excursion Mode Focus:**
-- WHEN did the excursion trigger? (exact timeline)
-- WHERE is it localized? (tool, chamber, product, lot)
-- WHAT was normal baseline? (SPC limits, Cpk)
-- WHAT changed? (recipe, material, tool state)
-- CONTAINMENT: What lots are at risk?
-- URGENCY: Production impact?"""
-
-        elif mode == ProblemMode.IMPROVEMENT:
-            return """**Improvement Mode Focus:**
-- HOW LONG has this been an issue? (chronic pattern)
-- HOW WIDESPREAD? (across tools, products, time)
-- WHAT'S THE VARIABILITY? (tool-to-tool, lot-to-lot)
-- ROOT CAUSES: What's been tried? What didn't work?
-- BASELINE: What's current capability? (Cp, Cpk)
-- GOAL: What's target improvement?"""
-
-        elif mode == ProblemMode.OPERATIONS:
-            return """**Operations Mode Focus:**
-- WHAT'S BLOCKING? (tool down, queue time, dispatch issue)
-- WHAT'S URGENT? (customer commit, capacity constraint)
-- IMPACT: How many lots affected? Revenue risk?
-- WORKAROUNDS: What temporary solutions exist?
-- ROOT CAUSE: Recurring issue or one-time?
-- PREVENTION: How to avoid next time?"""
-
-        return ""
-
-    def _format_list(self, items: List[str]) -> str:
-        """Format list for prompt."""
-        if not items:
-            return "- (None provided)"
-        return "\n".join([f"- {item}" for item in items])
+        return _MODE_TEMPLATES.get(mode, "")
 
     def process_response(
         self,
@@ -174,13 +224,12 @@ Make questions specific and actionable. Avoid generic questions.
         Returns:
             AgentOutput with questions
         """
-        import json
-
         try:
-            response_dict = json.loads(response)
+            response_dict, warnings = self._parse_json_response(response)
             questions = response_dict.get("questions", [])
             rationale = response_dict.get("rationale", "")
         except json.JSONDecodeError:
+            warnings = ("Response was not valid JSON",)
             # Fallback if JSON parsing fails
             questions = [
                 "When did you first notice this issue?",
@@ -205,12 +254,41 @@ Make questions specific and actionable. Avoid generic questions.
                 "mode": agent_input.mode.value
             },
             eight_d_phases_addressed=eight_d_phases,
-            facts=[],  # No new facts yet - waiting for answers
-            hypotheses=[],
+            facts=(),  # No new facts yet - waiting for answers
+            hypotheses=(),
             open_questions=questions,
-            cost_usd=0.0  # Will be updated by caller
+            cost_usd=0.0,  # Will be updated by caller
+            warnings=warnings
         )
 
+    def execute_streaming(
+        self,
+        agent_input: AgentInput
+    ) -> Generator[str, None, AgentOutput]:
+        """
+        Execute agent workflow, yielding questions as they are generated.
+
+        The LLM response is streamed and each question is yielded as soon
+        as it is complete, so the first question can be shown after
+        first-token latency rather than after the full response. Cached
+        responses and non-JSON fallbacks yield their questions at once.
+
+        Args:
+            agent_input: Input for this agent
+
+        Yields:
+            Clarification questions, in order
+
+        Returns:
+            AgentOutput with results (same as execute())
+        """
+        return (yield from self._execute_streaming(
+            agent_input,
+            "questions",
+            # Includes fallback questions when the response is not JSON
+            lambda output: output.metadata["questions"]
+        ))
+
     def _format_questions(self, questions: List[str], rationale: str) -> str:
         """Format questions for display."""
 
@@ -254,13 +332,10 @@ def process_clarification_answers(
     Returns:
         Dictionary with processed Q&A pairs
     """
-    clarifications = {}
-
-    for i, (q, a) in enumerate(zip(questions, answers)):
-        clarifications[f"Q{i+1}"] = {
-            "question": q,
-            "answer": a
-        }
+    clarifications = {
+        f"Q{i+1}": {"question": q, "answer": a}
+        for i, (q, a) in enumerate(zip(questions, answers))
+    }
 
     return {
         "clarifications": clarifications,
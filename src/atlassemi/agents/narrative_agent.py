@@ -5,13 +5,197 @@ Handles the initial free-form problem description from engineers.
 Does not interrupt, reframe, or demand precision - just listens and extracts.
 """
 
-from typing import Dict, Any, List
+import json
+import re
+from typing import Dict, Any, Generator, List, Optional, Tuple
 from dataclasses import dataclass
 
-from .base import BaseAgent, AgentInput, AgentOutput
+from .base import (
+    _json_loads,
+    BaseAgent,
+    AgentInput,
+    AgentOutput,
+    STRING_LIST_SCHEMA,
+    json_object_schema
+)
 
 
-@dataclass
+# Opening of the narrative analysis prompt
+_INTRO = """You are analyzing a semiconductor fab engineer's problem description.
+
+Your job is to extract structured information WITHOUT demanding precision or interrupting their flow.
+
+"""
+
+# Extraction instructions and output schema (static, so part of the
+# system prompt)
+_INSTRUCTIONS = """**Extract the following:**
+
+1. **Observations** (facts they saw):
+   - What did they observe? (SPC alerts, defects, tool behavior, etc.)
+   - Separate what they SAW from what they THINK
+
+2. **Interpretations** (their theories):
+   - What do they think is happening?
+   - What are they suspecting? (even if it might be wrong)
+
+3. **Constraints** (what's limiting them):
+   - Time pressure?
+   - Production impact?
+   - Tool availability?
+   - Data access limitations?
+
+4. **Urgency Signals** (why this matters now):
+   - What prompted them to escalate?
+   - What's at risk?
+
+5. **Data Sources Mentioned**:
+   - SPC charts, FDC data, metrology, defect inspection, etc.
+
+6. **Suspected Causes** (their current hypotheses):
+   - What do they think might be the root cause?
+
+Then generate a brief **reflection** that summarizes what you heard.
+This reflection should be neutral and confirming, like:
+"Here's what I heard — tell me if this is accurate."
+
+Format your response as JSON:
+{
+  "observations": [...],
+  "interpretations": [...],
+  "constraints": [...],
+  "urgency_signals": [...],
+  "data_sources_mentioned": [...],
+  "suspected_causes": [...],
+  "reflection": "..."
+}
+
+Remember: Accept ambiguity. Don't demand precision. Capture their mental model as-is."""
+
+# System prompt when split (built once rather than on every call)
+_SYSTEM_PROMPT = _INTRO + _INSTRUCTIONS
+
+# Structure of the LLM response (see _INSTRUCTIONS)
+_RESPONSE_SCHEMA = json_object_schema({
+    "observations": STRING_LIST_SCHEMA,
+    "interpretations": STRING_LIST_SCHEMA,
+    "constraints": STRING_LIST_SCHEMA,
+    "urgency_signals": STRING_LIST_SCHEMA,
+    "data_sources_mentioned": STRING_LIST_SCHEMA,
+    "suspected_causes": STRING_LIST_SCHEMA,
+    "reflection": {"type": "string"}
+})
+
+
+# Narratives shorter than this (after stripping) carry nothing to
+# analyze and are answered without the LLM
+MIN_NARRATIVE_CHARS = 10
+
+# Analysis returned for such narratives
+_TRIVIAL_NARRATIVE_RESPONSE = json.dumps({
+    "observations": [],
+    "interpretations": [],
+    "constraints": [],
+    "urgency_signals": [],
+    "data_sources_mentioned": [],
+    "suspected_causes": [],
+    "reflection": "Narrative too short to analyze; describe what happened, "
+                  "where and when."
+})
+
+# Structured alerts (e.g. auto-generated from SPC/FDC systems) are
+# recognized by one of these keys and analyzed without the LLM
+_ALERT_TYPE_KEYS = ("alert_type", "alarm", "rule", "alert")
+_ALERT_SEVERITY_KEYS = ("severity", "priority")
+_ALERT_SOURCE_KEYS = ("source", "system")
+
+# "key: value" or "key=value" line of a key-value alert
+_ALERT_LINE = re.compile(r"^\s*([A-Za-z][\w .-]*?)\s*[:=]\s*(.+?)\s*$")
+
+
+def _parse_structured_alert(narrative: str) -> Optional[Dict[str, str]]:
+    """
+    Parse a structured alert narrative into its fields.
+
+    Accepts a flat JSON object or at least two "key: value" /
+    "key=value" lines. Keys are normalized to lowercase snake_case.
+
+    Args:
+        narrative: User's narrative
+
+    Returns:
+        Alert fields in input order, or None if the narrative is not a
+        structured alert
+    """
+    text = narrative.strip()
+    fields: Dict[str, Any] = {}
+
+    if text.startswith("{"):
+        try:
+            parsed = _json_loads(text)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(parsed, dict):
+            return None
+        fields = parsed
+    else:
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            match = _ALERT_LINE.match(line)
+            if match is None:
+                return None  # Free-form text mixed in
+            fields[match.group(1)] = match.group(2)
+        if len(fields) < 2:
+            return None
+
+    alert = {
+        re.sub(r"[\s.-]+", "_", str(key).strip()).lower(): str(value)
+        for key, value in fields.items()
+        if value not in (None, "") and not isinstance(value, (dict, list))
+    }
+    if not any(key in alert for key in _ALERT_TYPE_KEYS):
+        return None
+    return alert
+
+
+# Fab entities worth recording, matched in one pass over the
+# narrative (one compiled alternation; groups are named by entity kind)
+_ENTITY_RE = re.compile(
+    r"(?P<chamber>\b(?i:chamber|ch\.)\s*(?:[A-Z]|\d{1,2})\b)"
+    r"|(?P<cpk>\b(?i:cpk)\b[^\d\n]{0,20}\d+(?:\.\d+)?"
+    r"(?:\s*(?:to|->)\s*\d+(?:\.\d+)?)?)"
+    r"|(?P<lot>\b(?i:lot)\s+[A-Z]*\d[A-Z0-9.]*\b)"
+    r"|(?P<tool>\b[A-Z]{2,6}-[A-Z0-9]{1,4}\b)"
+)
+
+
+def _extract_entities(narrative: str) -> Dict[str, List[str]]:
+    """
+    Find fab entities (chambers, Cpk values, lots, tool IDs) in a narrative.
+
+    Args:
+        narrative: User's narrative
+
+    Returns:
+        Entity kind -> matched text in order of appearance, without
+        duplicates; kinds without matches are omitted
+    """
+    entities: Dict[str, List[str]] = {}
+    for match in _ENTITY_RE.finditer(narrative):
+        found = entities.setdefault(match.lastgroup, [])
+        text = " ".join(match.group().split())
+        if text not in found:
+            found.append(text)
+    return entities
+
+
+def _section(title: str, items: List[str]) -> List[str]:
+    """Markdown lines for a bulleted section, or none if it is empty."""
+    return [f"## {title}", *[f"- {item}" for item in items], ""] if items else []
+
+
+@dataclass(slots=True, frozen=True)
 class NarrativeAnalysis:
     """Analysis of user's narrative."""
 
@@ -30,6 +214,33 @@ class NarrativeAnalysis:
     # Reflection for user validation
     reflection: str
 
+    @classmethod
+    def from_any(cls, obj: Any) -> "NarrativeAnalysis":
+        """
+        Normalize narrative analysis data into a NarrativeAnalysis.
+
+        Args:
+            obj: NarrativeAnalysis, dict of its fields (e.g. parsed from
+                the LLM response), or None
+
+        Returns:
+            obj itself if it is already a NarrativeAnalysis, else a new
+            instance with missing fields empty
+        """
+        if isinstance(obj, cls):
+            return obj
+
+        data = obj if isinstance(obj, dict) else {}
+        return cls(
+            observations=data.get("observations", []),
+            interpretations=data.get("interpretations", []),
+            constraints=data.get("constraints", []),
+            urgency_signals=data.get("urgency_signals", []),
+            data_sources_mentioned=data.get("data_sources_mentioned", []),
+            suspected_causes=data.get("suspected_causes", []),
+            reflection=data.get("reflection", "")
+        )
+
 
 class NarrativeAgent(BaseAgent):
     """
@@ -48,8 +259,28 @@ class NarrativeAgent(BaseAgent):
     - Accept ambiguity and incompleteness
     """
 
-    def __init__(self, model_router=None):
-        super().__init__(agent_type="narrative", model_router=model_router)
+    dependencies = frozenset()
+    response_schema = _RESPONSE_SCHEMA
+    response_type = NarrativeAnalysis
+
+    def __init__(
+        self,
+        model_router=None,
+        response_cache=None,
+        semantic_cache=None,
+        enable_cache=True,
+        action_cache=None,
+        similarity_threshold=None
+    ):
+        super().__init__(
+            agent_type="narrative",
+            model_router=model_router,
+            response_cache=response_cache,
+            semantic_cache=semantic_cache,
+            enable_cache=enable_cache,
+            action_cache=action_cache,
+            similarity_threshold=similarity_threshold
+        )
 
     def generate_intake_prompt(self) -> str:
         """
@@ -77,59 +308,85 @@ Bullet points or stream-of-consciousness are both fine."""
         Returns:
             Prompt for LLM to analyze narrative
         """
-        narrative = agent_input.context.get('narrative', '')
-
-        prompt = f"""You are analyzing a semiconductor fab engineer's problem description.
-
-Your job is to extract structured information WITHOUT demanding precision or interrupting their flow.
-
-**User's Narrative:**
-{narrative}
-
-**Extract the following:**
-
-1. **Observations** (facts they saw):
-   - What did they observe? (SPC alerts, defects, tool behavior, etc.)
-   - Separate what they SAW from what they THINK
+        return (
+            _INTRO
+            + self._format_narrative(agent_input)
+            + _INSTRUCTIONS
+        )
 
-2. **Interpretations** (their theories):
-   - What do they think is happening?
-   - What are they suspecting? (even if it might be wrong)
+    def split_prompt(self, agent_input: AgentInput) -> Tuple[Optional[str], str]:
+        """Static instructions as system prompt, narrative as prompt."""
+        return _SYSTEM_PROMPT, self._format_narrative(agent_input)
 
-3. **Constraints** (what's limiting them):
-   - Time pressure?
-   - Production impact?
-   - Tool availability?
-   - Data access limitations?
+    def _format_narrative(self, agent_input: AgentInput) -> str:
+        """Format the per-request part of the prompt (the user's narrative)."""
+        narrative = agent_input.context.get('narrative', '')
+        return f"**User's Narrative:**\n{narrative}\n\n"
 
-4. **Urgency Signals** (why this matters now):
-   - What prompted them to escalate?
-   - What's at risk?
+    def get_semantic_cache_text(self, agent_input: AgentInput) -> Optional[str]:
+        """Narrative analysis depends only on the narrative itself."""
+        return agent_input.context.get('narrative', '').strip() or None
 
-5. **Data Sources Mentioned**:
-   - SPC charts, FDC data, metrology, defect inspection, etc.
+    def local_response(self, agent_input: AgentInput) -> Optional[str]:
+        """
+        Analyze trivial narratives and structured SPC/FDC alerts without the LLM.
 
-6. **Suspected Causes** (their current hypotheses):
-   - What do they think might be the root cause?
+        Narratives shorter than MIN_NARRATIVE_CHARS get an empty analysis.
+        For alerts, each field becomes an observation; severity/priority
+        fields are urgency signals and source/system fields data sources.
+        Other free-form narratives return None and go to the LLM.
+        """
+        narrative = agent_input.context.get('narrative', '')
+        if len(narrative.strip()) < MIN_NARRATIVE_CHARS:
+            return _TRIVIAL_NARRATIVE_RESPONSE
+
+        alert = _parse_structured_alert(narrative)
+        if alert is None:
+            return None
+
+        alert_type = next(alert[key] for key in _ALERT_TYPE_KEYS if key in alert)
+        labels = {key: key.replace("_", " ").capitalize() for key in alert}
+
+        return json.dumps({
+            "observations": [
+                f"{labels[key]}: {value}" for key, value in alert.items()
+            ],
+            "interpretations": [],
+            "constraints": [],
+            "urgency_signals": [
+                f"{labels[key]}: {alert[key]}"
+                for key in _ALERT_SEVERITY_KEYS if key in alert
+            ],
+            "data_sources_mentioned": [
+                alert[key] for key in _ALERT_SOURCE_KEYS if key in alert
+            ],
+            "suspected_causes": [],
+            "reflection": f"Structured {alert_type} alert"
+        })
+
+    def execute_streaming(
+        self,
+        agent_input: AgentInput
+    ) -> Generator[str, None, AgentOutput]:
+        """
+        Execute agent workflow, yielding observations as they are generated.
 
-Then generate a brief **reflection** that summarizes what you heard.
-This reflection should be neutral and confirming, like:
-"Here's what I heard — tell me if this is accurate."
+        The LLM response is streamed and each observation (fact) is
+        yielded as soon as it is complete, while the model is still
+        writing the interpretations, causes and reflection.
 
-Format your response as JSON:
-{{
-  "observations": [...],
-  "interpretations": [...],
-  "constraints": [...],
-  "urgency_signals": [...],
-  "data_sources_mentioned": [...],
-  "suspected_causes": [...],
-  "reflection": "..."
-}}
+        Args:
+            agent_input: Input for this agent
 
-Remember: Accept ambiguity. Don't demand precision. Capture their mental model as-is."""
+        Yields:
+            Observations, in order (the output's facts)
 
-        return prompt
+        Returns:
+            AgentOutput with results (same as execute())
+        """
+        return (yield from self._execute_streaming(
+            agent_input, "observations", lambda output: output.facts
+        ))
 
     def process_response(
         self,
@@ -146,13 +403,12 @@ Remember: Accept ambiguity. Don't demand precision. Capture their mental model a
         Returns:
             AgentOutput with narrative analysis
         """
-        import json
-
         try:
-            analysis_dict = json.loads(response)
+            parsed, warnings = self._parse_json_response(response)
         except json.JSONDecodeError:
+            warnings = ("Response was not valid JSON",)
             # Fallback if JSON parsing fails
-            analysis_dict = {
+            parsed = {
                 "observations": ["Unable to parse narrative"],
                 "interpretations": [],
                 "constraints": [],
@@ -163,15 +419,9 @@ Remember: Accept ambiguity. Don't demand precision. Capture their mental model a
             }
 
         # Create NarrativeAnalysis
-        analysis = NarrativeAnalysis(
-            observations=analysis_dict.get("observations", []),
-            interpretations=analysis_dict.get("interpretations", []),
-            constraints=analysis_dict.get("constraints", []),
-            urgency_signals=analysis_dict.get("urgency_signals", []),
-            data_sources_mentioned=analysis_dict.get("data_sources_mentioned", []),
-            suspected_causes=analysis_dict.get("suspected_causes", []),
-            reflection=analysis_dict.get("reflection", "")
-        )
+        analysis = NarrativeAnalysis.from_any(parsed)
+
+        narrative = agent_input.context.get('narrative', '')
 
         # Format for output
         content = self._format_analysis(analysis)
@@ -184,14 +434,18 @@ Remember: Accept ambiguity. Don't demand precision. Capture their mental model a
             content=content,
             metadata={
                 "analysis": analysis,
-                "narrative": agent_input.context.get('narrative', '')
+                "narrative": narrative,
+                # Fab entities scanned from the narrative itself; the
+                # LLM observations stay the authoritative facts
+                "entities": _extract_entities(narrative)
             },
             eight_d_phases_addressed=eight_d_phases,
             facts=analysis.observations,
             hypotheses=analysis.suspected_causes,
-            open_questions=[],  # Will be determined in clarification phase
+            open_questions=(),  # Will be determined in clarification phase
             cost_usd=0.0,  # TODO: Track actual cost
-            quality_metrics={}
+            quality_metrics={},
+            warnings=warnings
         )
 
     def _format_analysis(self, analysis: NarrativeAnalysis) -> str:
@@ -204,47 +458,19 @@ Remember: Accept ambiguity. Don't demand precision. Capture their mental model a
         Returns:
             Formatted markdown string
         """
-        lines = ["# Narrative Analysis (Phase 0)", ""]
-
-        if analysis.observations:
-            lines.append("## Observations (Facts)")
-            for obs in analysis.observations:
-                lines.append(f"- {obs}")
-            lines.append("")
-
-        if analysis.interpretations:
-            lines.append("## Interpretations (Their Theory)")
-            for interp in analysis.interpretations:
-                lines.append(f"- {interp}")
-            lines.append("")
-
-        if analysis.constraints:
-            lines.append("## Constraints")
-            for constraint in analysis.constraints:
-                lines.append(f"- {constraint}")
-            lines.append("")
-
-        if analysis.urgency_signals:
-            lines.append("## Urgency Signals")
-            for signal in analysis.urgency_signals:
-                lines.append(f"- {signal}")
-            lines.append("")
-
-        if analysis.data_sources_mentioned:
-            lines.append("## Data Sources Mentioned")
-            for source in analysis.data_sources_mentioned:
-                lines.append(f"- {source}")
-            lines.append("")
-
-        if analysis.suspected_causes:
-            lines.append("## Suspected Causes (To Validate)")
-            for cause in analysis.suspected_causes:
-                lines.append(f"- {cause}")
-            lines.append("")
-
-        lines.append("## Reflection")
-        lines.append("")
-        lines.append(analysis.reflection)
+        lines = [
+            "# Narrative Analysis (Phase 0)",
+            "",
+            *_section("Observations (Facts)", analysis.observations),
+            *_section("Interpretations (Their Theory)", analysis.interpretations),
+            *_section("Constraints", analysis.constraints),
+            *_section("Urgency Signals", analysis.urgency_signals),
+            *_section("Data Sources Mentioned", analysis.data_sources_mentioned),
+            *_section("Suspected Causes (To Validate)", analysis.suspected_causes),
+            "## Reflection",
+            "",
+            analysis.reflection
+        ]
 
         return "\n".join(lines)
 
@@ -0,0 +1,104 @@
+"""
+Concurrent agent pipeline for ATLASsemi.
+
+Runs a set of agents as a dependency graph: each agent starts as soon as
+the agents it depends on have finished, so independent agents overlap
+and wall-clock time follows the critical path instead of the sum.
+"""
+
+import asyncio
+from dataclasses import replace
+from typing import Dict, FrozenSet, Sequence
+
+from .base import AgentInput, AgentOutput, BaseAgent, MAX_CONCURRENT_LLM_CALLS
+
+
+def _resolve_dependencies(
+    agents: Sequence[BaseAgent]
+) -> Dict[str, FrozenSet[str]]:
+    """
+    Resolve each agent's dependencies within the pipeline.
+
+    Agents without declared dependencies depend on the previous agent.
+    Dependencies on agents not in the pipeline are ignored.
+
+    Args:
+        agents: Agents in pipeline order
+
+    Returns:
+        Dict mapping agent type to the agent types it waits for
+
+    Raises:
+        ValueError: If agent types repeat or dependencies form a cycle
+    """
+    types = [agent.agent_type for agent in agents]
+    if len(set(types)) != len(types):
+        raise ValueError(f"Duplicate agent types in pipeline: {types}")
+
+    resolved = {}
+    for i, agent in enumerate(agents):
+        deps = agent.dependencies
+        if deps is None:
+            deps = frozenset(types[i - 1:i])
+        resolved[agent.agent_type] = frozenset(deps) & set(types)
+
+    # Kahn's algorithm: every agent must become ready eventually
+    remaining = dict(resolved)
+    while remaining:
+        ready = [t for t, deps in remaining.items() if not deps & remaining.keys()]
+        if not ready:
+            raise ValueError(
+                f"Circular agent dependencies: {sorted(remaining)}"
+            )
+        for agent_type in ready:
+            del remaining[agent_type]
+
+    return resolved
+
+
+async def run_pipeline(
+    agents: Sequence[BaseAgent],
+    shared_input: AgentInput,
+    max_concurrency: int = MAX_CONCURRENT_LLM_CALLS
+) -> Dict[str, AgentOutput]:
+    """
+    Execute agents concurrently wherever they have no data dependency.
+
+    Each agent receives shared_input with the outputs of its dependencies
+    added to the context as "<agent_type>_output".
+
+    Args:
+        agents: Agents in pipeline order
+        shared_input: Input shared by all agents
+        max_concurrency: Maximum LLM calls in flight at once
+
+    Returns:
+        Dict mapping agent type to its output
+
+    Raises:
+        ValueError: If agent types repeat or dependencies form a cycle
+    """
+    dependencies = _resolve_dependencies(agents)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks: Dict[str, "asyncio.Task[AgentOutput]"] = {}
+
+    async def run(agent: BaseAgent) -> AgentOutput:
+        deps = sorted(dependencies[agent.agent_type])
+        upstream = await asyncio.gather(*(tasks[d] for d in deps))
+
+        agent_input = replace(
+            shared_input,
+            context={
+                **shared_input.context,
+                **{f"{d}_output": out for d, out in zip(deps, upstream)}
+            }
+        )
+
+        async with semaphore:
+            return await agent.aexecute(agent_input)
+
+    async with asyncio.TaskGroup() as tg:
+        for agent in agents:
+            tasks[agent.agent_type] = tg.create_task(run(agent))
+
+    return {agent_type: task.result() for agent_type, task in tasks.items()}
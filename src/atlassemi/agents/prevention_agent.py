@@ -1,46 +1,50 @@
 """Phase 3: Prevention and Lessons Learned Agent"""
 
 import json
-from typing import Dict, Any
-from .base import BaseAgent, AgentInput, AgentOutput, ProblemMode
-
-
-class PreventionAgent(BaseAgent):
-    """
-    Phase 3 Agent: Prevention and Documentation
-
-    Generates:
-    - Permanent corrective actions (D5)
-    - Systemic prevention recommendations (D7)
-    - Lessons learned documentation (D8)
-    """
-
-    def __init__(self, model_router=None):
-        super().__init__(agent_type="prevention", model_router=model_router)
-
-    def generate_prompt(self, agent_input: AgentInput) -> str:
-        """Generate prevention planning prompt"""
-
-        # Extract analysis from Phase 2
-        analysis = agent_input.context.get("analysis", {})
-        root_causes = agent_input.context.get("root_causes", [])
-
-        # Mode-specific guidance
-        mode_guidance = self._get_mode_guidance(agent_input.mode)
-
-        prompt = f"""You are a prevention and documentation specialist for semiconductor manufacturing 8D analysis.
-
-{mode_guidance}
-
-## Context from Previous Analysis
-
-**Root Causes Identified:**
-{json.dumps(root_causes, indent=2)}
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Tuple
+
+from .base import (
+    BaseAgent,
+    AgentInput,
+    AgentOutput,
+    ProblemMode,
+    STRING_LIST_SCHEMA,
+    json_object_schema
+)
+
+
+# Mode-specific prevention guidance
+_MODE_GUIDANCE = MappingProxyType({
+    ProblemMode.EXCURSION: """**Mode: Excursion Response**
+Focus on:
+- Immediate containment actions made permanent
+- Preventing similar excursions on similar tools/processes
+- Early warning systems for detection
+- Maintenance and recipe control improvements""",
+    ProblemMode.IMPROVEMENT: """**Mode: Yield Improvement**
+Focus on:
+- Sustainable process improvements
+- Variability reduction strategies
+- Long-term capability improvements
+- Best practice documentation""",
+    ProblemMode.OPERATIONS: """**Mode: Operations Troubleshooting**
+Focus on:
+- Workflow improvements to prevent delays
+- Communication and escalation improvements
+- Tools and automation to speed resolution
+- Process clarification to prevent confusion"""
+})
 
-**8D Analysis:**
-{json.dumps(analysis, indent=2)}
+# Opening of the prompt per mode (static, so part of the system prompt)
+_INTROS = MappingProxyType({
+    mode: "You are a prevention and documentation specialist for "
+    f"semiconductor manufacturing 8D analysis.\n\n{guidance}\n\n"
+    for mode, guidance in _MODE_GUIDANCE.items()
+})
 
-## Your Task
+# Task description and output schema (static)
+_INSTRUCTIONS = """## Your Task
 
 Generate a comprehensive prevention plan with three components:
 
@@ -75,25 +79,25 @@ Document knowledge for future reference:
 
 Return ONLY valid JSON with this structure:
 
-{{
+{
   "permanent_actions": [
-    {{
+    {
       "action": "Specific action description",
       "rationale": "Why this prevents recurrence",
       "owner": "Process Engineering / Maintenance / etc.",
       "timeline": "Within X weeks/days",
       "success_metrics": "How to measure effectiveness",
       "implementation_steps": ["Step 1", "Step 2", "..."]
-    }}
+    }
   ],
   "systemic_prevention": [
-    {{
+    {
       "change": "Description of systemic change",
       "scope": "Single tool / Tool type / Entire fab",
       "implementation": "How to implement",
       "benefits": "Expected benefits",
       "risks": "Potential risks or downsides"
-    }}
+    }
   ],
   "lessons_learned": [
     "Lesson 1",
@@ -101,75 +105,173 @@ Return ONLY valid JSON with this structure:
     "..."
   ],
   "knowledge_base_updates": [
-    {{
+    {
       "document": "Tool Handbook Section X / SOP-XXX / etc.",
       "update_needed": "What to add/change",
       "priority": "high / medium / low"
-    }}
+    }
   ],
   "follow_up_items": [
-    {{
+    {
       "item": "Action item description",
       "owner": "Who is responsible",
       "deadline": "When it should be done"
-    }}
+    }
   ]
-}}
+}
 
 Be specific and actionable. Focus on prevention, not just detection.
 """
-        return prompt
 
-    def _get_mode_guidance(self, mode: ProblemMode) -> str:
-        """Get mode-specific prevention guidance"""
+# System prompt per mode when split (built once rather than on every call)
+_SYSTEM_PROMPTS = MappingProxyType({
+    mode: intro + _INSTRUCTIONS for mode, intro in _INTROS.items()
+})
 
-        if mode == ProblemMode.EXCURSION:
-            return """**Mode: Excursion Response**
-Focus on:
-- Immediate containment actions made permanent
-- Preventing similar excursions on similar tools/processes
-- Early warning systems for detection
-- Maintenance and recipe control improvements"""
+# 8D phases addressed in prevention phase
+_PHASES_ADDRESSED = ("D5", "D7", "D8")
 
-        elif mode == ProblemMode.IMPROVEMENT:
-            return """**Mode: Yield Improvement**
-Focus on:
-- Sustainable process improvements
-- Variability reduction strategies
-- Long-term capability improvements
-- Best practice documentation"""
+# Per-request part of the prompt (filled by _format_analysis_context)
+_CONTEXT_TEMPLATE = """## Context from Previous Analysis
 
-        elif mode == ProblemMode.OPERATIONS:
-            return """**Mode: Operations Troubleshooting**
-Focus on:
-- Workflow improvements to prevent delays
-- Communication and escalation improvements
-- Tools and automation to speed resolution
-- Process clarification to prevent confusion"""
+**Root Causes Identified:**
+%s
+
+**8D Analysis:**
+%s
+
+"""
+
+_STRING = {"type": "string"}
+
+# Structure of the LLM response (see _INSTRUCTIONS)
+_RESPONSE_SCHEMA = json_object_schema({
+    "permanent_actions": {"type": "array", "items": json_object_schema({
+        "action": _STRING,
+        "rationale": _STRING,
+        "owner": _STRING,
+        "timeline": _STRING,
+        "success_metrics": _STRING,
+        "implementation_steps": STRING_LIST_SCHEMA
+    })},
+    "systemic_prevention": {"type": "array", "items": json_object_schema({
+        "change": _STRING,
+        "scope": _STRING,
+        "implementation": _STRING,
+        "benefits": _STRING,
+        "risks": _STRING
+    })},
+    "lessons_learned": STRING_LIST_SCHEMA,
+    "knowledge_base_updates": {"type": "array", "items": json_object_schema({
+        "document": _STRING,
+        "update_needed": _STRING,
+        "priority": {"type": "string", "enum": ["high", "medium", "low"]}
+    })},
+    "follow_up_items": {"type": "array", "items": json_object_schema({
+        "item": _STRING,
+        "owner": _STRING,
+        "deadline": _STRING
+    })}
+})
+
+
+class PreventionAgent(BaseAgent):
+    """
+    Phase 3 Agent: Prevention and Documentation
+
+    Generates:
+    - Permanent corrective actions (D5)
+    - Systemic prevention recommendations (D7)
+    - Lessons learned documentation (D8)
+    """
+
+    dependencies = frozenset({"narrative", "analysis"})
+    response_schema = _RESPONSE_SCHEMA
+
+    def __init__(
+        self,
+        model_router=None,
+        response_cache=None,
+        enable_cache=True,
+        action_cache=None
+    ):
+        super().__init__(
+            agent_type="prevention",
+            model_router=model_router,
+            response_cache=response_cache,
+            enable_cache=enable_cache,
+            action_cache=action_cache
+        )
+
+    def generate_prompt(self, agent_input: AgentInput) -> str:
+        """Generate prevention planning prompt"""
+        return (
+            _INTROS[agent_input.mode]
+            + self._format_analysis_context(agent_input)
+            + _INSTRUCTIONS
+        )
+
+    def split_prompt(self, agent_input: AgentInput) -> Tuple[Optional[str], str]:
+        """Static guidance and task as system prompt, analysis as prompt."""
+        return (
+            _SYSTEM_PROMPTS[agent_input.mode],
+            self._format_analysis_context(agent_input)
+        )
+
+    def _format_analysis_context(self, agent_input: AgentInput) -> str:
+        """Format the per-request part of the prompt (Phase 2 results)."""
+        # Extract analysis from Phase 2
+        analysis = agent_input.context.get("analysis", {})
+        root_causes = agent_input.context.get("root_causes", [])
+
+        return _CONTEXT_TEMPLATE % (
+            json.dumps(root_causes, indent=2),
+            json.dumps(analysis, indent=2)
+        )
 
-        return ""
+    def _get_mode_guidance(self, mode: ProblemMode) -> str:
+        """Get mode-specific prevention guidance"""
+        return _MODE_GUIDANCE.get(mode, "")
 
     def process_response(self, response: str, agent_input: AgentInput) -> AgentOutput:
         """Parse prevention plan response"""
 
         try:
             # Try to parse as JSON
-            prevention_data = json.loads(response)
+            prevention_data, warnings = self._parse_json_response(response)
+        except json.JSONDecodeError as e:
+            warnings = ("Response was not valid JSON",)
+            # Fallback: treat as unstructured text
+            content = response
+            metadata = {"parse_error": str(e)}
+            facts = [f"Prevention plan generated (JSON parse failed: {str(e)})"]
+            hypotheses = ()
+        else:
+            # Pretty-printed for display (responses may arrive minified,
+            # e.g. from tool calls, or wrapped in prose)
+            content = json.dumps(prevention_data, indent=2)
 
             # Extract structured fields
             permanent_actions = prevention_data.get("permanent_actions", [])
             systemic_prevention = prevention_data.get("systemic_prevention", [])
-            lessons_learned = prevention_data.get("lessons_learned", [])
-            kb_updates = prevention_data.get("knowledge_base_updates", [])
-            follow_up = prevention_data.get("follow_up_items", [])
+            metadata = {
+                "permanent_actions": permanent_actions,
+                "systemic_prevention": systemic_prevention,
+                "lessons_learned": prevention_data.get("lessons_learned", []),
+                "knowledge_base_updates": prevention_data.get(
+                    "knowledge_base_updates", []
+                ),
+                "follow_up_items": prevention_data.get("follow_up_items", [])
+            }
 
             # Build facts (concrete actions)
-            facts = []
-            for action in permanent_actions:
-                facts.append(f"D5: {action.get('action', 'N/A')} - {action.get('rationale', 'N/A')}")
-
-            for prevention in systemic_prevention:
-                facts.append(f"D7: {prevention.get('change', 'N/A')} (scope: {prevention.get('scope', 'N/A')})")
+            facts = [
+                f"D5: {action.get('action', 'N/A')} - {action.get('rationale', 'N/A')}"
+                for action in permanent_actions
+            ] + [
+                f"D7: {prevention.get('change', 'N/A')} (scope: {prevention.get('scope', 'N/A')})"
+                for prevention in systemic_prevention
+            ]
 
             # Build hypotheses (expected benefits, risks)
             hypotheses = []
@@ -179,36 +281,16 @@ Focus on:
                 if prevention.get('risks'):
                     hypotheses.append(f"Potential risk: {prevention['risks']}")
 
-            # 8D phases addressed in prevention phase
-            eight_d_phases_addressed = ["D5", "D7", "D8"]
-
-            return AgentOutput(
-                agent_type=self.agent_type,
-                content=json.dumps(prevention_data, indent=2),
-                metadata={
-                    "permanent_actions": permanent_actions,
-                    "systemic_prevention": systemic_prevention,
-                    "lessons_learned": lessons_learned,
-                    "knowledge_base_updates": kb_updates,
-                    "follow_up_items": follow_up
-                },
-                eight_d_phases_addressed=eight_d_phases_addressed,
-                facts=facts,
-                hypotheses=hypotheses,
-                cost_usd=0.0  # Will be updated by caller
-            )
-
-        except json.JSONDecodeError as e:
-            # Fallback: treat as unstructured text
-            return AgentOutput(
-                agent_type=self.agent_type,
-                content=response,
-                metadata={"parse_error": str(e)},
-                eight_d_phases_addressed=["D5", "D7", "D8"],
-                facts=[f"Prevention plan generated (JSON parse failed: {str(e)})"],
-                hypotheses=[],
-                cost_usd=0.0
-            )
+        return AgentOutput(
+            agent_type=self.agent_type,
+            content=content,
+            metadata=metadata,
+            eight_d_phases_addressed=_PHASES_ADDRESSED,
+            facts=facts,
+            hypotheses=hypotheses,
+            cost_usd=0.0,  # Will be updated by caller
+            warnings=warnings
+        )
 
     def get_max_tokens(self) -> int:
         """Return token budget for prevention planning"""
@@ -0,0 +1,344 @@
+"""
+CLI core for ATLASsemi
+
+Menus, narrative intake and the interactive workflow driver shared by the
+command-line entry points.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from typing import Optional
+
+from atlassemi.agents import SQLiteActionCache
+from atlassemi.agents.base import ProblemMode, SecurityTier
+from atlassemi.orchestrator import WorkflowOrchestrator, answers_from_file
+from atlassemi.security.tier_enforcer import (
+    TierEnforcer,
+    SecurityViolationError
+)
+from atlassemi.config import (
+    ModelRouter,
+    RuntimeMode,
+    ResponseCache,
+    SemanticCache
+)
+
+
+# Static output blocks, built once at import and written with a single call
+_RULE = "=" * 60 + "\n"
+
+
+def _heading(title: str) -> str:
+    """Format a ruled section heading followed by a blank line."""
+    return f"{_RULE}{title}\n{_RULE}\n"
+
+
+_BANNER = _heading("ATLASsemi - Semiconductor Fab Problem-Solving Assistant")
+
+_MODE_MENU = (
+    "Problem-Solving Mode:\n"
+    "  1. Yield Excursion Response (fast containment)\n"
+    "  2. Yield Improvement (continuous improvement)\n"
+    "  3. Factory Operations (sustainment)\n"
+    "\n"
+)
+
+_TIER_MENU = (
+    "Security Tier:\n"
+    "  1. General LLM (public knowledge only)\n"
+    "  2. Confidential Fab (factory API access)\n"
+    "  3. Top Secret (on-prem only)\n"
+    "\n"
+)
+
+_NARRATIVE_INTRO = (
+    _heading("Narrative Intake")
+    + "Describe your problem in free-form. Be as detailed as you like.\n"
+    "Include symptoms, observations, timeline, and any other context.\n"
+    "\n"
+    "(Type your description, then press Ctrl+D on Unix "
+    "or Ctrl+Z on Windows when done)\n"
+    "\n"
+)
+
+_WORKFLOW_START = "\n" + _heading("Executing 4-Phase Workflow")
+
+_MODE_MAP = {
+    "1": ProblemMode.EXCURSION,
+    "2": ProblemMode.IMPROVEMENT,
+    "3": ProblemMode.OPERATIONS,
+}
+
+_TIER_MAP = {
+    "1": SecurityTier.GENERAL_LLM,
+    "2": SecurityTier.CONFIDENTIAL_FAB,
+    "3": SecurityTier.TOP_SECRET,
+}
+
+
+def _bullets(title: str, items) -> str:
+    """Format a titled bullet list block."""
+    return "".join([f"{title}\n", *(f"  - {item}\n" for item in items), "\n"])
+
+
+def select_mode() -> Optional[ProblemMode]:
+    """
+    Prompt for the problem-solving mode.
+
+    Returns:
+        Selected mode, or None if the choice was invalid
+    """
+    sys.stdout.write(_MODE_MENU)
+
+    mode_choice = input("Select mode [1-3]: ").strip()
+
+    mode = _MODE_MAP.get(mode_choice)
+    if mode is None:
+        print("Invalid mode selection.")
+    return mode
+
+
+def select_tier() -> Optional[SecurityTier]:
+    """
+    Prompt for the security tier.
+
+    Returns:
+        Selected tier, or None if the choice was invalid
+    """
+    sys.stdout.write(_TIER_MENU)
+
+    tier_choice = input("Select tier [1-3]: ").strip()
+
+    tier = _TIER_MAP.get(tier_choice)
+    if tier is None:
+        print("Invalid tier selection.")
+    return tier
+
+
+def read_narrative() -> str:
+    """
+    Read the free-form problem narrative from stdin.
+
+    Returns:
+        Narrative text (empty if nothing was entered)
+    """
+    sys.stdout.write(_NARRATIVE_INTRO)
+
+    # Read in one go until EOF
+    return sys.stdin.read().strip()
+
+
+def main(argv=None):
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="ATLASsemi - Semiconductor Fab Problem-Solving Assistant"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the LLM instead of reusing cached responses"
+    )
+    parser.add_argument(
+        "--cache-confidential",
+        action="store_true",
+        help="Also keep the on-disk response caches for confidential and "
+             "top-secret runs (they are stored unencrypted)"
+    )
+    parser.add_argument(
+        "--deterministic",
+        action="store_true",
+        help="Run models at temperature 0 and reuse the complete phase "
+             "outputs of identical earlier runs"
+    )
+    parser.add_argument(
+        "--similarity-threshold",
+        type=float,
+        default=None,
+        help="Minimum similarity (0-1) for reusing the analysis of a "
+             "near-duplicate narrative"
+    )
+    parser.add_argument(
+        "--answers",
+        metavar="FILE",
+        help="Answer the clarification questions from FILE (one answer "
+             "per line, in question order; blank or 'skip' to skip) "
+             "instead of prompting"
+    )
+    args = parser.parse_args(argv)
+
+    answer_collector = None  # Default: prompt on the terminal
+    if args.answers is not None:
+        try:
+            answer_collector = answers_from_file(args.answers)
+        except OSError as e:
+            parser.error(f"cannot read answers file: {e}")
+
+    write = sys.stdout.write
+    write(_BANNER)
+
+    # Initialize model router
+    runtime_mode_env = os.getenv("ATLASSEMI_RUNTIME_MODE", "dev")
+    runtime_mode = RuntimeMode.RUNTIME if runtime_mode_env == "runtime" else RuntimeMode.DEV
+
+    write(f"Runtime Mode: {runtime_mode.name}\n\n")
+
+    model_router = ModelRouter(mode=runtime_mode, deterministic=args.deterministic)
+
+    # Step 1: Select mode
+    mode = select_mode()
+    if mode is None:
+        return
+
+    write(f"\nMode: {mode.value}\n\n")
+
+    # Step 2: Select security tier
+    tier = select_tier()
+    if tier is None:
+        return
+
+    # Initialize tier enforcer
+    enforcer = TierEnforcer(current_tier=tier)
+    write(
+        f"\nSecurity Tier: {tier.name}\n\n"
+        f"Allowed tools in this tier: {', '.join(enforcer.get_allowed_tools())}\n\n"
+    )
+
+    # Step 3: Narrative intake
+    narrative = read_narrative()
+
+    if not narrative:
+        print("\nNo narrative provided. Exiting.")
+        return
+
+    write(_WORKFLOW_START)
+
+    # Initialize caches. The disk caches store narratives and analyses
+    # in plaintext, so above GENERAL_LLM they are opt-in (see SECURITY.md)
+    response_cache = None
+    semantic_cache = None
+    action_cache = None
+    if not args.no_cache and (
+        tier == SecurityTier.GENERAL_LLM or args.cache_confidential
+    ):
+        response_cache = ResponseCache()
+        if args.deterministic:
+            action_cache = SQLiteActionCache()
+        try:
+            semantic_cache = SemanticCache()
+        except ImportError as e:
+            write(f"Note: semantic cache disabled ({e})\n\n")
+
+    # Initialize orchestrator
+    orchestrator = WorkflowOrchestrator(
+        model_router=model_router,
+        response_cache=response_cache,
+        semantic_cache=semantic_cache,
+        enable_cache=not args.no_cache,
+        action_cache=action_cache,
+        similarity_threshold=args.similarity_threshold
+    )
+
+    async def run_workflow():
+        try:
+            return await orchestrator.arun_workflow(
+                narrative=narrative,
+                mode=mode,
+                tier=tier,
+                answer_collector=answer_collector
+            )
+        finally:
+            # Async HTTP connections must be closed on their own loop
+            await model_router.aclose()
+
+    # Show the orchestrator's phase banners and progress on the console
+    # (written directly, so they stay in order with the prompts)
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    workflow_logger = logging.getLogger("atlassemi.orchestrator")
+    workflow_logger.addHandler(console)
+    workflow_logger.setLevel(logging.INFO)
+
+    # Execute full workflow
+    try:
+        result = asyncio.run(run_workflow())
+
+        # Display results (summary statistics, key outputs, prevention plan)
+        blocks = [
+            "\n" + _heading("WORKFLOW COMPLETE"),
+            _bullets("**Summary:**", [
+                f"Phases Completed: {len(result.phases_completed)}",
+                f"Facts Identified: {result.facts_identified}",
+                f"Hypotheses Generated: {result.hypotheses_identified}",
+                f"8D Phases Addressed: "
+                f"{', '.join(result.eight_d_phases_addressed)}",
+                f"Total Cost: ${result.total_cost_usd:.4f}",
+            ]),
+            "\n" + _heading("KEY FINDINGS"),
+        ]
+
+        if result.narrative_output.facts:
+            blocks.append(_bullets("**Facts:**", result.narrative_output.facts))
+
+        if result.analysis_output.hypotheses:
+            blocks.append(_bullets(
+                "**Root Cause Hypotheses:**",
+                result.analysis_output.hypotheses
+            ))
+
+        blocks.append("\n" + _heading("PREVENTION PLAN"))
+        blocks.append(f"{result.prevention_output.content}\n\n")
+        write("".join(blocks))
+
+    except Exception as e:
+        print(f"Error during workflow execution: {e}")
+        print()
+        import traceback
+        traceback.print_exc()
+        print()
+        print("Your narrative has been recorded:")
+        print()
+        print(narrative)
+        print()
+
+    finally:
+        workflow_logger.removeHandler(console)
+
+    # Show usage summary
+    write(
+        "\n" + _heading("Session Usage Summary")
+        + model_router.get_usage_summary() + "\n\n"
+    )
+
+    model_router.close()
+
+
+def run(argv=None):
+    """Run the CLI, reporting security violations and errors on exit."""
+    try:
+        main(argv)
+    except SecurityViolationError as e:
+        print()
+        print("=" * 60)
+        print("SECURITY VIOLATION")
+        print("=" * 60)
+        print()
+        print(str(e))
+        print()
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n\nInterrupted by user.")
+        sys.exit(0)
+    except Exception as e:
+        print()
+        print("=" * 60)
+        print("ERROR")
+        print("=" * 60)
+        print()
+        print(f"An error occurred: {e}")
+        print()
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -1,16 +1,26 @@
-"""Configuration module for ATLASsemi."""
-
-from .model_router import (
-    ModelRouter,
-    RuntimeMode,
-    ModelConfig,
-    TaskType,
-    ModelClient,
-    AnthropicClient,
-    OpenAIClient,
-    FactoryClient,
-    OnPremClient
-)
+"""Configuration module for ATLASsemi.
+
+Exports are imported on first access (PEP 562), so e.g. the model
+router can be used without loading numpy for the response caches.
+"""
+
+import importlib
+
+# Lazily exported name -> defining submodule
+_LAZY_EXPORTS = {
+    "ModelRouter": ".model_router",
+    "RuntimeMode": ".model_router",
+    "ModelConfig": ".model_router",
+    "TaskType": ".model_router",
+    "ModelClient": ".model_router",
+    "AnthropicClient": ".model_router",
+    "OpenAIClient": ".model_router",
+    "FactoryClient": ".model_router",
+    "OnPremClient": ".model_router",
+    "ResponseCache": ".response_cache",
+    "SemanticCache": ".response_cache",
+    "MockModelRouter": ".mock_router"
+}
 
 __all__ = [
     "ModelRouter",
@@ -21,5 +31,23 @@ __all__ = [
     "AnthropicClient",
     "OpenAIClient",
     "FactoryClient",
-    "OnPremClient"
+    "OnPremClient",
+    "ResponseCache",
+    "SemanticCache",
+    "MockModelRouter"
 ]
+
+
+def __getattr__(name):
+    """Import a lazily exported name on first access."""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,85 @@
+"""
+Mock Model Router for ATLASsemi
+
+Drop-in ModelRouter replacement that answers every task type with a
+canned response, so tests and demos exercise the real agent call path
+(client, usage tracking, caches) without network access or API keys.
+
+Agents request clients by task type:
+- reasoning: narrative, clarification
+- deep_analysis: analysis
+- synthesis: prevention
+"""
+
+from typing import Any, Dict, List, Mapping, Optional
+
+from .model_router import ModelClient, ModelConfig
+
+
+class MockClient(ModelClient):
+    """Model client that returns a fixed response."""
+
+    def __init__(self, config: ModelConfig, response: str):
+        super().__init__(config, api_key="")
+        self.response = response
+        self.prompts: List[str] = []
+
+    def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> tuple[str, int, int]:
+        """Return the canned response (token counts are rough estimates)."""
+        self.prompts.append(prompt)
+        return self.response, len(prompt) // 4, len(self.response) // 4
+
+
+class MockModelRouter:
+    """Router that serves canned responses per task type."""
+
+    def __init__(self, responses: Mapping[str, str], temperature: float = 0.0):
+        """
+        Initialize mock router.
+
+        Args:
+            responses: Task type -> response text returned for it
+            temperature: Temperature reported by the clients' configs
+        """
+        self._clients = {
+            task_type: MockClient(
+                ModelConfig(
+                    provider="mock",
+                    model_id=f"mock-{task_type}",
+                    max_tokens=4000,
+                    temperature=temperature
+                ),
+                response
+            )
+            for task_type, response in responses.items()
+        }
+        self.usage: List[Dict[str, Any]] = []
+
+    def get_model_client(self, task_type: str, tier: Any, **kwargs: Any) -> MockClient:
+        """
+        Get the mock client for a task type (any tier).
+
+        Args:
+            task_type: Type of task
+            tier: Security tier (ignored)
+
+        Returns:
+            MockClient returning the task type's response
+
+        Raises:
+            KeyError: If no response was configured for task_type
+        """
+        try:
+            return self._clients[task_type]
+        except KeyError:
+            raise KeyError(f"No mock response for task type {task_type!r}") from None
+
+    def track_usage(self, **usage: Any) -> None:
+        """Record a usage report from an agent."""
+        self.usage.append(usage)
@@ -8,27 +8,89 @@ Handles:
 - Cost tracking
 """
 
+import asyncio
+import functools
+import hashlib
+import importlib
+import json
 import os
-from typing import Dict, Any, Optional, Literal
-from dataclasses import dataclass
-from enum import Enum
+import time
+import weakref
+from typing import (
+    Any, AsyncGenerator, Callable, Dict, Generator, List, Literal, Optional,
+    Tuple, get_args
+)
+from dataclasses import dataclass, field, replace
+from enum import Enum, IntEnum
 import logging
+from collections import defaultdict
+
+try:
+    import httpx
+except ImportError:  # Installed with the anthropic/openai SDKs
+    httpx = None
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections held by the shared HTTP client
+MAX_KEEPALIVE_CONNECTIONS = 32
+
+# Micro-batching for ainvoke(): dispatch up to BATCH_MAX_SIZE queued
+# requests per model, waiting at most BATCH_WINDOW_S for the batch to fill
+BATCH_MAX_SIZE = 16
+BATCH_WINDOW_S = 0.025
+
+# Provider Batch API jobs (generate_batch()) are polled with exponential
+# backoff from BATCH_POLL_INITIAL_S up to BATCH_POLL_MAX_S between checks
+BATCH_POLL_INITIAL_S = 10.0
+BATCH_POLL_MAX_S = 300.0
+
+# Provider Batch API price relative to the regular API
+BATCH_API_COST_FACTOR = 0.5
+
+# OpenAI Batch API endpoint and the batch statuses that end polling
+OPENAI_BATCH_ENDPOINT = "/v1/chat/completions"
+_OPENAI_BATCH_FINAL_STATUSES = frozenset(
+    {"completed", "failed", "expired", "cancelled"}
+)
+
+# Usage records buffered by track_usage() before folding into usage_stats
+USAGE_FLUSH_SIZE = 64
+
+# (prompt, system_prompt, max_tokens, response_schema) for
+# ModelClient.agenerate_batch()
+GenerateRequest = Tuple[str, Optional[str], Optional[int], Optional[Dict[str, Any]]]
+
+# agenerate_stream() items: (text delta, None) while streaming, then
+# (None, (input_tokens, output_tokens[, cached_input_tokens])) once
+AsyncStream = AsyncGenerator[Tuple[Optional[str], Optional[Tuple[int, ...]]], None]
+
+# Price of input tokens read from the provider prompt cache, relative to
+# uncached input (cache writes are counted at the uncached rate)
+ANTHROPIC_CACHED_INPUT_COST_FACTOR = 0.1
+OPENAI_CACHED_INPUT_COST_FACTOR = 0.5
+
+# Name of the single tool / JSON schema used for constrained output
+RESPONSE_TOOL_NAME = "respond"
 
-class RuntimeMode(Enum):
-    """Runtime mode for model selection."""
-    DEV = "dev"         # Development: use fast/cheap models for testing
-    RUNTIME = "runtime" # Production: use best models for actual work
+
+class RuntimeMode(IntEnum):
+    """Runtime mode for model selection (value indexes the routing table)."""
+    DEV = 0      # Development: use fast/cheap models for testing
+    RUNTIME = 1  # Production: use best models for actual work
+
+    @property
+    def label(self) -> str:
+        """Lowercase name ("dev" / "runtime"), as used in MODEL_MATRIX keys."""
+        return self.name.lower()
 
 
 TaskType = Literal["reasoning", "deep_analysis", "synthesis", "fast"]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ModelConfig:
-    """Configuration for a specific model."""
+    """Configuration for a specific model (immutable; shared by routers)."""
     provider: str           # "anthropic", "openai", "factory", "onprem"
     model_id: str          # e.g., "claude-sonnet-4", "gpt-4o"
     max_tokens: int
@@ -36,20 +98,90 @@ class ModelConfig:
     cost_per_1k_input: float = 0.0   # USD
     cost_per_1k_output: float = 0.0  # USD
 
+    # Per-token prices in integer nano-USD (derived from the above)
+    cost_per_token_input_nano: int = field(init=False, repr=False)
+    cost_per_token_output_nano: int = field(init=False, repr=False)
 
-class ModelRouter:
+    def __post_init__(self):
+        # $/1k tokens -> nano-$/token: x / 1000 * 1e9 (frozen, so set
+        # through object.__setattr__)
+        object.__setattr__(
+            self, "cost_per_token_input_nano", round(self.cost_per_1k_input * 1e6)
+        )
+        object.__setattr__(
+            self, "cost_per_token_output_nano", round(self.cost_per_1k_output * 1e6)
+        )
+
+
+# Field values -> shared ModelConfig (see _shared_config)
+_CONFIG_POOL: Dict[Tuple[Tuple[str, Any], ...], ModelConfig] = {}
+
+
+def _shared_config(**fields: Any) -> ModelConfig:
     """
-    Routes LLM requests to appropriate models based on:
-    - Runtime mode (dev vs production)
-    - Security tier
-    - Task type
+    Return a ModelConfig, reusing an existing one with identical fields.
+
+    Many MODEL_MATRIX entries are identical (e.g. the dev and runtime
+    factory/on-prem models), so they share one object.
+
+    Args:
+        **fields: ModelConfig constructor arguments
+
+    Returns:
+        Shared ModelConfig instance
     """
+    key = tuple(sorted(fields.items()))
+    config = _CONFIG_POOL.get(key)
+    if config is None:
+        config = _CONFIG_POOL[key] = ModelConfig(**fields)
+    return config
+
+
+# Usage summary templates (filled from usage_stats and its per-task stats)
+_SUMMARY_HEADER_TEMPLATE = (
+    "# Model Usage Summary\n"
+    "\n"
+    "**Total Input Tokens:** {total_input_tokens:,}\n"
+    "**Total Output Tokens:** {total_output_tokens:,}\n"
+    "**Total Cost:** ${total_cost_usd:.4f}\n"
+    "**Cache Hits:** {cache_hits:,} (misses: {cache_misses:,})\n"
+    "\n"
+    "## By Task Type\n"
+)
+_SUMMARY_TASK_TEMPLATE = (
+    "\n"
+    "### {task_type}\n"
+    "- Requests: {count}\n"
+    "- Input tokens: {input_tokens:,}\n"
+    "- Output tokens: {output_tokens:,}\n"
+    "- Cost: ${cost_usd:.4f}\n"
+)
+
+
+def _new_task_stats() -> Dict[str, Any]:
+    """Zeroed per-task usage counters (default for requests_by_task)."""
+    return {
+        "count": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cost_usd": 0.0
+    }
 
-    # Model configurations for different scenarios
-    # Format: (mode, tier, task_type) -> ModelConfig
-    MODEL_MATRIX: Dict[tuple, ModelConfig] = {
+
+@functools.cache
+def _model_matrix() -> Dict[tuple, ModelConfig]:
+    """
+    Build the model configurations for different scenarios.
+
+    Built on first use rather than at import, so processes that never
+    route a request skip constructing the configs.
+
+    Returns:
+        Dict mapping (mode, tier, task_type) to ModelConfig
+    """
+    return {
         # DEV MODE - GENERAL_LLM (fast/cheap for testing)
-        ("dev", 1, "reasoning"): ModelConfig(
+        ("dev", 1, "reasoning"): _shared_config(
             provider="anthropic",
             model_id="claude-haiku-4",
             max_tokens=4000,
@@ -57,7 +189,7 @@ class ModelRouter:
             cost_per_1k_input=0.25,
             cost_per_1k_output=1.25
         ),
-        ("dev", 1, "deep_analysis"): ModelConfig(
+        ("dev", 1, "deep_analysis"): _shared_config(
             provider="anthropic",
             model_id="claude-haiku-4",
             max_tokens=8000,
@@ -65,7 +197,7 @@ class ModelRouter:
             cost_per_1k_input=0.25,
             cost_per_1k_output=1.25
         ),
-        ("dev", 1, "synthesis"): ModelConfig(
+        ("dev", 1, "synthesis"): _shared_config(
             provider="anthropic",
             model_id="claude-haiku-4",
             max_tokens=6000,
@@ -73,7 +205,7 @@ class ModelRouter:
             cost_per_1k_input=0.25,
             cost_per_1k_output=1.25
         ),
-        ("dev", 1, "fast"): ModelConfig(
+        ("dev", 1, "fast"): _shared_config(
             provider="anthropic",
             model_id="claude-haiku-4",
             max_tokens=2000,
@@ -83,7 +215,7 @@ class ModelRouter:
         ),
 
         # RUNTIME MODE - GENERAL_LLM (best public models)
-        ("runtime", 1, "reasoning"): ModelConfig(
+        ("runtime", 1, "reasoning"): _shared_config(
             provider="anthropic",
             model_id="claude-sonnet-4-5",
             max_tokens=8000,
@@ -91,7 +223,7 @@ class ModelRouter:
             cost_per_1k_input=3.0,
             cost_per_1k_output=15.0
         ),
-        ("runtime", 1, "deep_analysis"): ModelConfig(
+        ("runtime", 1, "deep_analysis"): _shared_config(
             provider="anthropic",
             model_id="claude-opus-4-5",
             max_tokens=16000,
@@ -99,7 +231,7 @@ class ModelRouter:
             cost_per_1k_input=15.0,
             cost_per_1k_output=75.0
         ),
-        ("runtime", 1, "synthesis"): ModelConfig(
+        ("runtime", 1, "synthesis"): _shared_config(
             provider="anthropic",
             model_id="claude-sonnet-4-5",
             max_tokens=8000,
@@ -107,7 +239,7 @@ class ModelRouter:
             cost_per_1k_input=3.0,
             cost_per_1k_output=15.0
         ),
-        ("runtime", 1, "fast"): ModelConfig(
+        ("runtime", 1, "fast"): _shared_config(
             provider="anthropic",
             model_id="claude-haiku-4",
             max_tokens=4000,
@@ -118,49 +250,49 @@ class ModelRouter:
 
         # CONFIDENTIAL_FAB (tier 2) - Factory API
         # Same configs for dev and runtime (factory controls access)
-        ("dev", 2, "reasoning"): ModelConfig(
+        ("dev", 2, "reasoning"): _shared_config(
             provider="factory",
             model_id="factory-reasoning",
             max_tokens=8000,
             temperature=0.7
         ),
-        ("dev", 2, "deep_analysis"): ModelConfig(
+        ("dev", 2, "deep_analysis"): _shared_config(
             provider="factory",
             model_id="factory-analysis",
             max_tokens=16000,
             temperature=0.7
         ),
-        ("dev", 2, "synthesis"): ModelConfig(
+        ("dev", 2, "synthesis"): _shared_config(
             provider="factory",
             model_id="factory-synthesis",
             max_tokens=8000,
             temperature=0.7
         ),
-        ("dev", 2, "fast"): ModelConfig(
+        ("dev", 2, "fast"): _shared_config(
             provider="factory",
             model_id="factory-fast",
             max_tokens=4000,
             temperature=0.7
         ),
-        ("runtime", 2, "reasoning"): ModelConfig(
+        ("runtime", 2, "reasoning"): _shared_config(
             provider="factory",
             model_id="factory-reasoning",
             max_tokens=8000,
             temperature=0.7
         ),
-        ("runtime", 2, "deep_analysis"): ModelConfig(
+        ("runtime", 2, "deep_analysis"): _shared_config(
             provider="factory",
             model_id="factory-analysis",
             max_tokens=16000,
             temperature=0.7
         ),
-        ("runtime", 2, "synthesis"): ModelConfig(
+        ("runtime", 2, "synthesis"): _shared_config(
             provider="factory",
             model_id="factory-synthesis",
             max_tokens=8000,
             temperature=0.7
         ),
-        ("runtime", 2, "fast"): ModelConfig(
+        ("runtime", 2, "fast"): _shared_config(
             provider="factory",
             model_id="factory-fast",
             max_tokens=4000,
@@ -168,49 +300,49 @@ class ModelRouter:
         ),
 
         # TOP_SECRET (tier 3) - On-prem only
-        ("dev", 3, "reasoning"): ModelConfig(
+        ("dev", 3, "reasoning"): _shared_config(
             provider="onprem",
             model_id="onprem-reasoning",
             max_tokens=8000,
             temperature=0.7
         ),
-        ("dev", 3, "deep_analysis"): ModelConfig(
+        ("dev", 3, "deep_analysis"): _shared_config(
             provider="onprem",
             model_id="onprem-analysis",
             max_tokens=16000,
             temperature=0.7
         ),
-        ("dev", 3, "synthesis"): ModelConfig(
+        ("dev", 3, "synthesis"): _shared_config(
             provider="onprem",
             model_id="onprem-synthesis",
             max_tokens=8000,
             temperature=0.7
         ),
-        ("dev", 3, "fast"): ModelConfig(
+        ("dev", 3, "fast"): _shared_config(
             provider="onprem",
             model_id="onprem-fast",
             max_tokens=4000,
             temperature=0.7
         ),
-        ("runtime", 3, "reasoning"): ModelConfig(
+        ("runtime", 3, "reasoning"): _shared_config(
             provider="onprem",
             model_id="onprem-reasoning",
             max_tokens=8000,
             temperature=0.7
         ),
-        ("runtime", 3, "deep_analysis"): ModelConfig(
+        ("runtime", 3, "deep_analysis"): _shared_config(
             provider="onprem",
             model_id="onprem-analysis",
             max_tokens=16000,
             temperature=0.7
         ),
-        ("runtime", 3, "synthesis"): ModelConfig(
+        ("runtime", 3, "synthesis"): _shared_config(
             provider="onprem",
             model_id="onprem-synthesis",
             max_tokens=8000,
             temperature=0.7
         ),
-        ("runtime", 3, "fast"): ModelConfig(
+        ("runtime", 3, "fast"): _shared_config(
             provider="onprem",
             model_id="onprem-fast",
             max_tokens=4000,
@@ -218,10 +350,32 @@ class ModelRouter:
         ),
     }
 
+
+class _MatrixAttribute:
+    """Class attribute exposing _model_matrix() (built on first access)."""
+
+    def __get__(self, instance: Any, owner: type) -> Dict[tuple, ModelConfig]:
+        return _model_matrix()
+
+
+class ModelRouter:
+    """
+    Routes LLM requests to appropriate models based on:
+    - Runtime mode (dev vs production)
+    - Security tier
+    - Task type
+    """
+
+    # Model configurations for different scenarios
+    # Format: (mode, tier, task_type) -> ModelConfig
+    MODEL_MATRIX = _MatrixAttribute()
+
     def __init__(
         self,
         mode: RuntimeMode = RuntimeMode.DEV,
-        api_keys: Optional[Dict[str, str]] = None
+        api_keys: Optional[Dict[str, str]] = None,
+        http_client: Optional[Any] = None,
+        deterministic: bool = False
     ):
         """
         Initialize model router.
@@ -229,19 +383,55 @@ class ModelRouter:
         Args:
             mode: Runtime mode (dev or runtime)
             api_keys: API keys for providers (reads from env if not provided)
+            http_client: httpx.Client shared by all provider SDK clients
+                (created on first use if not provided; closed by close()
+                only if created here)
+            deterministic: Run every model at temperature 0 (reproducible
+                runs; lets agents reuse outputs from an action cache)
         """
         self.mode = mode
+        self.deterministic = deterministic
+        # Mode is fixed per router
+        self._mode_table = _mode_table(mode, deterministic)
         self.api_keys = api_keys or self._load_api_keys_from_env()
+        self._http_client = http_client
+        self._owns_http_client = http_client is None
 
-        # Track usage for cost calculation
-        self.usage_stats: Dict[str, Any] = {
+        # Event loop -> shared httpx.AsyncClient (connections are bound
+        # to the loop that opened them)
+        self._async_http_clients: "weakref.WeakKeyDictionary[Any, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        # Track usage for cost calculation (read through usage_stats)
+        self._usage_stats: Dict[str, Any] = {
             "total_input_tokens": 0,
             "total_output_tokens": 0,
             "total_cost_usd": 0.0,
-            "requests_by_task": {}
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "requests_by_task": defaultdict(_new_task_stats)
         }
 
-        logger.info(f"ModelRouter initialized in {mode.value} mode")
+        # (task_type, input_tokens, output_tokens, cost_usd) not yet
+        # folded into _usage_stats
+        self._pending_usage: List[Tuple[str, int, int, float]] = []
+
+        # Rendered summary, reset whenever usage changes
+        self._usage_summary: Optional[str] = None
+
+        # ModelConfig -> pooled client (see get_model_client)
+        self._client_pool: Dict[ModelConfig, 'ModelClient'] = {}
+
+        # (provider, model_id) -> (event loop, request queue, worker task)
+        # for ainvoke()
+        self._batch_queues: Dict[Tuple[str, str], Tuple[Any, asyncio.Queue, Any]] = {}
+
+        # Agent configuration -> phase agents built on this router, shared
+        # by its orchestrators (see orchestrator.workflow._agent_pool)
+        self._agent_pool: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+
+        logger.info("ModelRouter initialized in %s mode", mode.label)
 
     def _load_api_keys_from_env(self) -> Dict[str, str]:
         """
@@ -275,30 +465,127 @@ class ModelRouter:
         Raises:
             ValueError: If no model configured for this combination
         """
-        # Convert tier enum to integer
-        tier_value = tier.value if hasattr(tier, 'value') else tier
+        # Convert tier enum to integer (isinstance is cheaper than hasattr,
+        # which raises and catches AttributeError for plain ints)
+        tier_value = tier.value if isinstance(tier, Enum) else tier
 
-        # Look up model config
-        key = (self.mode.value, tier_value, task_type)
-        config = self.MODEL_MATRIX.get(key)
+        # Look up model config in this mode's routing table
+        try:
+            config = self._mode_table[
+                _TIER_INDEX[tier_value] * _TIER_STRIDE + _TASK_INDEX[task_type]
+            ]
+        except (KeyError, TypeError):  # Unknown or unhashable key part
+            config = None
 
         if config is None:
+            # Diagnose off the hot path: a bad task type is a caller bug
+            if not isinstance(task_type, str) or task_type not in _VALID_TASKS:
+                raise ValueError(
+                    f"Unknown task_type {task_type!r}; expected one of "
+                    f"{', '.join(get_args(TaskType))}"
+                )
             raise ValueError(
-                f"No model configured for mode={self.mode.value}, "
+                f"No model configured for mode={self.mode.label}, "
                 f"tier={tier_value}, task_type={task_type}"
             )
 
         logger.debug(
-            f"Selected model: {config.model_id} (provider={config.provider}) "
-            f"for task={task_type}, tier={tier_value}, mode={self.mode.value}"
+            "Selected model: %s (provider=%s) for task=%s, tier=%s, mode=%s",
+            config.model_id, config.provider, task_type, tier_value,
+            self.mode.label
         )
 
         return config
 
+    @property
+    def http_client(self) -> Optional[Any]:
+        """
+        Shared HTTP client for provider SDKs.
+
+        One keep-alive pool (HTTP/2 when the h2 package is installed)
+        serves every agent, so calls after the first skip the TCP and TLS
+        handshakes.
+
+        Returns:
+            httpx.Client, or None if httpx is not installed
+        """
+        if self._http_client is None and httpx is not None:
+            limits = httpx.Limits(
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+            )
+            try:
+                self._http_client = httpx.Client(http2=True, limits=limits)
+            except ImportError:  # h2 not installed
+                self._http_client = httpx.Client(limits=limits)
+
+        return self._http_client
+
+    def async_http_client(self) -> Optional[Any]:
+        """
+        Shared async HTTP client for the running event loop.
+
+        The async counterpart of http_client: provider SDKs stream on the
+        event loop through one keep-alive (HTTP/2 when available) pool
+        per loop instead of a worker thread per chunk.
+
+        Returns:
+            httpx.AsyncClient, or None if httpx is not installed
+
+        Raises:
+            RuntimeError: If called outside a running event loop
+        """
+        if httpx is None:
+            return None
+
+        loop = asyncio.get_running_loop()
+        client = self._async_http_clients.get(loop)
+        if client is None:
+            limits = httpx.Limits(
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+            )
+            try:
+                client = httpx.AsyncClient(http2=True, limits=limits)
+            except ImportError:  # h2 not installed
+                client = httpx.AsyncClient(limits=limits)
+            self._async_http_clients[loop] = client
+
+        return client
+
+    def close(self) -> None:
+        """Close the shared HTTP client (if created by this router)."""
+        self._client_pool.clear()  # Pooled SDK clients hold the HTTP client
+        self._agent_pool.clear()
+        # Async clients can only be closed on their loop (see aclose)
+        self._async_http_clients.clear()
+
+        if self._owns_http_client and self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+
+    async def aclose(self) -> None:
+        """Close the running loop's async HTTP client, then close()."""
+        client = self._async_http_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+        self.close()
+
+    def __enter__(self) -> 'ModelRouter':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> 'ModelRouter':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
     def get_model_client(
         self,
         task_type: TaskType,
-        tier: Any
+        tier: Any,
+        http_client: Optional[Any] = None
     ) -> 'ModelClient':
         """
         Get a model client for the given task and tier.
@@ -306,30 +593,136 @@ class ModelRouter:
         Args:
             task_type: Type of task
             tier: Security tier
+            http_client: HTTP client for the provider SDK
+                (defaults to the router's shared client)
 
         Returns:
-            ModelClient instance configured for this scenario
+            ModelClient instance configured for this scenario (reused
+            across calls unless http_client is given)
         """
         config = self.get_model_config(task_type, tier)
 
+        if http_client is None:
+            client = self._client_pool.get(config)
+            if client is not None:
+                return client
+
         # Create appropriate client based on provider
-        if config.provider == "anthropic":
-            return AnthropicClient(config, self.api_keys.get("anthropic", ""))
-        elif config.provider == "openai":
-            return OpenAIClient(config, self.api_keys.get("openai", ""))
-        elif config.provider == "factory":
-            return FactoryClient(config, self.api_keys.get("factory", ""))
-        elif config.provider == "onprem":
-            return OnPremClient(config, self.api_keys.get("onprem", ""))
-        else:
+        client_class = _PROVIDER_CLIENTS.get(config.provider)
+        if client_class is None:
             raise ValueError(f"Unknown provider: {config.provider}")
 
+        if http_client is not None:
+            return client_class(
+                config, self.api_keys.get(config.provider, ""), http_client
+            )
+
+        uses_http_client = client_class.uses_http_client
+        client = client_class(
+            config,
+            self.api_keys.get(config.provider, ""),
+            self.http_client if uses_http_client else None,
+            self.async_http_client if uses_http_client else None
+        )
+        self._client_pool[config] = client
+        return client
+
+    async def ainvoke(
+        self,
+        prompt: str,
+        task_type: TaskType,
+        tier: Any,
+        system_prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, int, int]:
+        """
+        Generate a completion through the per-model micro-batching queue.
+
+        Requests for the same provider and model that arrive within
+        BATCH_WINDOW_S of each other are dispatched together (up to
+        BATCH_MAX_SIZE) via the client's agenerate_batch(). Usage is not
+        tracked here; callers track it like for generate().
+
+        Args:
+            prompt: User prompt
+            task_type: Type of task
+            tier: Security tier
+            system_prompt: System prompt (optional)
+            max_tokens: Override max tokens (optional)
+            response_schema: JSON schema the response must follow (optional)
+
+        Returns:
+            Tuple of (response_text, input_tokens, output_tokens)
+        """
+        client = self.get_model_client(task_type, tier)
+        future = asyncio.get_running_loop().create_future()
+        await self._batch_queue(client).put(
+            (client, (prompt, system_prompt, max_tokens, response_schema), future)
+        )
+        return await future
+
+    def _batch_queue(self, client: 'ModelClient') -> asyncio.Queue:
+        """Get the request queue for a client's model (one worker per loop)."""
+        key = (client.config.provider, client.config.model_id)
+        loop = asyncio.get_running_loop()
+
+        entry = self._batch_queues.get(key)
+        if entry is None or entry[0] is not loop:
+            # Queues bind to their event loop: start fresh on a new loop
+            queue: asyncio.Queue = asyncio.Queue()
+            worker = loop.create_task(self._batch_worker(queue))
+            self._batch_queues[key] = (loop, queue, worker)
+            return queue
+
+        return entry[1]
+
+    async def _batch_worker(self, queue: asyncio.Queue) -> None:
+        """Collect queued requests into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        in_flight = set()  # Keeps dispatch tasks referenced until done
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + BATCH_WINDOW_S
+
+            while len(batch) < BATCH_MAX_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Dispatch in the background so the next batch can fill
+            task = loop.create_task(self._dispatch_batch(batch))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+
+    @staticmethod
+    async def _dispatch_batch(batch: List[Tuple[Any, GenerateRequest, Any]]) -> None:
+        """Run one batch and resolve each request's future."""
+        client = batch[0][0]
+        try:
+            results = await client.agenerate_batch([req for _, req, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, _, future), result in zip(batch, results):
+            if future.done():  # Caller was cancelled
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
     def track_usage(
         self,
         task_type: str,
         input_tokens: int,
         output_tokens: int,
-        cost_usd: float
+        cost_usd: float,
+        cache_hit: bool = False
     ):
         """
         Track token usage and cost.
@@ -339,68 +732,190 @@ class ModelRouter:
             input_tokens: Number of input tokens
             output_tokens: Number of output tokens
             cost_usd: Cost in USD
+            cache_hit: Response was served from a cache (no request made)
         """
-        self.usage_stats["total_input_tokens"] += input_tokens
-        self.usage_stats["total_output_tokens"] += output_tokens
-        self.usage_stats["total_cost_usd"] += cost_usd
-
-        if task_type not in self.usage_stats["requests_by_task"]:
-            self.usage_stats["requests_by_task"][task_type] = {
-                "count": 0,
-                "input_tokens": 0,
-                "output_tokens": 0,
-                "cost_usd": 0.0
-            }
-
-        stats = self.usage_stats["requests_by_task"][task_type]
-        stats["count"] += 1
-        stats["input_tokens"] += input_tokens
-        stats["output_tokens"] += output_tokens
-        stats["cost_usd"] += cost_usd
+        self._usage_summary = None
+
+        if cache_hit:
+            self._usage_stats["cache_hits"] += 1
+            return
+
+        self._pending_usage.append((task_type, input_tokens, output_tokens, cost_usd))
+        if len(self._pending_usage) >= USAGE_FLUSH_SIZE:
+            self._flush_usage()
+
+    def track_cache_miss(self) -> None:
+        """Record a response cache lookup that missed (a request follows)."""
+        self._usage_stats["cache_misses"] += 1
+        self._usage_summary = None
+
+    @property
+    def usage_stats(self) -> Dict[str, Any]:
+        """Usage totals and per-task stats (includes buffered usage)."""
+        self._flush_usage()
+        return self._usage_stats
+
+    def _flush_usage(self) -> None:
+        """Fold buffered track_usage() records into the usage stats."""
+        if not self._pending_usage:
+            return
+
+        pending, self._pending_usage = self._pending_usage, []
+
+        # Sum per task first so each stats dict is updated once
+        totals: Dict[str, List[Any]] = {}
+        for task_type, input_tokens, output_tokens, cost_usd in pending:
+            sums = totals.get(task_type)
+            if sums is None:
+                totals[task_type] = [1, input_tokens, output_tokens, cost_usd]
+            else:
+                sums[0] += 1
+                sums[1] += input_tokens
+                sums[2] += output_tokens
+                sums[3] += cost_usd
+
+        usage = self._usage_stats
+        for task_type, (count, input_tokens, output_tokens, cost_usd) in totals.items():
+            usage["total_input_tokens"] += input_tokens
+            usage["total_output_tokens"] += output_tokens
+            usage["total_cost_usd"] += cost_usd
+
+            stats = usage["requests_by_task"][task_type]
+            stats["count"] += count
+            stats["input_tokens"] += input_tokens
+            stats["output_tokens"] += output_tokens
+            stats["cost_usd"] += cost_usd
 
     def get_usage_summary(self) -> str:
         """
         Get usage summary for this session.
 
+        The summary is rendered once and reused until the next
+        track_usage() call.
+
         Returns:
             Formatted usage summary
         """
-        lines = [
-            "# Model Usage Summary",
-            "",
-            f"**Total Input Tokens:** {self.usage_stats['total_input_tokens']:,}",
-            f"**Total Output Tokens:** {self.usage_stats['total_output_tokens']:,}",
-            f"**Total Cost:** ${self.usage_stats['total_cost_usd']:.4f}",
-            "",
-            "## By Task Type",
-            ""
-        ]
-
-        for task_type, stats in self.usage_stats["requests_by_task"].items():
-            lines.extend([
-                f"### {task_type}",
-                f"- Requests: {stats['count']}",
-                f"- Input tokens: {stats['input_tokens']:,}",
-                f"- Output tokens: {stats['output_tokens']:,}",
-                f"- Cost: ${stats['cost_usd']:.4f}",
-                ""
-            ])
-
-        return "\n".join(lines)
+        if self._usage_summary is not None:
+            return self._usage_summary
+
+        blocks = [_SUMMARY_HEADER_TEMPLATE.format_map(self.usage_stats)]
+        blocks.extend(
+            _SUMMARY_TASK_TEMPLATE.format(task_type=task_type, **stats)
+            for task_type, stats in self.usage_stats["requests_by_task"].items()
+        )
+
+        self._usage_summary = "".join(blocks)
+        return self._usage_summary
+
+
+# _model_matrix() flattened into a tuple indexed by
+# mode * _MODE_STRIDE + tier * _TIER_STRIDE + task (None where unconfigured)
+_TIER_INDEX = {1: 0, 2: 1, 3: 2}  # SecurityTier values
+_TASK_INDEX = {task: i for i, task in enumerate(get_args(TaskType))}
+_VALID_TASKS = frozenset(_TASK_INDEX)
+_TIER_STRIDE = len(_TASK_INDEX)
+_MODE_STRIDE = len(_TIER_INDEX) * _TIER_STRIDE
+
+
+@functools.cache
+def _model_table() -> Tuple[Optional[ModelConfig], ...]:
+    """Build the flat routing table from _model_matrix() on first use."""
+    matrix = _model_matrix()
+    return tuple(
+        matrix.get((mode.label, tier, task))
+        for mode in RuntimeMode
+        for tier in _TIER_INDEX
+        for task in _TASK_INDEX
+    )
+
+
+@functools.cache
+def _mode_table(
+    mode: RuntimeMode,
+    deterministic: bool = False
+) -> Tuple[Optional[ModelConfig], ...]:
+    """
+    Get the slice of the routing table for one runtime mode.
+
+    Args:
+        mode: Runtime mode
+        deterministic: Run every model at temperature 0
+
+    Returns:
+        Tuple indexed by tier * _TIER_STRIDE + task
+    """
+    start = mode * _MODE_STRIDE
+    table = _model_table()[start:start + _MODE_STRIDE]
+    if deterministic:
+        table = tuple(
+            replace(config, temperature=0.0) if config is not None else None
+            for config in table
+        )
+    return table
 
 
 class ModelClient:
     """Base class for model clients."""
 
-    def __init__(self, config: ModelConfig, api_key: str):
+    # generate() accepts response_schema (clients without constrained
+    # decoding ignore it)
+    supports_response_schema = True
+
+    # Provider SDK sends requests through the router's shared HTTP client
+    uses_http_client = False
+
+    # Price of generate_batch() requests relative to generate()
+    batch_cost_factor = 1.0
+
+    # Price of cached input tokens relative to uncached ones (clients that
+    # report cached_input_tokens set this)
+    cached_input_cost_factor = 1.0
+
+    def __init__(
+        self,
+        config: ModelConfig,
+        api_key: str,
+        http_client: Optional[Any] = None,
+        async_http_client: Optional[Callable[[], Any]] = None
+    ):
         self.config = config
         self.api_key = api_key
+        self.http_client = http_client
+        # Returns the httpx.AsyncClient for the running loop (optional)
+        self.async_http_client = async_http_client
+        self._sdk_client = None  # Provider SDK client, created on first use
+        # Event loop -> async provider SDK client, created on first use
+        self._async_sdk_clients: "weakref.WeakKeyDictionary[Any, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _async_client(self) -> Any:
+        """
+        Return the async provider SDK client for the running event loop.
+
+        Raises:
+            NotImplementedError: If the client has no async SDK
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_sdk_clients.get(loop)
+        if client is None:
+            client = self._create_async_client(
+                self.async_http_client() if self.async_http_client else None
+            )
+            self._async_sdk_clients[loop] = client
+        return client
+
+    def _create_async_client(self, http_client: Optional[Any]) -> Any:
+        """Create the async provider SDK client (see _async_client)."""
+        raise NotImplementedError(f"{type(self).__name__} has no async SDK client")
 
     def generate(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        response_schema: Optional[Dict[str, Any]] = None
     ) -> tuple[str, int, int]:
         """
         Generate completion from model.
@@ -409,93 +924,609 @@ class ModelClient:
             prompt: User prompt
             system_prompt: System prompt (optional)
             max_tokens: Override max tokens (optional)
+            response_schema: JSON schema the response must follow
+                (optional; enforced by providers that support it)
 
         Returns:
-            Tuple of (response_text, input_tokens, output_tokens)
+            Tuple of (response_text, input_tokens, output_tokens), with
+            cached_input_tokens appended by clients whose provider reports
+            prompt cache reads (included in input_tokens)
         """
         raise NotImplementedError("Subclass must implement generate()")
 
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Generator[str, None, tuple[int, int]]:
+        """
+        Generate completion from model, yielding text as it arrives.
+
+        Clients without a streaming API yield the full response once.
+
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt (optional)
+            max_tokens: Override max tokens (optional)
+            response_schema: JSON schema the response must follow (optional)
+
+        Yields:
+            Response text deltas
+
+        Returns:
+            Tuple of (input_tokens, output_tokens[, cached_input_tokens])
+            once exhausted (see generate())
+        """
+        response_text, *usage = self.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            response_schema=response_schema
+        )
+        yield response_text
+        return tuple(usage)
+
+    async def agenerate_batch(
+        self,
+        requests: List[GenerateRequest]
+    ) -> List[Any]:
+        """
+        Generate completions for a batch of requests.
+
+        The default overlaps the requests in worker threads; clients whose
+        backend batches natively (e.g. a vLLM on-prem server) override
+        this to send them in one call.
+
+        Args:
+            requests: (prompt, system_prompt, max_tokens, response_schema)
+                tuples
+
+        Returns:
+            (response_text, input_tokens, output_tokens) per request, or
+            the exception raised for it
+        """
+        return await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    self.generate,
+                    prompt=prompt,
+                    system_prompt=system_prompt,
+                    max_tokens=max_tokens,
+                    response_schema=response_schema
+                )
+                for prompt, system_prompt, max_tokens, response_schema in requests
+            ),
+            return_exceptions=True
+        )
+
+    def generate_batch(self, requests: List[GenerateRequest]) -> List[Any]:
+        """
+        Generate completions for a batch of non-interactive requests.
+
+        The default runs the requests one after another; clients with a
+        provider Batch API override this to submit them as one job,
+        which is billed at batch_cost_factor but may take hours.
+
+        Args:
+            requests: (prompt, system_prompt, max_tokens, response_schema)
+                tuples
+
+        Returns:
+            (response_text, input_tokens, output_tokens) per request, or
+            the exception raised for it
+        """
+        results: List[Any] = []
+        for prompt, system_prompt, max_tokens, response_schema in requests:
+            try:
+                results.append(self.generate(
+                    prompt=prompt,
+                    system_prompt=system_prompt,
+                    max_tokens=max_tokens,
+                    response_schema=response_schema
+                ))
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+def _poll_batch(retrieve: Callable[[], Any], is_done: Callable[[Any], bool]) -> Any:
+    """
+    Poll a provider batch job until it finishes.
+
+    Args:
+        retrieve: Fetches the current batch job
+        is_done: Whether a fetched job has finished
+
+    Returns:
+        The finished batch job
+    """
+    delay = BATCH_POLL_INITIAL_S
+    while True:
+        batch = retrieve()
+        if is_done(batch):
+            return batch
+        time.sleep(delay)
+        delay = min(delay * 2, BATCH_POLL_MAX_S)
+
+
+@functools.lru_cache(maxsize=None)
+def _import_sdk(name: str) -> Any:
+    """
+    Import a provider SDK module once.
+
+    Args:
+        name: Package name ("anthropic" or "openai")
+
+    Returns:
+        The imported module
+
+    Raises:
+        ImportError: If the package is not installed
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        raise ImportError(
+            f"{name} package not installed. Run: pip install {name}"
+        ) from None
+
+
+def _anthropic_tool_kwargs(response_schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build Anthropic kwargs that constrain the response to a JSON schema.
+
+    Anthropic has no JSON-schema response format, so the schema becomes
+    the input schema of a single tool the model is forced to call.
+    """
+    if not response_schema:
+        return {}
+    return {
+        "tools": [{
+            "name": RESPONSE_TOOL_NAME,
+            "description": "Return the response in the required structure.",
+            "input_schema": response_schema
+        }],
+        "tool_choice": {"type": "tool", "name": RESPONSE_TOOL_NAME}
+    }
+
+
+def _openai_response_format(response_schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build OpenAI kwargs for strict JSON-schema structured output."""
+    if not response_schema:
+        return {}
+    return {
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {
+                "name": RESPONSE_TOOL_NAME,
+                "schema": response_schema,
+                "strict": True
+            }
+        }
+    }
+
+
+def _anthropic_system(system_prompt: Optional[str]) -> Any:
+    """
+    Build the Anthropic system parameter.
+
+    The system prompt holds each agent's static instructions, so it is
+    marked as a prompt-cache breakpoint: repeat calls within the cache
+    TTL bill it at the cached-input rate.
+    """
+    if not system_prompt:
+        return ""
+    return [{
+        "type": "text",
+        "text": system_prompt,
+        "cache_control": {"type": "ephemeral"}
+    }]
+
+
+def _anthropic_stream_delta(event: Any) -> str:
+    """
+    Get the response text an Anthropic stream event adds ("" if none).
+
+    Plain responses stream as text deltas; schema-constrained responses
+    stream the forced tool call's input JSON as input_json deltas.
+    """
+    if event.type != "content_block_delta":
+        return ""
+    if event.delta.type == "text_delta":
+        return event.delta.text
+    if event.delta.type == "input_json_delta":
+        return event.delta.partial_json
+    return ""
+
+
+def _anthropic_usage(usage: Any) -> Tuple[int, int, int]:
+    """
+    Get (input_tokens, output_tokens, cached_input_tokens) from Anthropic usage.
+
+    Anthropic's input_tokens excludes prompt cache reads and writes, so
+    both are added back to get the full input size.
+    """
+    cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+    cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    return (
+        usage.input_tokens + cache_read + cache_write,
+        usage.output_tokens,
+        cache_read
+    )
+
+
+def _openai_usage(usage: Any) -> Tuple[int, int, int]:
+    """Get (input_tokens, output_tokens, cached_input_tokens) from OpenAI usage."""
+    if isinstance(usage, dict):  # Batch API output (raw JSON)
+        details = usage.get("prompt_tokens_details") or {}
+        return (
+            usage["prompt_tokens"],
+            usage["completion_tokens"],
+            details.get("cached_tokens") or 0
+        )
+
+    details = getattr(usage, "prompt_tokens_details", None)
+    return (
+        usage.prompt_tokens,
+        usage.completion_tokens,
+        getattr(details, "cached_tokens", 0) or 0
+    )
+
+
+def _openai_cache_kwargs(system_prompt: Optional[str]) -> Dict[str, Any]:
+    """
+    Build OpenAI prompt-cache routing parameters.
+
+    OpenAI caches long prompt prefixes automatically; a prompt_cache_key
+    derived from the static system prompt routes calls that share it to
+    the same cache. Sent via extra_body so older SDKs accept it.
+    """
+    if not system_prompt:
+        return {}
+    digest = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+    return {"extra_body": {"prompt_cache_key": f"atlassemi-{digest[:16]}"}}
+
+
+def _openai_messages(prompt: str, system_prompt: Optional[str]) -> List[Dict[str, str]]:
+    """Build the OpenAI chat messages for a prompt."""
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
 
 class AnthropicClient(ModelClient):
     """Anthropic API client."""
 
+    uses_http_client = True
+    batch_cost_factor = BATCH_API_COST_FACTOR
+    cached_input_cost_factor = ANTHROPIC_CACHED_INPUT_COST_FACTOR
+
+    def _client(self) -> Any:
+        """Return the Anthropic SDK client, creating it on first use."""
+        if self._sdk_client is None:
+            anthropic = _import_sdk("anthropic")
+
+            if not self.api_key:
+                raise ValueError("ANTHROPIC_API_KEY not set")
+
+            self._sdk_client = anthropic.Anthropic(
+                api_key=self.api_key, http_client=self.http_client
+            )
+        return self._sdk_client
+
+    def _create_async_client(self, http_client: Optional[Any]) -> Any:
+        """Create the Anthropic async SDK client."""
+        anthropic = _import_sdk("anthropic")
+
+        if not self.api_key:
+            raise ValueError("ANTHROPIC_API_KEY not set")
+
+        return anthropic.AsyncAnthropic(api_key=self.api_key, http_client=http_client)
+
     def generate(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        response_schema: Optional[Dict[str, Any]] = None
     ) -> tuple[str, int, int]:
         """Generate completion using Anthropic API."""
-        try:
-            import anthropic
-        except ImportError:
-            raise ImportError(
-                "anthropic package not installed. Run: pip install anthropic"
-            )
+        client = self._client()
 
-        if not self.api_key:
-            raise ValueError("ANTHROPIC_API_KEY not set")
+        response = client.messages.create(
+            **self._message_params(
+                prompt, system_prompt, max_tokens, response_schema
+            )
+        )
 
-        client = anthropic.Anthropic(api_key=self.api_key)
+        return self._message_result(response, response_schema)
 
-        messages = [{"role": "user", "content": prompt}]
+    def generate_batch(self, requests: List[GenerateRequest]) -> List[Any]:
+        """Generate completions as one Anthropic Message Batches job."""
+        client = self._client()
 
-        response = client.messages.create(
-            model=self.config.model_id,
-            max_tokens=max_tokens or self.config.max_tokens,
-            temperature=self.config.temperature,
-            system=system_prompt or "",
-            messages=messages
+        batch = client.messages.batches.create(requests=[
+            {"custom_id": str(i), "params": self._message_params(*request)}
+            for i, request in enumerate(requests)
+        ])
+        _poll_batch(
+            lambda: client.messages.batches.retrieve(batch.id),
+            lambda b: b.processing_status == "ended"
         )
 
-        # Extract response and token counts
-        response_text = response.content[0].text
-        input_tokens = response.usage.input_tokens
-        output_tokens = response.usage.output_tokens
+        results: List[Any] = [
+            RuntimeError(f"No result in batch {batch.id}")
+        ] * len(requests)
+        for entry in client.messages.batches.results(batch.id):
+            i = int(entry.custom_id)
+            if entry.result.type == "succeeded":
+                results[i] = self._message_result(
+                    entry.result.message, requests[i][3]
+                )
+            else:
+                results[i] = RuntimeError(
+                    f"Batch request {entry.result.type}: "
+                    f"{getattr(entry.result, 'error', '')}"
+                )
+        return results
+
+    def _message_params(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: Optional[int],
+        response_schema: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build Messages API parameters for one request."""
+        return {
+            "model": self.config.model_id,
+            "max_tokens": max_tokens or self.config.max_tokens,
+            "temperature": self.config.temperature,
+            "system": _anthropic_system(system_prompt),
+            "messages": [{"role": "user", "content": prompt}],
+            **_anthropic_tool_kwargs(response_schema)
+        }
 
-        return response_text, input_tokens, output_tokens
+    @staticmethod
+    def _message_result(
+        response: Any,
+        response_schema: Optional[Dict[str, Any]]
+    ) -> tuple[str, int, int, int]:
+        """Extract (response_text, *_anthropic_usage()) from a message."""
+        if response_schema:
+            # Forced tool call: its input is the schema-valid response
+            tool_use = next(b for b in response.content if b.type == "tool_use")
+            response_text = json.dumps(tool_use.input)
+        else:
+            response_text = response.content[0].text
 
+        return (response_text, *_anthropic_usage(response.usage))
 
-class OpenAIClient(ModelClient):
-    """OpenAI API client."""
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Generator[str, None, tuple[int, int]]:
+        """Stream completion using Anthropic API."""
+        client = self._client()
+
+        with client.messages.stream(
+            **self._message_params(
+                prompt, system_prompt, max_tokens, response_schema
+            )
+        ) as stream:
+            for event in stream:
+                text = _anthropic_stream_delta(event)
+                if text:
+                    yield text
 
-    def generate(
+            usage = stream.get_final_message().usage
+
+        return _anthropic_usage(usage)
+
+    async def agenerate_stream(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
-        max_tokens: Optional[int] = None
-    ) -> tuple[str, int, int]:
-        """Generate completion using OpenAI API."""
-        try:
-            import openai
-        except ImportError:
-            raise ImportError(
-                "openai package not installed. Run: pip install openai"
+        max_tokens: Optional[int] = None,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> AsyncStream:
+        """Stream completion using the async Anthropic API."""
+        client = self._async_client()
+        params = self._message_params(
+            prompt, system_prompt, max_tokens, response_schema
+        )
+
+        async with client.messages.stream(**params) as stream:
+            async for event in stream:
+                text = _anthropic_stream_delta(event)
+                if text:
+                    yield text, None
+
+            usage = (await stream.get_final_message()).usage
+
+        yield None, _anthropic_usage(usage)
+
+
+class OpenAIClient(ModelClient):
+    """OpenAI API client."""
+
+    uses_http_client = True
+    batch_cost_factor = BATCH_API_COST_FACTOR
+    cached_input_cost_factor = OPENAI_CACHED_INPUT_COST_FACTOR
+
+    def _client(self) -> Any:
+        """Return the OpenAI SDK client, creating it on first use."""
+        if self._sdk_client is None:
+            openai = _import_sdk("openai")
+
+            if not self.api_key:
+                raise ValueError("OPENAI_API_KEY not set")
+
+            self._sdk_client = openai.OpenAI(
+                api_key=self.api_key, http_client=self.http_client
             )
+        return self._sdk_client
+
+    def _create_async_client(self, http_client: Optional[Any]) -> Any:
+        """Create the OpenAI async SDK client."""
+        openai = _import_sdk("openai")
 
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY not set")
 
-        client = openai.OpenAI(api_key=self.api_key)
+        return openai.AsyncOpenAI(api_key=self.api_key, http_client=http_client)
 
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
+    def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> tuple[str, int, int]:
+        """Generate completion using OpenAI API."""
+        client = self._client()
 
         response = client.chat.completions.create(
             model=self.config.model_id,
             max_tokens=max_tokens or self.config.max_tokens,
             temperature=self.config.temperature,
-            messages=messages
+            messages=_openai_messages(prompt, system_prompt),
+            **_openai_response_format(response_schema),
+            **_openai_cache_kwargs(system_prompt)
         )
 
         # Extract response and token counts
         response_text = response.choices[0].message.content
-        input_tokens = response.usage.prompt_tokens
-        output_tokens = response.usage.completion_tokens
 
-        return response_text, input_tokens, output_tokens
+        return (response_text, *_openai_usage(response.usage))
+
+    def generate_batch(self, requests: List[GenerateRequest]) -> List[Any]:
+        """Generate completions as one OpenAI Batch API job."""
+        client = self._client()
+
+        lines = []
+        for i, (prompt, system_prompt, max_tokens, response_schema) in enumerate(requests):
+            body = {
+                "model": self.config.model_id,
+                "max_tokens": max_tokens or self.config.max_tokens,
+                "temperature": self.config.temperature,
+                "messages": _openai_messages(prompt, system_prompt),
+                **_openai_response_format(response_schema),
+                # Batch bodies are sent as-is: no extra_body wrapper
+                **_openai_cache_kwargs(system_prompt).get("extra_body", {})
+            }
+            lines.append(json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": OPENAI_BATCH_ENDPOINT,
+                "body": body
+            }))
+
+        input_file = client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=OPENAI_BATCH_ENDPOINT,
+            completion_window="24h"
+        )
+        batch = _poll_batch(
+            lambda: client.batches.retrieve(batch.id),
+            lambda b: b.status in _OPENAI_BATCH_FINAL_STATUSES
+        )
+
+        results: List[Any] = [
+            RuntimeError(f"No result in batch {batch.id} ({batch.status})")
+        ] * len(requests)
+        if batch.output_file_id:
+            output = client.files.content(batch.output_file_id).text
+            for line in output.splitlines():
+                record = json.loads(line)
+                response = record.get("response") or {}
+                if record.get("error") or response.get("status_code") != 200:
+                    results[int(record["custom_id"])] = RuntimeError(
+                        f"Batch request failed: {record.get('error') or response}"
+                    )
+                    continue
+
+                body = response["body"]
+                results[int(record["custom_id"])] = (
+                    body["choices"][0]["message"]["content"],
+                    *_openai_usage(body["usage"])
+                )
+        return results
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Generator[str, None, tuple[int, int]]:
+        """Stream completion using OpenAI API."""
+        client = self._client()
+
+        stream = client.chat.completions.create(
+            model=self.config.model_id,
+            max_tokens=max_tokens or self.config.max_tokens,
+            temperature=self.config.temperature,
+            messages=_openai_messages(prompt, system_prompt),
+            stream=True,
+            stream_options={"include_usage": True},
+            **_openai_response_format(response_schema),
+            **_openai_cache_kwargs(system_prompt)
+        )
+
+        usage = (0, 0, 0)
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+            # Usage arrives on the final chunk
+            if chunk.usage:
+                usage = _openai_usage(chunk.usage)
+
+        return usage
+
+    async def agenerate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> AsyncStream:
+        """Stream completion using the async OpenAI API."""
+        client = self._async_client()
+
+        stream = await client.chat.completions.create(
+            model=self.config.model_id,
+            max_tokens=max_tokens or self.config.max_tokens,
+            temperature=self.config.temperature,
+            messages=_openai_messages(prompt, system_prompt),
+            stream=True,
+            stream_options={"include_usage": True},
+            **_openai_response_format(response_schema),
+            **_openai_cache_kwargs(system_prompt)
+        )
+
+        usage = (0, 0, 0)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content, None
+
+            # Usage arrives on the final chunk
+            if chunk.usage:
+                usage = _openai_usage(chunk.usage)
+
+        yield None, usage
 
 
 class FactoryClient(ModelClient):
@@ -505,7 +1536,8 @@ class FactoryClient(ModelClient):
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        response_schema: Optional[Dict[str, Any]] = None
     ) -> tuple[str, int, int]:
         """Generate completion using Factory API."""
         # TODO: Implement factory API integration
@@ -527,11 +1559,13 @@ class OnPremClient(ModelClient):
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        response_schema: Optional[Dict[str, Any]] = None
     ) -> tuple[str, int, int]:
         """Generate completion using on-prem API."""
         # TODO: Implement on-prem API integration
         # This would connect to your air-gapped internal system
+        # (pass response_schema as guided_json for vLLM)
 
         logger.warning("On-prem API not yet implemented - returning mock response")
 
@@ -540,3 +1574,12 @@ class OnPremClient(ModelClient):
             100,  # mock input tokens
             200   # mock output tokens
         )
+
+
+# Provider name (also its api_keys entry) -> client class
+_PROVIDER_CLIENTS: Dict[str, type] = {
+    "anthropic": AnthropicClient,
+    "openai": OpenAIClient,
+    "factory": FactoryClient,
+    "onprem": OnPremClient
+}
@@ -0,0 +1,380 @@
+"""
+Response Cache for ATLASsemi
+
+Persistent caches for LLM responses:
+- ResponseCache: exact match on the full request
+- SemanticCache: embedding similarity on free-form text (e.g. narratives)
+
+Identical or near-identical requests are served from disk instead of
+re-issuing the LLM call. This mostly pays off during development and when
+the same excursion is described by several shifts.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Only needed for SemanticCache
+    np = None
+
+try:
+    import orjson
+except ImportError:  # Optional: faster cache key and entry serialization
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "atlassemi" / "llm"
+
+# Sentence embedding model for semantic lookups (384-d)
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Minimum cosine similarity for a semantic cache hit
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Serialize to compact UTF-8 JSON with sorted keys.
+
+    Uses orjson when installed, with a stdlib fallback. The two can
+    format some values differently (e.g. floats), so cache keys written
+    with orjson may not match those computed without it.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(
+        obj, sort_keys=True, default=str, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+# Accepts bytes; orjson.JSONDecodeError subclasses json.JSONDecodeError
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _atomic_write(path: Path, write: Callable[[Any], None], mode: str = "w") -> None:
+    """
+    Write a file atomically (temp file + os.replace).
+
+    Args:
+        path: Destination path
+        write: Callback that writes the content to an open file
+        mode: File mode ("w" for text, "wb" for binary)
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        encoding = None if "b" in mode else "utf-8"
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class ResponseCache:
+    """
+    On-disk exact-match cache.
+
+    Each entry is a JSON file named by the SHA-256 of its key fields,
+    written atomically so concurrent runs never see partial entries.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Initialize response cache.
+
+        Args:
+            cache_dir: Directory for cache entries
+                (defaults to ~/.cache/atlassemi/llm)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+
+    @staticmethod
+    def make_key(**fields: Any) -> str:
+        """
+        Build a cache key from request fields.
+
+        Args:
+            **fields: Everything that determines the response
+                (agent type, model, prompt, ...)
+
+        Returns:
+            Hex SHA-256 digest of the fields
+        """
+        return hashlib.sha256(_dumps(fields)).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached entry.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached entry, or None on miss
+        """
+        try:
+            with open(self._path(key), "rb") as f:
+                return _loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable cache entry %s: %s", key, e)
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store an entry.
+
+        Args:
+            key: Cache key from make_key()
+            value: JSON-serializable entry
+        """
+        _atomic_write(self._path(key), lambda f: f.write(_dumps(value)), mode="wb")
+
+    def _path(self, key: str) -> Path:
+        """Get file path for a cache key."""
+        return self.cache_dir / f"{key}.json"
+
+
+@functools.lru_cache(maxsize=1)
+def _load_embedding_model() -> Any:
+    """Load the sentence embedding model (once per process)."""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+
+@functools.lru_cache(maxsize=1024)
+def _embed_minilm(text: str) -> "np.ndarray":
+    """
+    Embed text as a unit-normalized float32 vector.
+
+    Memoized, so repeated texts (e.g. a lookup miss followed by add)
+    skip the model forward pass. The returned array is read-only
+    because it is shared between callers.
+    """
+    embedding = _load_embedding_model().encode(text, normalize_embeddings=True)
+    embedding = np.asarray(embedding, dtype=np.float32)
+    embedding.flags.writeable = False
+    return embedding
+
+
+def _quantize(vectors: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Quantize vectors to int8 with one scale per vector.
+
+    Scaling each vector by its own largest component (rather than by 1
+    for unit vectors) keeps cosine similarities within ~0.002 of float32.
+
+    Args:
+        vectors: (N, dim) float array
+
+    Returns:
+        (int8 vectors, float32 scales) with vectors ~= int8 * scales[:, None]
+    """
+    scales = np.abs(vectors).max(axis=1).astype(np.float32) / 127
+    scales[scales == 0] = 1
+    quantized = np.round(vectors / scales[:, None]).astype(np.int8)
+    return quantized, scales
+
+
+class SemanticCache:
+    """
+    On-disk similarity cache.
+
+    Entries are matched by cosine similarity of their text embeddings.
+    Embeddings are unit-normalized, so a lookup is one matrix-vector
+    product over the (N, 384) embedding matrix.
+
+    Entries are grouped into namespaces (e.g. per model) that never see
+    each other's entries. Each namespace is persisted as embeddings.npy
+    plus a sidecar entries.json (and scales.npy when quantized).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        embed: Optional[Callable[[str], Any]] = None,
+        quantize: bool = False
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            cache_dir: Directory for cache entries
+                (defaults to ~/.cache/atlassemi/llm/semantic)
+            threshold: Minimum cosine similarity for a hit
+            embed: Function mapping text to a unit-normalized vector
+                (defaults to all-MiniLM-L6-v2)
+            quantize: Keep embeddings as int8 (a quarter of the memory
+                and disk of float32; similarities shift by up to ~0.002)
+
+        Raises:
+            ImportError: If numpy or sentence-transformers is missing
+        """
+        if np is None:
+            raise ImportError("numpy package not installed. Run: pip install numpy")
+
+        if embed is None:
+            try:
+                import sentence_transformers  # noqa: F401
+            except ImportError:
+                raise ImportError(
+                    "sentence-transformers package not installed. "
+                    "Run: pip install sentence-transformers"
+                )
+            embed = _embed_minilm
+
+        self.cache_dir = (
+            Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR / "semantic"
+        )
+        self.threshold = threshold
+        self.quantize = quantize
+        self._embed = embed
+
+        # namespace -> (embedding matrix or None, int8 scales or None, entries)
+        self._indexes: Dict[str, Tuple[
+            Optional["np.ndarray"], Optional["np.ndarray"], List[Dict[str, Any]]
+        ]] = {}
+
+    def lookup(
+        self,
+        text: str,
+        namespace: str = "default",
+        threshold: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the most similar cached entry.
+
+        Args:
+            text: Text to match
+            namespace: Namespace to search
+            threshold: Minimum cosine similarity for this lookup
+                (defaults to the cache's threshold)
+
+        Returns:
+            Cached entry if its similarity >= threshold, else None
+        """
+        if threshold is None:
+            threshold = self.threshold
+
+        embeddings, scales, entries = self._index(namespace)
+        if embeddings is None:
+            return None
+
+        query = self._embed(text)
+        if scales is None:
+            sims = embeddings @ query
+        else:
+            # Integer dot products, rescaled per entry
+            query, query_scale = _quantize(np.asarray(query)[None, :])
+            sims = np.einsum(
+                "ij,j->i", embeddings, query[0].astype(np.int32), dtype=np.int32
+            ) * (scales * query_scale[0])
+        best = int(sims.argmax())
+
+        if sims[best] >= threshold:
+            logger.debug("Semantic cache hit (similarity=%.3f)", sims[best])
+            return entries[best]
+
+        return None
+
+    def add(self, text: str, entry: Dict[str, Any], namespace: str = "default") -> None:
+        """
+        Store an entry.
+
+        Args:
+            text: Text the entry is matched on
+            entry: JSON-serializable entry
+            namespace: Namespace to store in
+        """
+        embeddings, scales, entries = self._index(namespace)
+        vector = np.asarray(self._embed(text), dtype=np.float32)[None, :]
+
+        if self.quantize:
+            vector, scale = _quantize(vector)
+            scales = scale if scales is None else np.concatenate([scales, scale])
+        embeddings = vector if embeddings is None else np.vstack([embeddings, vector])
+        entries = entries + [entry]
+
+        self._indexes[namespace] = (embeddings, scales, entries)
+        self._save(namespace)
+
+    def _index(self, namespace: str) -> Tuple[
+        Optional["np.ndarray"], Optional["np.ndarray"], List[Dict[str, Any]]
+    ]:
+        """Get (loading if needed) the index for a namespace."""
+        if namespace not in self._indexes:
+            self._indexes[namespace] = self._load(namespace)
+        return self._indexes[namespace]
+
+    def _load(self, namespace: str) -> Tuple[
+        Optional["np.ndarray"], Optional["np.ndarray"], List[Dict[str, Any]]
+    ]:
+        """Load a namespace index from disk (converting to this cache's format)."""
+        directory = self._dir(namespace)
+
+        try:
+            embeddings = np.load(directory / "embeddings.npy")
+            scales = (
+                np.load(directory / "scales.npy")
+                if embeddings.dtype == np.int8 else None
+            )
+            with open(directory / "entries.json", "rb") as f:
+                entries = _loads(f.read())
+        except FileNotFoundError:
+            return None, None, []
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable semantic cache %s: %s", directory, e)
+            return None, None, []
+
+        if len(entries) != len(embeddings) or (
+            scales is not None and len(scales) != len(embeddings)
+        ):
+            logger.warning("Ignoring inconsistent semantic cache %s", directory)
+            return None, None, []
+
+        if self.quantize and scales is None:
+            embeddings, scales = _quantize(embeddings)
+        elif not self.quantize and scales is not None:
+            embeddings = embeddings * scales[:, None]
+            scales = None
+
+        return embeddings, scales, entries
+
+    def _save(self, namespace: str) -> None:
+        """Persist a namespace index to disk."""
+        directory = self._dir(namespace)
+        embeddings, scales, entries = self._indexes[namespace]
+
+        if scales is not None:
+            # Written first: a reader seeing the new int8 embeddings.npy
+            # must find matching scales
+            _atomic_write(
+                directory / "scales.npy", lambda f: np.save(f, scales), mode="wb"
+            )
+        _atomic_write(
+            directory / "embeddings.npy",
+            lambda f: np.save(f, embeddings),
+            mode="wb"
+        )
+        _atomic_write(
+            directory / "entries.json", lambda f: f.write(_dumps(entries)), mode="wb"
+        )
+
+    def _dir(self, namespace: str) -> Path:
+        """Get directory for a namespace."""
+        digest = hashlib.sha256(namespace.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / digest
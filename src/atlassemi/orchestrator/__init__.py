@@ -1,5 +1,11 @@
 """ATLASsemi Workflow Orchestrator"""
 
-from .workflow import WorkflowOrchestrator, WorkflowResult
+from .store import WorkflowStore
+from .workflow import (
+    WorkflowOrchestrator, WorkflowResult, answers_from_file, gather_answers
+)
 
-__all__ = ["WorkflowOrchestrator", "WorkflowResult"]
+__all__ = [
+    "WorkflowOrchestrator", "WorkflowResult", "WorkflowStore",
+    "answers_from_file", "gather_answers"
+]
@@ -0,0 +1,112 @@
+"""
+Workflow Store - columnar metrics across many workflows
+
+Keeps one row per phase output (workflow, agent type, cost, fact and
+hypothesis counts) as typed columns instead of a list of AgentOutput
+objects, so dashboards aggregating a shift's worth of workflows scan a
+few compact buffers rather than chasing every output's attributes.
+"""
+
+import math
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+from atlassemi.agents.base import AgentOutput
+
+
+class WorkflowStore:
+    """
+    Column-wise store of per-phase workflow metrics (thread-safe).
+
+    Agent types are dictionary-encoded: the agent_type column holds
+    small integer codes into agent_types.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self.agent_types: List[str] = []
+        self._agent_codes: Dict[str, int] = {}
+        self._workflows = 0
+
+        # Columns (one entry per row)
+        self.workflow_id = array("I")
+        self.agent_type = array("B")
+        self.cost_usd = array("d")
+        self.facts_count = array("I")
+        self.hypotheses_count = array("I")
+
+        # Appends can come from background Phase 3 threads
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.workflow_id)
+
+    def new_workflow(self) -> int:
+        """
+        Allocate an id for a workflow's rows.
+
+        Returns:
+            New workflow id
+        """
+        with self._lock:
+            self._workflows += 1
+            return self._workflows - 1
+
+    def add_output(self, workflow_id: int, output: AgentOutput) -> None:
+        """
+        Append one phase output as a row.
+
+        Args:
+            workflow_id: Id from new_workflow()
+            output: Phase output
+        """
+        with self._lock:
+            code = self._agent_codes.get(output.agent_type)
+            if code is None:
+                code = self._agent_codes[output.agent_type] = len(self.agent_types)
+                self.agent_types.append(output.agent_type)
+
+            self.workflow_id.append(workflow_id)
+            self.agent_type.append(code)
+            self.cost_usd.append(output.cost_usd)
+            self.facts_count.append(len(output.facts))
+            self.hypotheses_count.append(len(output.hypotheses))
+
+    def total_cost_usd(self, agent_type: Optional[str] = None) -> float:
+        """
+        Sum the cost column.
+
+        Args:
+            agent_type: Only sum rows of this agent type (None for all)
+
+        Returns:
+            Total cost in USD
+        """
+        if agent_type is None:
+            return math.fsum(self.cost_usd)
+
+        code = self._agent_codes.get(agent_type)
+        return math.fsum(
+            cost for cost, c in zip(self.cost_usd, self.agent_type) if c == code
+        )
+
+    def cost_by_agent(self) -> Dict[str, float]:
+        """
+        Total cost per agent type.
+
+        Returns:
+            Agent type -> total cost in USD
+        """
+        totals = [0.0] * len(self.agent_types)
+        for cost, code in zip(self.cost_usd, self.agent_type):
+            totals[code] += cost
+        return dict(zip(self.agent_types, totals))
+
+    def total_facts(self) -> int:
+        """Sum the facts_count column."""
+        return sum(self.facts_count)
+
+    def total_hypotheses(self) -> int:
+        """Sum the hypotheses_count column."""
+        return sum(self.hypotheses_count)
@@ -8,22 +8,309 @@ Phases:
 - Phase 3: Prevention (lessons learned + corrective actions)
 """
 
-from typing import Dict, List, Optional, Callable
+import asyncio
+import functools
+import inspect
+import logging
+import sys
+import threading
+from collections import ChainMap
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MappingProxyType
+from typing import (
+    Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+)
 from dataclasses import dataclass, field
 
 from atlassemi.agents.base import (
+    MAX_CONCURRENT_LLM_CALLS,
     AgentInput,
     AgentOutput,
+    BaseAgent,
     ProblemMode,
-    SecurityTier
+    SecurityTier,
+    StreamedArrayItems
 )
 from atlassemi.agents import (
     NarrativeAgent,
+    NarrativeAnalysis,
     ClarificationAgent,
     AnalysisAgent,
+    EightDPhaseAnalysis,
+    EightDReport,
     PreventionAgent
 )
-from atlassemi.config import ModelRouter
+from atlassemi.agents.cache import ActionCache
+from atlassemi.orchestrator.store import WorkflowStore
+from atlassemi.config import ModelRouter, ResponseCache, SemanticCache
+from atlassemi.telemetry import COUNTERS, Counter
+
+try:
+    from prompt_toolkit import PromptSession
+except ImportError:  # Optional: line editing when answering questions
+    PromptSession = None
+
+logger = logging.getLogger(__name__)
+
+# Rule above and below phase banners
+_BANNER_RULE = "=" * 80
+
+# 8D phases of the Phase 2 report that Phase 3 builds on (see
+# _eight_d_mapping); Phase 3 starts speculatively once all have streamed in
+_PREVENTION_INPUT_PHASES = frozenset({"D2", "D3", "D4"})
+
+
+def _narrative_context(narrative_output: AgentOutput) -> Mapping[str, Any]:
+    """
+    Build the read-only context Phases 1-3 share from the Phase 0 output.
+
+    Built once per workflow run; each phase layers its own keys over it
+    with a ChainMap instead of copying it.
+
+    Args:
+        narrative_output: Output from Phase 0
+
+    Returns:
+        Mapping with the narrative, observations and interpretations
+    """
+    return MappingProxyType({
+        "narrative": narrative_output.metadata.get("narrative", ""),
+        "observations": narrative_output.facts,
+        "interpretations": narrative_output.hypotheses
+    })
+
+
+def _eight_d_mapping(report: Optional[EightDReport]) -> Dict[str, Any]:
+    """
+    Extract the Phase 2 findings Phase 3 builds on.
+
+    Args:
+        report: 8D report from the analysis agent (None if unavailable)
+
+    Returns:
+        Problem definition (D2), containment (D3) and root causes (D4)
+    """
+    findings = {p.phase: p.findings for p in report.phases} if report else {}
+    return {
+        "D2_problem_definition": " ".join(findings.get("D2", [])),
+        "D3_containment": list(findings.get("D3", [])),
+        "D4_root_cause_analysis": list(findings.get("D4", []))
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _background_executor() -> ThreadPoolExecutor:
+    """Get the process-wide executor for deferred Phase 3 runs."""
+    return ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_LLM_CALLS,
+        thread_name_prefix="atlassemi-prevention"
+    )
+
+
+# Serializes _agent_pool() misses so concurrent orchestrators with the
+# same configuration never build two sets of agents
+_AGENT_POOL_LOCK = threading.Lock()
+
+
+def _agent_pool(
+    model_router: Optional[ModelRouter],
+    response_cache: Optional[ResponseCache],
+    semantic_cache: Optional[SemanticCache],
+    enable_cache: bool,
+    action_cache: Optional[ActionCache] = None,
+    similarity_threshold: Optional[float] = None
+) -> Tuple[NarrativeAgent, ClarificationAgent, AnalysisAgent, PreventionAgent]:
+    """
+    Get the four phase agents for a router and cache configuration.
+
+    Agents keep no per-workflow state, so orchestrators created with the
+    same router and caches (e.g. one per task in a worker process) share
+    one set of agents, including their in-memory response memos. The
+    pool is kept on the router itself, so dropping the router (or
+    closing a ModelRouter) releases its agents; without a router every
+    orchestrator gets its own agents. Call with _AGENT_POOL_LOCK held.
+
+    Args:
+        model_router: ModelRouter for tier-aware LLM calls
+        response_cache: Optional cache for reusing identical LLM calls
+        semantic_cache: Optional cache for reusing Phase 0 analysis
+        enable_cache: Reuse responses to repeated prompts (in-memory)
+        action_cache: Optional cache for reusing complete agent outputs
+        similarity_threshold: Minimum similarity for a semantic_cache hit
+
+    Returns:
+        (narrative, clarification, analysis, prevention) agents
+    """
+    config = (
+        response_cache, semantic_cache, enable_cache, action_cache,
+        similarity_threshold
+    )
+    if model_router is None:
+        return _build_agents(None, *config)
+
+    # ModelRouter creates the pool in __init__; other routers get one here
+    pool = vars(model_router).setdefault("_agent_pool", {})
+    agents = pool.get(config)
+    if agents is None:
+        agents = pool[config] = _build_agents(model_router, *config)
+    return agents
+
+
+def _build_agents(
+    model_router: Optional[ModelRouter],
+    response_cache: Optional[ResponseCache],
+    semantic_cache: Optional[SemanticCache],
+    enable_cache: bool,
+    action_cache: Optional[ActionCache],
+    similarity_threshold: Optional[float]
+) -> Tuple[NarrativeAgent, ClarificationAgent, AnalysisAgent, PreventionAgent]:
+    """Build the four phase agents (see _agent_pool)."""
+    return (
+        NarrativeAgent(
+            model_router=model_router,
+            response_cache=response_cache,
+            semantic_cache=semantic_cache,
+            enable_cache=enable_cache,
+            action_cache=action_cache,
+            similarity_threshold=similarity_threshold
+        ),
+        ClarificationAgent(
+            model_router=model_router,
+            response_cache=response_cache,
+            enable_cache=enable_cache,
+            action_cache=action_cache
+        ),
+        AnalysisAgent(
+            model_router=model_router,
+            response_cache=response_cache,
+            enable_cache=enable_cache,
+            action_cache=action_cache
+        ),
+        PreventionAgent(
+            model_router=model_router,
+            response_cache=response_cache,
+            enable_cache=enable_cache,
+            action_cache=action_cache
+        )
+    )
+
+
+def _progress_output(answer_collector: Optional[Callable]) -> Callable[..., None]:
+    """
+    Get the function showing Phase 1 progress: printed for the
+    interactive CLI (no answer_collector), logged otherwise.
+
+    Both take a %-style message and its arguments (formatted lazily
+    when logged).
+    """
+    if answer_collector is None:
+        return lambda message, *args: print(message % args)
+    return logger.info
+
+
+class _ChunkRelay:
+    """
+    Streaming callback that holds chunks back until a target is attached.
+
+    Lets a speculative agent run stream before it is known whether its
+    output will be used: buffered chunks are replayed on attach(), later
+    ones are forwarded as they arrive.
+    """
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._target: Optional[Callable[[str], None]] = None
+
+    def __call__(self, chunk: str) -> None:
+        if self._target is None:
+            self._chunks.append(chunk)
+        else:
+            self._target(chunk)
+
+    def attach(self, target: Callable[[str], None]) -> None:
+        """Replay the buffered chunks to target and forward the rest."""
+        self._target = target
+        for chunk in self._chunks:
+            target(chunk)
+        self._chunks.clear()
+
+
+async def _await(awaitable: Any) -> Any:
+    """Await any awaitable (asyncio.run() only accepts coroutines)."""
+    return await awaitable
+
+
+def gather_answers(
+    answer_one: Callable[[Dict[str, str]], Any]
+) -> Callable[[List[Dict[str, str]]], Any]:
+    """
+    Build an answer collector that answers all questions concurrently.
+
+    Useful when answers come from data sources rather than a person
+    (SPC database, MES, operator chat): each question is looked up at
+    once instead of one after another.
+
+    Args:
+        answer_one: Gets the answer to one {question, rationale} dict
+            (None or "" to skip it); either a coroutine function, or a
+            blocking function run in the event loop's thread pool
+
+    Returns:
+        Async answer collector for run_workflow() / arun_workflow()
+    """
+    if inspect.iscoroutinefunction(answer_one):
+        fetch = answer_one
+    else:
+        fetch = functools.partial(asyncio.to_thread, answer_one)
+
+    async def collect(questions: List[Dict[str, str]]) -> Dict[str, str]:
+        replies = await asyncio.gather(*(fetch(q) for q in questions))
+        return {
+            q["question"]: reply
+            for q, reply in zip(questions, replies)
+            if reply
+        }
+
+    return collect
+
+
+def answers_from_file(path: str) -> Callable[[List[Dict[str, str]]], Dict[str, str]]:
+    """
+    Build an answer collector that reads prepared answers from a file.
+
+    The file holds one answer per line, in question order; blank lines
+    and 'skip' leave a question unanswered. The file is read right away,
+    so a missing file is reported before any LLM call.
+
+    Args:
+        path: Answers file
+
+    Returns:
+        Answer collector for run_workflow() / arun_workflow()
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    with open(path, encoding="utf-8") as f:
+        replies = f.read().splitlines()
+
+    def collect(questions: List[Dict[str, str]]) -> Dict[str, str]:
+        return _answers_from_replies(questions, replies)
+
+    return collect
+
+
+def _answers_from_replies(
+    questions: List[Dict[str, str]],
+    replies: Iterable[str]
+) -> Dict[str, str]:
+    """Map questions to their replies, skipping blank and 'skip' replies."""
+    answers = {}
+    for q, reply in zip(questions, replies):
+        reply = reply.strip()
+        if reply and reply.lower() != 'skip':
+            answers[q['question']] = reply
+    return answers
 
 
 @dataclass
@@ -36,7 +323,8 @@ class WorkflowResult:
     clarification_questions: List[Dict[str, str]]
     clarification_answers: Dict[str, str]  # {question: answer}
     analysis_output: AgentOutput
-    prevention_output: AgentOutput
+    # None while a deferred Phase 3 runs (see wait_for_prevention)
+    prevention_output: Optional[AgentOutput]
 
     # Summary metrics
     total_cost_usd: float
@@ -48,6 +336,98 @@ class WorkflowResult:
     hypotheses_identified: int = 0
     eight_d_phases_addressed: List[str] = field(default_factory=list)
 
+    # Performance counters for this run, e.g. {"phase_0_ms": ...}
+    diagnostics: Dict[str, float] = field(default_factory=dict)
+
+    # Deferred Phase 3 (run_workflow(defer_prevention=True))
+    prevention_future: Optional["Future[AgentOutput]"] = None
+
+    @classmethod
+    def from_outputs(
+        cls,
+        narrative_output: AgentOutput,
+        clarification_questions: List[Dict[str, str]],
+        clarification_answers: Dict[str, str],
+        analysis_output: AgentOutput,
+        prevention_output: Optional[AgentOutput],
+        phases_completed: List[str],
+        errors: List[str],
+        diagnostics: Optional[Dict[str, float]] = None,
+        prevention_future: Optional["Future[AgentOutput]"] = None
+    ) -> "WorkflowResult":
+        """
+        Build a result, accumulating metrics from the phase outputs.
+
+        Cost, fact and hypothesis counts and 8D phases are taken from the
+        narrative, analysis and prevention outputs (the latter once it
+        is available).
+
+        Args:
+            narrative_output: Phase 0 output
+            clarification_questions: [{question, rationale}, ...]
+            clarification_answers: {question: answer}
+            analysis_output: Phase 2 output
+            prevention_output: Phase 3 output (None while deferred)
+            phases_completed: Names of the completed phases
+            errors: Errors encountered
+            diagnostics: Performance counters for this run
+            prevention_future: Deferred Phase 3 output
+
+        Returns:
+            WorkflowResult with summary and quality metrics filled in
+        """
+        outputs = [
+            o for o in (narrative_output, analysis_output, prevention_output)
+            if o is not None
+        ]
+
+        return cls(
+            narrative_output=narrative_output,
+            clarification_questions=clarification_questions,
+            clarification_answers=clarification_answers,
+            analysis_output=analysis_output,
+            prevention_output=prevention_output,
+            total_cost_usd=sum(o.cost_usd for o in outputs),
+            phases_completed=phases_completed,
+            errors=errors,
+            facts_identified=sum(len(o.facts) for o in outputs),
+            hypotheses_identified=sum(len(o.hypotheses) for o in outputs),
+            eight_d_phases_addressed=sorted(
+                set().union(*(o.eight_d_phases_addressed for o in outputs))
+            ),
+            diagnostics=dict(diagnostics or {}),
+            prevention_future=prevention_future
+        )
+
+    def wait_for_prevention(self, timeout: Optional[float] = None) -> "WorkflowResult":
+        """
+        Wait for a deferred Phase 3 and include it in the result.
+
+        Args:
+            timeout: Seconds to wait (None waits indefinitely)
+
+        Returns:
+            This result if Phase 3 was not deferred, otherwise a new
+            result with the prevention output and its metrics added
+
+        Raises:
+            TimeoutError: If Phase 3 does not finish within timeout
+            Exception: Whatever Phase 3 raised
+        """
+        if self.prevention_future is None:
+            return self
+
+        return WorkflowResult.from_outputs(
+            self.narrative_output,
+            self.clarification_questions,
+            self.clarification_answers,
+            self.analysis_output,
+            self.prevention_future.result(timeout),
+            [*self.phases_completed, "Phase 3: Prevention"],
+            self.errors,
+            self.diagnostics
+        )
+
 
 class WorkflowOrchestrator:
     """
@@ -61,29 +441,73 @@ class WorkflowOrchestrator:
     - Handle errors gracefully
     """
 
-    def __init__(self, model_router: ModelRouter):
+    def __init__(
+        self,
+        model_router: ModelRouter,
+        response_cache: Optional[ResponseCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        enable_cache: bool = True,
+        max_parallel_agents: int = MAX_CONCURRENT_LLM_CALLS,
+        action_cache: Optional[ActionCache] = None,
+        similarity_threshold: Optional[float] = None,
+        store: Optional[WorkflowStore] = None
+    ):
         """
         Initialize orchestrator.
 
         Args:
             model_router: ModelRouter for tier-aware LLM calls
+            response_cache: Optional cache for reusing identical LLM calls
+            semantic_cache: Optional cache for reusing Phase 0 analysis
+                of near-duplicate narratives
+            enable_cache: Reuse responses to repeated prompts within
+                this session (in-memory)
+            max_parallel_agents: Maximum agents running at once within
+                one arun_workflow() (speculative runs included)
+            action_cache: Optional cache for reusing complete agent
+                outputs of deterministic (temperature 0) re-runs
+            similarity_threshold: Minimum cosine similarity for reusing
+                the Phase 0 analysis of a near-duplicate narrative
+                (defaults to the semantic cache's threshold)
+            store: Optional WorkflowStore the phase outputs of every
+                run are appended to (for aggregate metrics)
+
+        Raises:
+            ValueError: If max_parallel_agents is less than 1 or
+                similarity_threshold is outside (0, 1]
         """
-        self.model_router = model_router
+        if max_parallel_agents < 1:
+            raise ValueError(
+                f"max_parallel_agents must be at least 1, got {max_parallel_agents}"
+            )
+        if similarity_threshold is not None and not 0 < similarity_threshold <= 1:
+            raise ValueError(
+                f"similarity_threshold must be in (0, 1], got {similarity_threshold}"
+            )
 
-        # Initialize agents
-        self.narrative_agent = NarrativeAgent(model_router=model_router)
-        self.clarification_agent = ClarificationAgent(
-            model_router=model_router
-        )
-        self.analysis_agent = AnalysisAgent(model_router=model_router)
-        self.prevention_agent = PreventionAgent(model_router=model_router)
+        self.model_router = model_router
+        self.max_parallel_agents = max_parallel_agents
+        self.store = store
+
+        # Agents are shared by orchestrators with the same configuration
+        with _AGENT_POOL_LOCK:
+            (
+                self.narrative_agent,
+                self.clarification_agent,
+                self.analysis_agent,
+                self.prevention_agent
+            ) = _agent_pool(
+                model_router, response_cache, semantic_cache, enable_cache,
+                action_cache, similarity_threshold
+            )
 
     def run_workflow(
         self,
         narrative: str,
         mode: ProblemMode,
         tier: SecurityTier,
-        answer_collector: Optional[Callable] = None
+        answer_collector: Optional[Callable] = None,
+        defer_prevention: bool = False
     ) -> WorkflowResult:
         """
         Execute the full 4-phase workflow.
@@ -92,91 +516,520 @@ class WorkflowOrchestrator:
             narrative: User's problem description
             mode: Problem-solving mode (excursion/improvement/operations)
             tier: Security tier (general/confidential/top_secret)
-            answer_collector: Function to collect user answers
-                (defaults to CLI input)
+            answer_collector: Function to collect user answers, sync or
+                async (defaults to CLI input; see gather_answers())
+            defer_prevention: Return as soon as the 8D analysis is done
+                and run Phase 3 in a background thread; the result's
+                prevention_output stays None until wait_for_prevention()
 
         Returns:
             WorkflowResult with all phase outputs and metrics
         """
         phases_completed: List[str] = []
         errors: List[str] = []
+        # Wall-clock time per phase (Phase 1 includes answering)
+        timings = Counter()
 
         # Phase 0: Narrative Analysis
-        print("\n" + "=" * 80)
-        print("PHASE 0: NARRATIVE ANALYSIS")
-        print("=" * 80)
+        self._print_phase_header("PHASE 0: NARRATIVE ANALYSIS")
 
         narrative_output = self._execute_phase_0(narrative, mode, tier)
+        shared_context = _narrative_context(narrative_output)
         phases_completed.append("Phase 0: Narrative")
+        timings.lap("phase_0_ms")
 
         # Phase 1: Clarification Questions
-        print("\n" + "=" * 80)
-        print("PHASE 1: CLARIFICATION")
-        print("=" * 80)
+        self._print_phase_header("PHASE 1: CLARIFICATION")
 
         clarification_questions, clarification_answers = self._execute_phase_1(
-            narrative_output, mode, tier, answer_collector
+            narrative_output, shared_context, mode, tier, answer_collector
         )
         phases_completed.append("Phase 1: Clarification")
+        timings.lap("phase_1_ms")
 
         # Phase 2: 8D Analysis
-        print("\n" + "=" * 80)
-        print("PHASE 2: 8D ANALYSIS")
-        print("=" * 80)
+        self._print_phase_header("PHASE 2: 8D ANALYSIS")
 
         analysis_output = self._execute_phase_2(
-            narrative_output, clarification_answers, mode, tier
+            narrative_output, shared_context, clarification_answers, mode, tier
         )
         phases_completed.append("Phase 2: Analysis")
+        timings.lap("phase_2_ms")
 
         # Phase 3: Prevention Planning
-        print("\n" + "=" * 80)
-        print("PHASE 3: PREVENTION AND LESSONS LEARNED")
-        print("=" * 80)
+        self._print_phase_header("PHASE 3: PREVENTION AND LESSONS LEARNED")
+
+        prevention_output = None
+        prevention_future = None
+        if defer_prevention:
+            # Lessons learned are not needed for triage: hand back the
+            # analysis now and let the caller collect Phase 3 later
+            prevention_future = _background_executor().submit(
+                self._execute_phase_3, analysis_output, shared_context, mode, tier
+            )
+        else:
+            prevention_output = self._execute_phase_3(
+                analysis_output, shared_context, mode, tier
+            )
+            phases_completed.append("Phase 3: Prevention")
+            timings.lap("phase_3_ms")
+
+        return self._store_result(WorkflowResult.from_outputs(
+            narrative_output,
+            clarification_questions,
+            clarification_answers,
+            analysis_output,
+            prevention_output,
+            phases_completed,
+            errors,
+            self._record_timings(timings),
+            prevention_future
+        ))
+
+    async def arun_workflow(
+        self,
+        narrative: str,
+        mode: ProblemMode,
+        tier: SecurityTier,
+        answer_collector: Optional[Callable] = None
+    ) -> WorkflowResult:
+        """
+        Execute the full 4-phase workflow without blocking the event loop.
 
-        prevention_output = self._execute_phase_3(
-            analysis_output, narrative_output, mode, tier
-        )
-        phases_completed.append("Phase 3: Prevention")
+        Each phase consumes the previous phase's output, so phases are
+        awaited in order, except that clarification questions are
+        generated speculatively while Phase 0 runs, and Phase 3 starts
+        speculatively once Phase 2 has streamed the D2-D4 findings it
+        builds on. Questions are shown as they stream in. At most max_parallel_agents agents run at once. Agents
+        call the LLM asynchronously and answer collection runs in a
+        worker thread, leaving the loop free for concurrent workflows.
+
+        Args:
+            narrative: User's problem description
+            mode: Problem-solving mode (excursion/improvement/operations)
+            tier: Security tier (general/confidential/top_secret)
+            answer_collector: Function to collect user answers, sync or
+                async (defaults to CLI input; see gather_answers())
+
+        Returns:
+            WorkflowResult with all phase outputs and metrics
+        """
+        phases_completed: List[str] = []
+        errors: List[str] = []
+        # Wall-clock time per phase (Phase 1 includes answering)
+        timings = Counter()
+        # Created per run: asyncio primitives bind to the running loop
+        agent_slots = asyncio.Semaphore(self.max_parallel_agents)
 
-        # Accumulate metrics
-        total_cost = (
-            narrative_output.cost_usd +
-            analysis_output.cost_usd +
-            prevention_output.cost_usd
+        # Phase 0: Narrative Analysis
+        self._print_phase_header("PHASE 0: NARRATIVE ANALYSIS")
+
+        # Speculatively generate clarification questions from the bare
+        # narrative while Phase 0 runs (used if Phase 0 does not change
+        # the clarification prompt). This only pays off because the
+        # prompt ignores Phase 0 today: ClarificationAgent._format_known()
+        # reads context["narrative_analysis"], which _clarification_input()
+        # does not provide, so "What we know so far" is always empty.
+        # TODO: Drop this speculation when that key is passed; the prompt
+        # would then always differ and every run would pay an extra call.
+        speculative_input = AgentInput(
+            mode=mode,
+            security_tier=tier,
+            context={"narrative": narrative}
         )
+        speculative_chunks = _ChunkRelay()
+        speculative = asyncio.create_task(self._arun_agent(
+            agent_slots,
+            self.clarification_agent,
+            speculative_input,
+            on_chunk=speculative_chunks
+        ))
+
+        try:
+            narrative_output = await self._arun_agent(
+                agent_slots,
+                self.narrative_agent,
+                self._narrative_input(narrative, mode, tier)
+            )
+        except BaseException:
+            speculative.cancel()
+            raise
+        shared_context = _narrative_context(narrative_output)
+        phases_completed.append("Phase 0: Narrative")
+        timings.lap("phase_0_ms")
 
-        facts_count = (
-            len(narrative_output.facts) +
-            len(analysis_output.facts) +
-            len(prevention_output.facts)
+        # Phase 1: Clarification Questions
+        self._print_phase_header("PHASE 1: CLARIFICATION")
+
+        # Show the questions as they stream in (printed for the interactive
+        # CLI, logged otherwise)
+        show = _progress_output(answer_collector)
+        streamed_questions = StreamedArrayItems("questions")
+        shown: List[str] = []
+
+        def on_clarification_chunk(chunk: str) -> None:
+            for question in streamed_questions.feed(chunk):
+                shown.append(question)
+                show("%d. %s", len(shown), question)
+
+        show("\nClarification questions:\n")
+        clarification_output = await self._aresolve_speculation(
+            agent_slots,
+            self.clarification_agent,
+            speculative,
+            speculative_input,
+            self._clarification_input(narrative_output, shared_context, mode, tier),
+            on_chunk=on_clarification_chunk,
+            speculative_chunks=speculative_chunks
+        )
+        # Questions not streamed (action cache hits, non-JSON fallbacks)
+        for question in clarification_output.metadata["questions"][len(shown):]:
+            shown.append(question)
+            show("%d. %s", len(shown), question)
+        show(
+            "\nWhy these matter: %s\n",
+            clarification_output.metadata.get("rationale", "")
         )
 
-        hypotheses_count = (
-            len(narrative_output.hypotheses) +
-            len(analysis_output.hypotheses) +
-            len(prevention_output.hypotheses)
+        clarification_questions = self._clarification_questions(
+            clarification_output
+        )
+        clarification_answers = await self._acollect_answers(
+            clarification_questions, answer_collector
         )
+        phases_completed.append("Phase 1: Clarification")
+        timings.lap("phase_1_ms")
 
-        # Collect all 8D phases addressed
-        all_phases = set()
-        all_phases.update(narrative_output.eight_d_phases_addressed)
-        all_phases.update(analysis_output.eight_d_phases_addressed)
-        all_phases.update(prevention_output.eight_d_phases_addressed)
+        # Phase 2: 8D Analysis
+        self._print_phase_header("PHASE 2: 8D ANALYSIS")
+
+        # Speculatively start Phase 3 as soon as the 8D phases it builds
+        # on have streamed in (used if the final report agrees)
+        streamed_phases = StreamedArrayItems("phases")
+        streamed_findings: Dict[str, Any] = {}
+        speculative_prevention: Optional["asyncio.Task[AgentOutput]"] = None
+        speculative_prevention_input: Optional[AgentInput] = None
+
+        def on_analysis_chunk(chunk: str) -> None:
+            nonlocal speculative_prevention, speculative_prevention_input
+            if speculative_prevention is not None:
+                return
+            for phase in streamed_phases.feed(chunk):
+                if isinstance(phase, dict):
+                    streamed_findings.setdefault(
+                        phase.get("phase"), phase.get("findings", [])
+                    )
+            if _PREVENTION_INPUT_PHASES <= streamed_findings.keys():
+                partial_report = EightDReport(phases=[
+                    EightDPhaseAnalysis(phase=phase, findings=findings)
+                    for phase, findings in streamed_findings.items()
+                ])
+                speculative_prevention_input = self._prevention_input(
+                    AgentOutput(
+                        agent_type="analysis",
+                        content="",
+                        metadata={"report": partial_report}
+                    ),
+                    shared_context,
+                    mode,
+                    tier
+                )
+                speculative_prevention = asyncio.create_task(self._arun_agent(
+                    agent_slots,
+                    self.prevention_agent,
+                    speculative_prevention_input
+                ))
 
-        return WorkflowResult(
-            narrative_output=narrative_output,
-            clarification_questions=clarification_questions,
-            clarification_answers=clarification_answers,
-            analysis_output=analysis_output,
-            prevention_output=prevention_output,
-            total_cost_usd=total_cost,
-            phases_completed=phases_completed,
-            errors=errors,
-            facts_identified=facts_count,
-            hypotheses_identified=hypotheses_count,
-            eight_d_phases_addressed=sorted(list(all_phases))
+        try:
+            analysis_output = await self._arun_agent(
+                agent_slots,
+                self.analysis_agent,
+                self._analysis_input(
+                    narrative_output, shared_context, clarification_answers,
+                    mode, tier
+                ),
+                on_chunk=on_analysis_chunk
+            )
+        except BaseException:
+            if speculative_prevention is not None:
+                speculative_prevention.cancel()
+            raise
+        phases_completed.append("Phase 2: Analysis")
+        timings.lap("phase_2_ms")
+
+        # Phase 3: Prevention Planning
+        self._print_phase_header("PHASE 3: PREVENTION AND LESSONS LEARNED")
+
+        prevention_input = self._prevention_input(
+            analysis_output, shared_context, mode, tier
         )
+        if speculative_prevention is not None:
+            prevention_output = await self._aresolve_speculation(
+                agent_slots,
+                self.prevention_agent,
+                speculative_prevention,
+                speculative_prevention_input,
+                prevention_input
+            )
+        else:
+            prevention_output = await self._arun_agent(
+                agent_slots, self.prevention_agent, prevention_input
+            )
+        phases_completed.append("Phase 3: Prevention")
+        timings.lap("phase_3_ms")
+
+        return self._store_result(WorkflowResult.from_outputs(
+            narrative_output,
+            clarification_questions,
+            clarification_answers,
+            analysis_output,
+            prevention_output,
+            phases_completed,
+            errors,
+            self._record_timings(timings)
+        ))
+
+    def run_batch(
+        self,
+        narratives: Sequence[str],
+        modes: Sequence[ProblemMode],
+        tiers: Sequence[SecurityTier],
+        answers_per_narrative: Optional[Sequence[Dict[str, str]]] = None,
+        answer_collector: Optional[Callable] = None
+    ) -> List[WorkflowResult]:
+        """
+        Execute the workflow for many narratives as offline batches.
+
+        Each phase runs for all narratives at once through the agents'
+        execute_batch(), which uses provider Batch APIs (discounted,
+        results may take hours).
+
+        Clarification answers are either supplied up front (e.g. nightly
+        alert triage), in which case Phase 1 is skipped, or collected with
+        answer_collector, in which case the questions are generated as
+        one more batch and answers are collected for each narrative in
+        turn between Phase 1 and Phase 2.
+
+        Args:
+            narratives: Problem descriptions
+            modes: Problem-solving mode per narrative
+            tiers: Security tier per narrative
+            answers_per_narrative: Clarification answers ({question:
+                answer}) per narrative (default: none)
+            answer_collector: Function to collect answers to generated
+                questions, sync or async (see gather_answers())
+
+        Returns:
+            WorkflowResult per narrative, in input order
+
+        Raises:
+            ValueError: If the argument sequences differ in length, or
+                both answers_per_narrative and answer_collector are given
+            RuntimeError: If any LLM call in a batch failed
+        """
+        if answers_per_narrative is not None and answer_collector is not None:
+            raise ValueError(
+                "Pass answers_per_narrative or answer_collector, not both"
+            )
+        if answers_per_narrative is None:
+            answers_per_narrative = [{}] * len(narratives)
+
+        if not (
+            len(narratives) == len(modes) == len(tiers)
+            == len(answers_per_narrative)
+        ):
+            raise ValueError(
+                "narratives, modes, tiers and answers_per_narrative "
+                "must have the same length"
+            )
+
+        runs = list(zip(modes, tiers))
+        phases_completed = ["Phase 0: Narrative"]
+        # Wall-clock time per phase across the batch
+        timings = Counter()
+
+        # Phase 0: Narrative Analysis
+        narrative_outputs = self.narrative_agent.execute_batch([
+            self._narrative_input(narrative, mode, tier)
+            for narrative, (mode, tier) in zip(narratives, runs)
+        ])
+        shared_contexts = [_narrative_context(output) for output in narrative_outputs]
+        timings.lap("phase_0_ms")
+
+        # Phase 1: Clarification (only when answers are collected)
+        if answer_collector is not None:
+            clarification_outputs = self.clarification_agent.execute_batch([
+                self._clarification_input(narrative_output, shared, mode, tier)
+                for narrative_output, shared, (mode, tier)
+                in zip(narrative_outputs, shared_contexts, runs)
+            ])
+            clarifications = [
+                self._collect_clarifications(output, answer_collector)
+                for output in clarification_outputs
+            ]
+            phases_completed.append("Phase 1: Clarification")
+            timings.lap("phase_1_ms")
+        else:
+            clarifications = [([], dict(answers)) for answers in answers_per_narrative]
+
+        # Phase 2: 8D Analysis
+        analysis_outputs = self.analysis_agent.execute_batch([
+            self._analysis_input(narrative_output, shared, answers, mode, tier)
+            for narrative_output, shared, (_, answers), (mode, tier)
+            in zip(narrative_outputs, shared_contexts, clarifications, runs)
+        ])
+        phases_completed.append("Phase 2: Analysis")
+        timings.lap("phase_2_ms")
+
+        # Phase 3: Prevention Planning
+        prevention_outputs = self.prevention_agent.execute_batch([
+            self._prevention_input(analysis_output, shared, mode, tier)
+            for analysis_output, shared, (mode, tier)
+            in zip(analysis_outputs, shared_contexts, runs)
+        ])
+        phases_completed.append("Phase 3: Prevention")
+        timings.lap("phase_3_ms")
+
+        COUNTERS.merge(timings)
+        COUNTERS.incr("workflows", len(narratives))
+        diagnostics = timings.snapshot()
+
+        return [
+            self._store_result(WorkflowResult.from_outputs(
+                narrative_output,
+                questions,
+                answers,
+                analysis_output,
+                prevention_output,
+                list(phases_completed),
+                [],
+                diagnostics
+            ))
+            for narrative_output, (questions, answers), analysis_output,
+            prevention_output in zip(
+                narrative_outputs, clarifications, analysis_outputs,
+                prevention_outputs
+            )
+        ]
+
+    @staticmethod
+    async def _arun_agent(
+        agent_slots: asyncio.Semaphore,
+        agent: BaseAgent,
+        agent_input: AgentInput,
+        on_chunk: Optional[Callable[[str], None]] = None
+    ) -> AgentOutput:
+        """
+        Run agent.aexecute() once one of the workflow's agent slots is free.
+
+        Args:
+            agent_slots: Semaphore bounding agents running at once
+            agent: Agent to run
+            agent_input: Input for the agent
+            on_chunk: Streaming callback passed to aexecute() (optional)
+
+        Returns:
+            Agent output
+        """
+        kwargs = {"on_chunk": on_chunk} if on_chunk is not None else {}
+        async with agent_slots:
+            return await agent.aexecute(agent_input, **kwargs)
+
+    @classmethod
+    async def _aresolve_speculation(
+        cls,
+        agent_slots: asyncio.Semaphore,
+        agent: BaseAgent,
+        speculative: "asyncio.Task[AgentOutput]",
+        speculative_input: AgentInput,
+        agent_input: AgentInput,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        speculative_chunks: Optional[_ChunkRelay] = None
+    ) -> AgentOutput:
+        """
+        Use a speculatively started agent run if its prompt turned out right.
+
+        Args:
+            agent_slots: Semaphore bounding agents running at once
+            agent: Agent that ran speculatively
+            speculative: Task running agent.aexecute(speculative_input)
+            speculative_input: Input the speculative run was started with
+            agent_input: Input the agent should actually run with
+            on_chunk: Streaming callback for the run that is used (optional)
+            speculative_chunks: Streaming callback of the speculative run
+                (required for on_chunk to see a speculative run's chunks)
+
+        Returns:
+            Agent output for agent_input
+        """
+        if agent.split_prompt(agent_input) == agent.split_prompt(speculative_input):
+            if on_chunk is not None and speculative_chunks is not None:
+                speculative_chunks.attach(on_chunk)
+            return await speculative
+
+        speculative.cancel()
+        return await cls._arun_agent(agent_slots, agent, agent_input, on_chunk)
+
+    def _store_result(self, result: WorkflowResult) -> WorkflowResult:
+        """
+        Append a result's phase outputs to the workflow store (if any).
+
+        A deferred Phase 3 output is appended once it completes, before
+        the result's prevention_future resolves.
+
+        Args:
+            result: Workflow result
+
+        Returns:
+            The same result
+        """
+        if self.store is None:
+            return result
+
+        store = self.store
+        workflow_id = store.new_workflow()
+        for output in (
+            result.narrative_output, result.analysis_output, result.prevention_output
+        ):
+            if output is not None:
+                store.add_output(workflow_id, output)
+
+        if result.prevention_future is not None:
+            # Done callbacks run after waiters wake up, so hand out a
+            # future that resolves only once the output is stored
+            stored: "Future[AgentOutput]" = Future()
+
+            def add_prevention(future: "Future[AgentOutput]") -> None:
+                try:
+                    output = future.result()
+                except BaseException as e:
+                    stored.set_exception(e)
+                    return
+                store.add_output(workflow_id, output)
+                stored.set_result(output)
+
+            result.prevention_future.add_done_callback(add_prevention)
+            result.prevention_future = stored
+
+        return result
+
+    def _record_timings(self, timings: Counter) -> Dict[str, float]:
+        """
+        Add a run's phase timings to the process-wide counters.
+
+        Args:
+            timings: Phase timings of one workflow run
+
+        Returns:
+            The run's timings, for WorkflowResult.diagnostics
+        """
+        COUNTERS.merge(timings)
+        COUNTERS.incr("workflows")
+        return timings.snapshot()
+
+    def _print_phase_header(self, title: str) -> None:
+        """Log the banner for a workflow phase."""
+        logger.info("\n%s\n%s\n%s", _BANNER_RULE, title, _BANNER_RULE)
 
     def _execute_phase_0(
         self,
@@ -185,17 +1038,27 @@ class WorkflowOrchestrator:
         tier: SecurityTier
     ) -> AgentOutput:
         """Execute Phase 0: Narrative Analysis"""
-        agent_input = AgentInput(
+        return self.narrative_agent.execute(
+            self._narrative_input(narrative, mode, tier)
+        )
+
+    def _narrative_input(
+        self,
+        narrative: str,
+        mode: ProblemMode,
+        tier: SecurityTier
+    ) -> AgentInput:
+        """Build the Phase 0 agent input."""
+        return AgentInput(
             mode=mode,
             security_tier=tier,
             context={"narrative": narrative}
         )
 
-        return self.narrative_agent.execute(agent_input)
-
     def _execute_phase_1(
         self,
         narrative_output: AgentOutput,
+        shared_context: Mapping[str, Any],
         mode: ProblemMode,
         tier: SecurityTier,
         answer_collector: Optional[Callable]
@@ -203,10 +1066,13 @@ class WorkflowOrchestrator:
         """
         Execute Phase 1: Clarification Questions
 
-        Generates mode-aware questions and collects user answers.
+        Generates mode-aware questions, printing each one as soon as the
+        model has generated it, then collects user answers.
 
         Args:
             narrative_output: Output from Phase 0
+            shared_context: Context shared by Phases 1-3
+                (see _narrative_context)
             mode: Problem-solving mode
             tier: Security tier
             answer_collector: Function to collect answers
@@ -217,54 +1083,196 @@ class WorkflowOrchestrator:
             - questions: [{question, rationale}, ...]
             - answers: {question: answer, ...}
         """
-        # Generate clarification questions
-        # Get urgency signals if available
-        urgency_signals = []
-        analysis_data = narrative_output.metadata.get("analysis", None)
-        if analysis_data and hasattr(analysis_data, "urgency_signals"):
-            urgency_signals = analysis_data.urgency_signals
-        elif isinstance(analysis_data, dict):
-            urgency_signals = analysis_data.get("urgency_signals", [])
+        # Generate clarification questions, showing them as they stream in
+        # (printed for the interactive CLI, logged otherwise)
+        stream = self.clarification_agent.execute_streaming(
+            self._clarification_input(narrative_output, shared_context, mode, tier)
+        )
+        show = _progress_output(answer_collector)
+
+        show("\nClarification questions:\n")
+        count = 0
+        while True:
+            try:
+                question = next(stream)
+            except StopIteration as stop:
+                clarification_output = stop.value
+                break
+            count += 1
+            show("%d. %s", count, question)
+
+        rationale = clarification_output.metadata.get("rationale", "")
+        show("\nWhy these matter: %s\n", rationale)
+
+        questions = self._clarification_questions(clarification_output)
+        return questions, self._collect_answers(questions, answer_collector)
+
+    def _clarification_input(
+        self,
+        narrative_output: AgentOutput,
+        shared_context: Mapping[str, Any],
+        mode: ProblemMode,
+        tier: SecurityTier
+    ) -> AgentInput:
+        """
+        Build the Phase 1 agent input from the Phase 0 output.
+
+        Does not set the "narrative_analysis" key the clarification
+        prompt reads, which the speculative Phase 1 run in
+        arun_workflow() relies on (see the note there).
+        """
+        analysis = NarrativeAnalysis.from_any(
+            narrative_output.metadata.get("analysis")
+        )
 
-        agent_input = AgentInput(
+        return AgentInput(
             mode=mode,
             security_tier=tier,
-            context={
-                "narrative": narrative_output.metadata.get("narrative", ""),
-                "observations": narrative_output.facts,
-                "interpretations": narrative_output.hypotheses,
-                "urgency_signals": urgency_signals
-            }
+            context=ChainMap(
+                {"urgency_signals": analysis.urgency_signals},
+                shared_context
+            )
         )
 
-        clarification_output = self.clarification_agent.execute(agent_input)
+    def _collect_clarifications(
+        self,
+        clarification_output: AgentOutput,
+        answer_collector: Optional[Callable]
+    ) -> tuple[List[Dict[str, str]], Dict[str, str]]:
+        """
+        Display generated clarification questions and collect answers.
 
-        # Parse questions from output
-        import json
-        try:
-            questions_data = json.loads(clarification_output.content)
-            questions = questions_data.get("questions", [])
-        except json.JSONDecodeError:
-            # Fallback if JSON parsing fails
-            print(
-                "Warning: Could not parse clarification questions. "
-                "Proceeding without them."
-            )
-            return [], {}
+        Args:
+            clarification_output: Output from the clarification agent
+            answer_collector: Function to collect answers
+                (None = use default CLI)
+
+        Returns:
+            (questions, answers) tuple (see _execute_phase_1)
+        """
+        questions = self._show_clarifications(clarification_output, answer_collector)
+        return questions, self._collect_answers(questions, answer_collector)
 
-        # Display questions
-        print(f"\n{len(questions)} clarification questions generated:\n")
+    def _show_clarifications(
+        self,
+        clarification_output: AgentOutput,
+        answer_collector: Optional[Callable]
+    ) -> List[Dict[str, str]]:
+        """
+        Display generated clarification questions.
+
+        Printed for the interactive CLI (answer_collector None), logged
+        otherwise.
+
+        Args:
+            clarification_output: Output from the clarification agent
+            answer_collector: Function to collect answers
+
+        Returns:
+            [{question, rationale}, ...]
+        """
+        questions = self._clarification_questions(clarification_output)
+
+        show = _progress_output(answer_collector)
+        show("\n%d clarification questions generated:\n", len(questions))
         for i, q in enumerate(questions, 1):
-            print(f"{i}. {q['question']}")
-            print(f"   Why this matters: {q['rationale']}\n")
+            show(
+                "%d. %s\n   Why this matters: %s\n",
+                i, q["question"], q["rationale"]
+            )
+
+        return questions
+
+    @staticmethod
+    def _clarification_questions(
+        clarification_output: AgentOutput
+    ) -> List[Dict[str, str]]:
+        """
+        Get the generated questions as {question, rationale} dicts.
+
+        Args:
+            clarification_output: Output from the clarification agent
+
+        Returns:
+            [{question, rationale}, ...]
+        """
+        rationale = clarification_output.metadata.get("rationale", "")
+        return [
+            q if isinstance(q, dict) else {"question": str(q), "rationale": rationale}
+            for q in clarification_output.metadata.get("questions", [])
+        ]
 
-        # Collect answers
+    def _collect_answers(
+        self,
+        questions: List[Dict[str, str]],
+        answer_collector: Optional[Callable]
+    ) -> Dict[str, str]:
+        """
+        Collect answers with answer_collector (None = use default CLI).
+
+        Args:
+            questions: [{question, rationale}, ...]
+            answer_collector: Function to collect answers; may be async
+                (e.g. from gather_answers()), in which case it is run to
+                completion on a new event loop
+
+        Returns:
+            Dict mapping questions to answers
+
+        Raises:
+            RuntimeError: If answer_collector is async and an event loop
+                is already running in this thread (use arun_workflow())
+        """
         if answer_collector:
             answers = answer_collector(questions)
+            if inspect.isawaitable(answers):
+                try:
+                    asyncio.get_running_loop()
+                except RuntimeError:
+                    answers = asyncio.run(_await(answers))
+                else:
+                    if inspect.iscoroutine(answers):
+                        answers.close()  # Never awaited; avoids a warning
+                    raise RuntimeError(
+                        "An async answer_collector cannot be run from inside "
+                        "a running event loop; await arun_workflow() instead"
+                    )
         else:
             answers = self._default_answer_collector(questions)
 
-        return questions, answers
+        return answers
+
+    async def _acollect_answers(
+        self,
+        questions: List[Dict[str, str]],
+        answer_collector: Optional[Callable]
+    ) -> Dict[str, str]:
+        """
+        Collect answers without blocking the event loop.
+
+        Async collectors (and awaitables returned by sync callables, e.g.
+        a lambda around a coroutine function) are awaited on the running
+        loop, alongside any sessions the caller opened on it; blocking
+        collectors, including the default CLI, run in a worker thread.
+
+        Args:
+            questions: [{question, rationale}, ...]
+            answer_collector: Function to collect answers
+
+        Returns:
+            Dict mapping questions to answers
+        """
+        if answer_collector is None:
+            return await asyncio.to_thread(self._default_answer_collector, questions)
+
+        if inspect.iscoroutinefunction(answer_collector):
+            answers = answer_collector(questions)
+        else:
+            answers = await asyncio.to_thread(answer_collector, questions)
+
+        if inspect.isawaitable(answers):
+            answers = await answers
+        return answers
 
     def _default_answer_collector(
         self, questions: List[Dict[str, str]]
@@ -272,42 +1280,52 @@ class WorkflowOrchestrator:
         """
         Default CLI-based answer collection.
 
+        Lists all questions up front, then reads one answer per question
+        (with line editing if prompt_toolkit is installed). When stdin is
+        not a terminal, the rest of it is read as one answer per line.
+        The CLI reads its narrative from stdin until EOF, so it takes
+        non-interactive answers from a file instead (see
+        answers_from_file()).
+
         Args:
             questions: List of question dicts
 
         Returns:
             Dict mapping questions to answers
         """
-        print("\n" + "=" * 80)
-        print("Please answer the following questions:")
-        print(
+        total = len(questions)
+        header = [
+            "\n" + "=" * 80 + "\n",
+            "Please answer the following questions:\n",
             "(Type your answer and press Enter. "
-            "Type 'skip' to skip a question.)"
-        )
-        print("=" * 80 + "\n")
-
-        answers = {}
-
+            "Type 'skip' to skip a question.)\n",
+            "=" * 80 + "\n\n"
+        ]
         for i, q in enumerate(questions, 1):
-            print(f"\nQuestion {i}/{len(questions)}:")
-            print(f"{q['question']}")
-            print(f"(Rationale: {q['rationale']})")
-            print()
+            header.append(f"Q{i}. {q['question']}\n    (Rationale: {q['rationale']})\n")
+        sys.stdout.write("".join(header))
+        sys.stdout.flush()
 
-            answer = input("Your answer: ").strip()
+        if not sys.stdin.isatty():
+            replies = sys.stdin.read().splitlines()
+        else:
+            # One session for all questions (shared history and editing state)
+            prompt = PromptSession().prompt if PromptSession is not None else input
+            replies = (
+                prompt(f"\nQ{i}/{total}: {q['question']}\n> ")
+                for i, q in enumerate(questions, 1)
+            )
 
-            if answer.lower() != 'skip' and answer:
-                answers[q['question']] = answer
-            else:
-                print("(Skipped)")
+        answers = _answers_from_replies(questions, replies)
 
-        print(f"\n{len(answers)}/{len(questions)} questions answered.\n")
+        logger.info("%d/%d questions answered.", len(answers), total)
 
         return answers
 
     def _execute_phase_2(
         self,
         narrative_output: AgentOutput,
+        shared_context: Mapping[str, Any],
         clarification_answers: Dict[str, str],
         mode: ProblemMode,
         tier: SecurityTier
@@ -317,52 +1335,45 @@ class WorkflowOrchestrator:
 
         Passes rich context from Phases 0-1.
         """
-        # Extract analysis data safely
-        analysis_data = narrative_output.metadata.get("analysis", None)
-        urgency_signals = []
-        constraints = []
-        data_sources = []
-
-        if analysis_data:
-            if hasattr(analysis_data, "urgency_signals"):
-                urgency_signals = analysis_data.urgency_signals
-            elif isinstance(analysis_data, dict):
-                urgency_signals = analysis_data.get("urgency_signals", [])
-
-            if hasattr(analysis_data, "constraints"):
-                constraints = analysis_data.constraints
-            elif isinstance(analysis_data, dict):
-                constraints = analysis_data.get("constraints", [])
-
-            if hasattr(analysis_data, "data_sources_mentioned"):
-                data_sources = analysis_data.data_sources_mentioned
-            elif isinstance(analysis_data, dict):
-                data_sources = analysis_data.get("data_sources_mentioned", [])
-
-        # Build comprehensive context
-        context = {
-            "narrative": narrative_output.metadata.get("narrative", ""),
-            "observations": narrative_output.facts,
-            "interpretations": narrative_output.hypotheses,
+        return self.analysis_agent.execute(
+            self._analysis_input(
+                narrative_output, shared_context, clarification_answers,
+                mode, tier
+            )
+        )
+
+    def _analysis_input(
+        self,
+        narrative_output: AgentOutput,
+        shared_context: Mapping[str, Any],
+        clarification_answers: Dict[str, str],
+        mode: ProblemMode,
+        tier: SecurityTier
+    ) -> AgentInput:
+        """Build the Phase 2 agent input from the Phase 0-1 results."""
+        analysis = NarrativeAnalysis.from_any(
+            narrative_output.metadata.get("analysis")
+        )
+
+        # Build comprehensive context over the shared Phase 0 context
+        context = ChainMap({
             "suspected_causes": narrative_output.hypotheses,
             "clarifications": clarification_answers,
-            "urgency_signals": urgency_signals,
-            "constraints": constraints,
-            "data_sources": data_sources
-        }
+            "urgency_signals": analysis.urgency_signals,
+            "constraints": analysis.constraints,
+            "data_sources": analysis.data_sources_mentioned
+        }, shared_context)
 
-        agent_input = AgentInput(
+        return AgentInput(
             mode=mode,
             security_tier=tier,
             context=context
         )
 
-        return self.analysis_agent.execute(agent_input)
-
     def _execute_phase_3(
         self,
         analysis_output: AgentOutput,
-        narrative_output: AgentOutput,
+        shared_context: Mapping[str, Any],
         mode: ProblemMode,
         tier: SecurityTier
     ) -> AgentOutput:
@@ -371,12 +1382,23 @@ class WorkflowOrchestrator:
 
         Passes rich context from Phase 2 analysis.
         """
-        # Extract 8D analysis from metadata
-        eight_d_analysis = analysis_output.metadata.get("eight_d_mapping", {})
+        return self.prevention_agent.execute(
+            self._prevention_input(analysis_output, shared_context, mode, tier)
+        )
 
-        # Build comprehensive context
-        context = {
-            "narrative": narrative_output.metadata.get("narrative", ""),
+    def _prevention_input(
+        self,
+        analysis_output: AgentOutput,
+        shared_context: Mapping[str, Any],
+        mode: ProblemMode,
+        tier: SecurityTier
+    ) -> AgentInput:
+        """Build the Phase 3 agent input from the Phase 0 and 2 outputs."""
+        # Extract the 8D findings Phase 3 builds on
+        eight_d_analysis = _eight_d_mapping(analysis_output.metadata.get("report"))
+
+        # Build comprehensive context over the shared Phase 0 context
+        context = ChainMap({
             "analysis": eight_d_analysis,
             "root_causes": eight_d_analysis.get("D4_root_cause_analysis", []),
             "containment_actions": eight_d_analysis.get("D3_containment", []),
@@ -385,13 +1407,11 @@ class WorkflowOrchestrator:
             ),
             "facts": analysis_output.facts,
             "hypotheses": analysis_output.hypotheses,
-            "gaps_identified": eight_d_analysis.get("gaps", [])
-        }
+            "gaps_identified": list(analysis_output.open_questions)
+        }, shared_context)
 
-        agent_input = AgentInput(
+        return AgentInput(
             mode=mode,
             security_tier=tier,
             context=context
         )
-
-        return self.prevention_agent.execute(agent_input)
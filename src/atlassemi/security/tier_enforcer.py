@@ -4,8 +4,9 @@ Security Tier Enforcement
 HARD enforcement of security tiers - blocks (not just warns) tier violations.
 """
 
+import functools
 from enum import Enum
-from typing import Dict, List, Optional, Set
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 from dataclasses import dataclass
 import logging
 
@@ -28,6 +29,36 @@ class ToolCategory(Enum):
     KNOWLEDGE_GRAPH = "knowledge_graph"  # Internal knowledge base
 
 
+# Lines per violation in get_violations_summary(), including the blank one
+_SUMMARY_LINES_PER_VIOLATION = 7
+
+
+def _allowed_tools(
+    tool_categories: Dict[str, ToolCategory],
+    tier_permissions: Dict[SecurityTier, Set[ToolCategory]]
+) -> Dict[SecurityTier, Tuple[FrozenSet[str], Tuple[str, ...]]]:
+    """
+    Precompute the tool names allowed in each tier.
+
+    Args:
+        tool_categories: Tool name -> category
+        tier_permissions: Tier -> allowed categories
+
+    Returns:
+        Tier -> (allowed tool names, the same names sorted)
+    """
+    allowed = {}
+    for tier in SecurityTier:
+        categories = tier_permissions.get(tier, set())
+        names = frozenset(
+            tool_name
+            for tool_name, category in tool_categories.items()
+            if category in categories
+        )
+        allowed[tier] = (names, tuple(sorted(names)))
+    return allowed
+
+
 @dataclass
 class TierViolation:
     """Represents a security tier violation."""
@@ -91,15 +122,49 @@ class TierEnforcer:
         },
     }
 
+    # Violation suggestions by (current tier, tool category); {tool_name}
+    # is filled in per violation
+    _SUGGESTION_TEMPLATES: Dict[Tuple[SecurityTier, ToolCategory], str] = {
+        (SecurityTier.CONFIDENTIAL_FAB, ToolCategory.EXTERNAL_API):
+            "Use factory_genai API instead of {tool_name}",
+
+        (SecurityTier.TOP_SECRET, ToolCategory.EXTERNAL_API):
+            "Use onprem_llm instead of {tool_name}",
+
+        (SecurityTier.TOP_SECRET, ToolCategory.FACTORY_API):
+            "Factory APIs not available in Top Secret tier. Use onprem_llm.",
+
+        (SecurityTier.GENERAL_LLM, ToolCategory.FACTORY_API):
+            "Factory APIs require Confidential tier or higher",
+
+        (SecurityTier.GENERAL_LLM, ToolCategory.ONPREM_API):
+            "On-prem APIs require Top Secret tier",
+    }
+
+    # Tier -> (allowed tool names, sorted), built once from the tables
+    # above (fast path of validate_tool_use)
+    _ALLOWED_TOOLS = _allowed_tools(TOOL_CATEGORIES, TIER_PERMISSIONS)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Subclasses may override the tool or permission tables
+        cls._ALLOWED_TOOLS = _allowed_tools(cls.TOOL_CATEGORIES, cls.TIER_PERMISSIONS)
+
     def __init__(self, current_tier: SecurityTier):
         """
         Initialize tier enforcer.
 
         Args:
-            current_tier: Current security tier for this session
+            current_tier: Current security tier for this session (any
+                enum with SecurityTier values, e.g. agents.base.SecurityTier)
         """
-        self.current_tier = current_tier
+        # Normalize by value: a same-valued enum from another module
+        # would otherwise match no TIER_PERMISSIONS key
+        self.current_tier = SecurityTier(getattr(current_tier, "value", current_tier))
         self.violations: List[TierViolation] = []
+        self._allowed_tool_names, self._sorted_allowed = (
+            self._ALLOWED_TOOLS[self.current_tier]
+        )
 
     def validate_tool_use(self, tool_name: str) -> bool:
         """
@@ -114,6 +179,9 @@ class TierEnforcer:
         Raises:
             SecurityViolationError: If tool use would violate tier
         """
+        if tool_name in self._allowed_tool_names:
+            return True
+
         # Get tool category
         category = self.TOOL_CATEGORIES.get(tool_name)
 
@@ -122,23 +190,18 @@ class TierEnforcer:
             logger.warning(f"Unknown tool '{tool_name}' - defaulting to BLOCK")
             return False
 
-        # Check if category is allowed in current tier
-        allowed_categories = self.TIER_PERMISSIONS.get(self.current_tier, set())
-
-        if category not in allowed_categories:
-            violation = self._create_violation(tool_name, category)
-            self.violations.append(violation)
-
-            # Log violation
-            logger.error(
-                f"SECURITY VIOLATION: Tool '{tool_name}' (category: {category.value}) "
-                f"not allowed in tier {self.current_tier.name}"
-            )
+        # Known but not allowed in current tier
+        violation = self._create_violation(tool_name, category)
+        self.violations.append(violation)
 
-            # BLOCK
-            raise SecurityViolationError(violation)
+        # Log violation
+        logger.error(
+            f"SECURITY VIOLATION: Tool '{tool_name}' (category: {category.value}) "
+            f"not allowed in tier {self.current_tier.name}"
+        )
 
-        return True
+        # BLOCK
+        raise SecurityViolationError(violation)
 
     def _create_violation(
         self,
@@ -155,27 +218,13 @@ class TierEnforcer:
         Returns:
             TierViolation with details
         """
-        suggestions = {
-            (SecurityTier.CONFIDENTIAL_FAB, ToolCategory.EXTERNAL_API):
-                f"Use factory_genai API instead of {tool_name}",
-
-            (SecurityTier.TOP_SECRET, ToolCategory.EXTERNAL_API):
-                f"Use onprem_llm instead of {tool_name}",
-
-            (SecurityTier.TOP_SECRET, ToolCategory.FACTORY_API):
-                f"Factory APIs not available in Top Secret tier. Use onprem_llm.",
-
-            (SecurityTier.GENERAL_LLM, ToolCategory.FACTORY_API):
-                f"Factory APIs require Confidential tier or higher",
-
-            (SecurityTier.GENERAL_LLM, ToolCategory.ONPREM_API):
-                f"On-prem APIs require Top Secret tier",
-        }
-
-        suggestion = suggestions.get(
-            (self.current_tier, category),
-            f"Tool '{tool_name}' not available in {self.current_tier.name} tier"
-        )
+        template = self._SUGGESTION_TEMPLATES.get((self.current_tier, category))
+        if template is not None:
+            suggestion = template.format(tool_name=tool_name)
+        else:
+            suggestion = (
+                f"Tool '{tool_name}' not available in {self.current_tier.name} tier"
+            )
 
         return TierViolation(
             tool_name=tool_name,
@@ -185,7 +234,9 @@ class TierEnforcer:
             suggestion=suggestion
         )
 
-    def _get_required_tier(self, category: ToolCategory) -> SecurityTier:
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_required_tier(category: ToolCategory) -> SecurityTier:
         """
         Get minimum required tier for a tool category.
 
@@ -211,15 +262,7 @@ class TierEnforcer:
         Returns:
             List of tool names
         """
-        allowed_categories = self.TIER_PERMISSIONS.get(self.current_tier, set())
-
-        allowed_tools = [
-            tool_name
-            for tool_name, category in self.TOOL_CATEGORIES.items()
-            if category in allowed_categories
-        ]
-
-        return sorted(allowed_tools)
+        return list(self._sorted_allowed)
 
     def get_violations_summary(self) -> str:
         """
@@ -231,23 +274,20 @@ class TierEnforcer:
         if not self.violations:
             return "No security violations in this session."
 
-        lines = [
-            f"# Security Violations ({len(self.violations)})",
-            "",
-            f"Current Tier: {self.current_tier.name}",
-            ""
-        ]
-
-        for i, violation in enumerate(self.violations, 1):
-            lines.extend([
-                f"## Violation {i}",
-                f"- **Tool:** {violation.tool_name}",
-                f"- **Current Tier:** {violation.current_tier.name}",
-                f"- **Required Tier:** {violation.required_tier.name}",
-                f"- **Reason:** {violation.reason}",
-                f"- **Suggestion:** {violation.suggestion}",
-                ""
-            ])
+        # Preallocated: header, then a fixed block of lines per violation
+        lines = [""] * (4 + _SUMMARY_LINES_PER_VIOLATION * len(self.violations))
+        lines[0] = f"# Security Violations ({len(self.violations)})"
+        lines[2] = "Current Tier: " + self.current_tier.name
+
+        for i, violation in enumerate(self.violations):
+            base = 4 + _SUMMARY_LINES_PER_VIOLATION * i
+            lines[base] = f"## Violation {i + 1}"
+            lines[base + 1] = "- **Tool:** " + violation.tool_name
+            lines[base + 2] = "- **Current Tier:** " + violation.current_tier.name
+            lines[base + 3] = "- **Required Tier:** " + violation.required_tier.name
+            lines[base + 4] = "- **Reason:** " + violation.reason
+            lines[base + 5] = "- **Suggestion:** " + violation.suggestion
+            # lines[base + 6] stays "" (blank line between violations)
 
         return "\n".join(lines)
 
@@ -0,0 +1,10 @@
+"""Telemetry module for ATLASsemi."""
+
+from .counters import COUNTERS, Counter
+from .logs import start_queue_logging
+
+__all__ = [
+    "COUNTERS",
+    "Counter",
+    "start_queue_logging"
+]
@@ -0,0 +1,129 @@
+"""
+Performance Counters for ATLASsemi
+
+Lightweight named counters (phase latencies, token counts, cost) that
+attribute where a workflow spends time and money. The process-wide
+COUNTERS are dumped as JSON at interpreter exit, to the file named by
+ATLASSEMI_COUNTERS_FILE if set, otherwise to the log.
+"""
+
+import atexit
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class Counter:
+    """
+    Thread-safe set of named float counters.
+
+    Keys are free-form; by convention "<what>_ms" for latencies,
+    "<agent>_tokens_in"/"<agent>_tokens_out" for token counts.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, float] = {}
+        self._lap_start = time.perf_counter()
+
+    def incr(self, key: str, value: float = 1.0) -> None:
+        """
+        Add value to a counter (created at 0 on first use).
+
+        Args:
+            key: Counter name
+            value: Amount to add
+        """
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    @contextlib.contextmanager
+    def time(self, key: str) -> Iterator[None]:
+        """
+        Add the milliseconds spent in the with-block to a counter.
+
+        Args:
+            key: Counter name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.incr(key, (time.perf_counter() - start) * 1000.0)
+
+    def lap(self, key: str) -> None:
+        """
+        Add the milliseconds since the previous lap to a counter.
+
+        The first lap is measured from when the Counter was created, so
+        a fresh Counter times consecutive steps with one call after each.
+
+        Args:
+            key: Counter name
+        """
+        now = time.perf_counter()
+        with self._lock:
+            elapsed_ms = (now - self._lap_start) * 1000.0
+            self._lap_start = now
+        self.incr(key, elapsed_ms)
+
+    def merge(self, other: "Counter") -> None:
+        """
+        Add all of another Counter's values to this one.
+
+        Args:
+            other: Counter to add
+        """
+        for key, value in other.snapshot().items():
+            self.incr(key, value)
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Get a copy of the current values.
+
+        Returns:
+            Dict mapping counter name to value
+        """
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self._values.clear()
+            self._lap_start = time.perf_counter()
+
+    def dump(self) -> None:
+        """
+        Write the counters as JSON.
+
+        Goes to the file named by ATLASSEMI_COUNTERS_FILE if set,
+        otherwise to the log at INFO level. Nothing is written while all
+        counters are empty.
+        """
+        values = self.snapshot()
+        if not values:
+            return
+
+        text = json.dumps(values, indent=2, sort_keys=True)
+        path = os.getenv("ATLASSEMI_COUNTERS_FILE")
+        if path:
+            try:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                return
+            except OSError as e:
+                logger.warning("Could not write counters to %s: %s", path, e)
+
+        logger.info("Performance counters:\n%s", text)
+
+
+# Process-wide counters, dumped at interpreter exit
+COUNTERS = Counter()
+atexit.register(COUNTERS.dump)
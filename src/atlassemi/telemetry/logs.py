@@ -0,0 +1,48 @@
+"""
+Non-blocking Log Output for ATLASsemi
+
+Routes the package's log records through a queue to a background
+thread, so emitting a record never waits on console or file I/O. Meant
+for embedding the orchestrator in a service; the interactive CLI logs
+to the console directly to keep output in order with its prompts.
+"""
+
+import logging
+import logging.handlers
+import queue
+
+
+def start_queue_logging(
+    *handlers: logging.Handler,
+    logger_name: str = "atlassemi",
+    level: int = logging.INFO
+) -> logging.handlers.QueueListener:
+    """
+    Send a logger's records to handlers through a background thread.
+
+    Example:
+        listener = start_queue_logging(
+            logging.handlers.RotatingFileHandler("atlassemi.log", maxBytes=10**7)
+        )
+        ...
+        listener.stop()  # Flushes queued records
+
+    Args:
+        *handlers: Handlers that do the actual output
+        logger_name: Logger to attach to (and its children)
+        level: Minimum level to log
+
+    Returns:
+        Started QueueListener; call stop() at shutdown
+    """
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+
+    logger = logging.getLogger(logger_name)
+    logger.addHandler(logging.handlers.QueueHandler(records))
+    logger.setLevel(level)
+
+    listener = logging.handlers.QueueListener(
+        records, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    return listener
@@ -81,3 +81,51 @@ def test_clarification_agent_mode_specific_questions():
         "when" in excursion_prompt.lower() or
         "what changed" in excursion_prompt.lower()
     )
+
+
+def test_process_clarification_answers():
+    """Test answers are paired with their questions."""
+    from atlassemi.agents.clarification_agent import process_clarification_answers
+
+    result = process_clarification_answers(["When?", "Where?"], ["Monday", "Bay 3"])
+
+    assert result["count"] == 2
+    assert result["clarifications"]["Q2"] == {"question": "Where?", "answer": "Bay 3"}
+
+    # Skipped questions leave fewer answers than questions
+    partial = process_clarification_answers(["When?", "Where?"], ["Monday"])
+    assert partial["count"] == 2
+    assert list(partial["clarifications"]) == ["Q1"]
+
+
+def test_clarification_agent_streams_questions():
+    """Test questions are yielded as soon as they are complete."""
+    from atlassemi.config import ModelConfig
+
+    agent = ClarificationAgent(model_router=None)
+    response = json.dumps({
+        "questions": ["When did it start?", "Which chamber?"],
+        "rationale": "Scope the excursion"
+    })
+    seen = []
+
+    class StreamingClient:
+        config = ModelConfig(provider="onprem", model_id="test", max_tokens=100)
+
+        def generate_stream(self, prompt, **kwargs):
+            for i in range(0, len(response), 7):
+                seen.append(response[i:i + 7])
+                yield response[i:i + 7]
+            return 10, 5
+
+    agent._get_client = lambda agent_input: StreamingClient()
+    agent_input = AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": "Test"}
+    )
+
+    stream = agent.execute_streaming(agent_input)
+    assert next(stream) == "When did it start?"
+    assert len("".join(seen)) < len(response)  # Before the stream finished
+    assert list(stream) == ["Which chamber?"]
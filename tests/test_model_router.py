@@ -54,6 +54,17 @@ def test_model_router_tier_enforcement():
     assert tier3_config.provider == "onprem"
 
 
+def test_model_router_rejects_unknown_task_type():
+    """Test an invalid task type is reported as such."""
+    router = ModelRouter(mode=RuntimeMode.DEV)
+
+    with pytest.raises(ValueError, match="Unknown task_type 'summarize'"):
+        router.get_model_config("summarize", SecurityTier.GENERAL_LLM)
+
+    with pytest.raises(ValueError, match="No model configured"):
+        router.get_model_config("fast", 4)
+
+
 def test_model_router_cost_tracking():
     """Test model router tracks costs correctly."""
     router = ModelRouter(mode=RuntimeMode.DEV)
@@ -71,3 +82,418 @@ def test_model_router_cost_tracking():
 
     # Cost should be updated
     assert router.usage_stats["total_cost_usd"] == 0.01
+
+
+def test_model_router_usage_summary_refreshes():
+    """Test usage summary reflects usage tracked after a previous call."""
+    router = ModelRouter(mode=RuntimeMode.DEV)
+
+    assert "reasoning" not in router.get_usage_summary()
+
+    router.track_usage(
+        task_type="reasoning",
+        input_tokens=1234,
+        output_tokens=50,
+        cost_usd=0.01
+    )
+
+    summary = router.get_usage_summary()
+    assert "### reasoning" in summary
+    assert "1,234" in summary
+    assert router.get_usage_summary() is summary
+
+
+def test_model_router_shares_http_client():
+    """Test provider clients share the router's HTTP client."""
+    shared = object()
+    router = ModelRouter(mode=RuntimeMode.DEV, http_client=shared)
+
+    reasoning = router.get_model_client("reasoning", SecurityTier.GENERAL_LLM)
+    fast = router.get_model_client("fast", SecurityTier.GENERAL_LLM)
+
+    assert reasoning.http_client is shared
+    assert fast.http_client is shared
+
+    # Caller-owned clients are left open
+    router.close()
+    assert router.http_client is shared
+
+
+def test_model_router_pools_clients():
+    """Test clients are reused per model config until close()."""
+    router = ModelRouter(mode=RuntimeMode.DEV)
+
+    fast = router.get_model_client("fast", SecurityTier.GENERAL_LLM)
+
+    assert router.get_model_client("fast", SecurityTier.GENERAL_LLM) is fast
+    assert router.get_model_client("reasoning", SecurityTier.GENERAL_LLM) is not fast
+
+    router.close()
+    assert router.get_model_client("fast", SecurityTier.GENERAL_LLM) is not fast
+
+
+def test_model_router_closes_as_context_manager():
+    """Test leaving a with block drops the pooled clients."""
+    with ModelRouter(mode=RuntimeMode.DEV) as router:
+        fast = router.get_model_client("fast", SecurityTier.GENERAL_LLM)
+        assert router.get_model_client("fast", SecurityTier.GENERAL_LLM) is fast
+
+    assert router.get_model_client("fast", SecurityTier.GENERAL_LLM) is not fast
+
+
+def test_model_router_close_releases_pooled_agents():
+    """Test orchestrators share a router's agents until it is closed."""
+    from atlassemi.orchestrator import WorkflowOrchestrator
+
+    router = ModelRouter(mode=RuntimeMode.DEV)
+    agent = WorkflowOrchestrator(model_router=router).narrative_agent
+    assert WorkflowOrchestrator(model_router=router).narrative_agent is agent
+
+    router.close()
+    assert WorkflowOrchestrator(model_router=router).narrative_agent is not agent
+
+
+def test_model_config_cost_per_token():
+    """Test per-token integer prices match the per-1k prices."""
+    from atlassemi.agents import AnalysisAgent
+    from atlassemi.config import ModelConfig
+
+    config = ModelConfig(
+        provider="anthropic",
+        model_id="test-model",
+        max_tokens=1000,
+        cost_per_1k_input=0.003,
+        cost_per_1k_output=0.015
+    )
+
+    assert config.cost_per_token_input_nano == 3000
+    assert config.cost_per_token_output_nano == 15000
+    assert AnalysisAgent()._calculate_cost(config, 1000, 2000) == pytest.approx(0.033)
+
+
+def test_anthropic_usage_counts_cached_input():
+    """Test cache reads and writes count as input, and reads bill at the cached rate."""
+    from types import SimpleNamespace
+    from atlassemi.agents import AnalysisAgent
+    from atlassemi.config import ModelConfig
+    from atlassemi.config.model_router import AnthropicClient, _anthropic_usage
+
+    usage = SimpleNamespace(
+        input_tokens=100,
+        output_tokens=50,
+        cache_read_input_tokens=800,
+        cache_creation_input_tokens=100
+    )
+    assert _anthropic_usage(usage) == (1000, 50, 800)
+
+    config = ModelConfig(
+        provider="anthropic",
+        model_id="test-model",
+        max_tokens=1000,
+        cost_per_1k_input=0.003,
+        cost_per_1k_output=0.015
+    )
+    cost = AnalysisAgent()._calculate_cost(
+        config, 1000, 0, 800, AnthropicClient.cached_input_cost_factor
+    )
+    # 200 uncached + 800 cached at 10% = 280 full-price input tokens
+    assert cost == pytest.approx(280 * 0.003 / 1000)
+
+
+def test_model_config_is_immutable():
+    """Test shared model configs cannot be changed in place."""
+    import dataclasses
+
+    router = ModelRouter(mode=RuntimeMode.DEV)
+    config = router.get_model_config("fast", SecurityTier.GENERAL_LLM)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.max_tokens = 1
+
+
+def test_anthropic_system_prompt_is_cacheable():
+    """Test the Anthropic system block carries a cache breakpoint."""
+    from atlassemi.config.model_router import _anthropic_system
+
+    assert _anthropic_system(None) == ""
+    assert _anthropic_system("Static") == [{
+        "type": "text",
+        "text": "Static",
+        "cache_control": {"type": "ephemeral"}
+    }]
+
+
+def test_openai_cache_key_follows_system_prompt():
+    """Test calls sharing a system prompt share an OpenAI cache key."""
+    from atlassemi.config.model_router import _openai_cache_kwargs
+
+    assert _openai_cache_kwargs(None) == {}
+    key = _openai_cache_kwargs("Static")["extra_body"]["prompt_cache_key"]
+    assert key == _openai_cache_kwargs("Static")["extra_body"]["prompt_cache_key"]
+    assert key != _openai_cache_kwargs("Other")["extra_body"]["prompt_cache_key"]
+
+
+def test_model_router_ainvoke_batches_concurrent_requests():
+    """Test concurrent ainvoke() calls for one model share a batch."""
+    import asyncio
+    from atlassemi.config import ModelClient, ModelConfig
+
+    batches = []
+
+    class BatchingClient(ModelClient):
+        async def agenerate_batch(self, requests):
+            batches.append(len(requests))
+            return [(f"echo {prompt}", 1, 2) for prompt, *_ in requests]
+
+    client = BatchingClient(
+        ModelConfig(provider="onprem", model_id="test-model", max_tokens=100),
+        api_key=""
+    )
+    router = ModelRouter(mode=RuntimeMode.DEV)
+    router.get_model_client = lambda task_type, tier: client
+
+    async def run():
+        return await asyncio.gather(*(
+            router.ainvoke(f"p{i}", "fast", SecurityTier.TOP_SECRET)
+            for i in range(3)
+        ))
+
+    results = asyncio.run(run())
+
+    assert [r[0] for r in results] == ["echo p0", "echo p1", "echo p2"]
+    assert batches == [3]
+
+
+def test_response_schema_provider_kwargs():
+    """Test response schemas map to each provider's constrained decoding."""
+    from atlassemi.config.model_router import (
+        RESPONSE_TOOL_NAME,
+        _anthropic_tool_kwargs,
+        _openai_response_format
+    )
+
+    schema = {"type": "object", "properties": {}}
+
+    assert _anthropic_tool_kwargs(None) == {}
+    tool_kwargs = _anthropic_tool_kwargs(schema)
+    assert tool_kwargs["tools"][0]["input_schema"] == schema
+    assert tool_kwargs["tool_choice"] == {"type": "tool", "name": RESPONSE_TOOL_NAME}
+
+    assert _openai_response_format(None) == {}
+    json_schema = _openai_response_format(schema)["response_format"]["json_schema"]
+    assert json_schema["schema"] == schema
+    assert json_schema["strict"] is True
+
+
+def test_anthropic_streams_schema_responses():
+    """Test forced tool call input streams chunk by chunk, sync and async."""
+    import asyncio
+    import json
+    from types import SimpleNamespace
+    from atlassemi.config import ModelConfig
+    from atlassemi.config.model_router import AnthropicClient, RESPONSE_TOOL_NAME
+
+    partials = ['{"questions": [', '{"question": "Which lot?"}', ']}']
+    log = []
+    params = []
+
+    def events():
+        yield SimpleNamespace(type="message_start")
+        for partial in partials:
+            log.append("event")
+            yield SimpleNamespace(
+                type="content_block_delta",
+                delta=SimpleNamespace(type="input_json_delta", partial_json=partial)
+            )
+
+    final = SimpleNamespace(usage=SimpleNamespace(input_tokens=10, output_tokens=5))
+
+    class Stream:
+        def __init__(self):
+            self.events = events()
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def __iter__(self):
+            return self.events
+
+        async def __aiter__(self):
+            for event in self.events:
+                yield event
+
+        def get_final_message(self):
+            return final
+
+    class AsyncStream(Stream):
+        async def get_final_message(self):
+            return final
+
+    def stream(stream_type):
+        def open_stream(**kwargs):
+            params.append(kwargs)
+            return stream_type()
+        return SimpleNamespace(messages=SimpleNamespace(stream=open_stream))
+
+    client = AnthropicClient(
+        ModelConfig(provider="anthropic", model_id="test-model", max_tokens=100),
+        api_key="test-key"
+    )
+    client._sdk_client = stream(Stream)
+    client._create_async_client = lambda http_client: stream(AsyncStream)
+    schema = {"type": "object", "properties": {}}
+
+    chunks = []
+    for chunk in client.generate_stream("Prompt", response_schema=schema):
+        log.append("chunk")
+        chunks.append(chunk)
+
+    assert chunks == partials
+    assert log == ["event", "chunk"] * 3
+    assert json.loads("".join(chunks)) == {"questions": [{"question": "Which lot?"}]}
+    assert params[0]["tool_choice"] == {"type": "tool", "name": RESPONSE_TOOL_NAME}
+
+    async def collect():
+        return [item async for item in client.agenerate_stream(
+            "Prompt", response_schema=schema
+        )]
+
+    assert asyncio.run(collect()) == [(p, None) for p in partials] + [(None, (10, 5, 0))]
+
+
+def test_provider_sdk_client_is_reused(monkeypatch):
+    """Test the SDK client is created once per model client."""
+    from types import SimpleNamespace
+    from atlassemi.config import ModelConfig
+    from atlassemi.config import model_router
+    from atlassemi.config.model_router import AnthropicClient
+
+    created = []
+    fake_sdk = SimpleNamespace(Anthropic=lambda **kwargs: created.append(kwargs) or object())
+    monkeypatch.setattr(model_router, "_import_sdk", lambda name: fake_sdk)
+
+    client = AnthropicClient(
+        ModelConfig(provider="anthropic", model_id="test-model", max_tokens=100),
+        api_key="test-key"
+    )
+
+    assert client._client() is client._client()
+    assert len(created) == 1
+
+
+def test_openai_generate_batch_uses_batch_api(monkeypatch):
+    """Test generate_batch() submits one Batch API job and maps results back."""
+    import json
+    from types import SimpleNamespace
+    from atlassemi.config import ModelConfig
+    from atlassemi.config import model_router
+    from atlassemi.config.model_router import OpenAIClient
+
+    monkeypatch.setattr(model_router, "BATCH_POLL_INITIAL_S", 0)
+    uploaded = []
+    statuses = iter(["in_progress", "completed"])
+
+    def output_line(custom_id, text):
+        return json.dumps({
+            "custom_id": custom_id,
+            "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"content": text}}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5}
+            }},
+            "error": None
+        })
+
+    sdk = SimpleNamespace(
+        files=SimpleNamespace(
+            create=lambda file, purpose: uploaded.append(file[1]) or SimpleNamespace(id="file-in"),
+            content=lambda file_id: SimpleNamespace(
+                text=output_line("1", "second") + "\n" + output_line("0", "first")
+            )
+        ),
+        batches=SimpleNamespace(
+            create=lambda **kwargs: SimpleNamespace(id="batch-1"),
+            retrieve=lambda batch_id: SimpleNamespace(
+                id=batch_id, status=next(statuses), output_file_id="file-out"
+            )
+        )
+    )
+
+    client = OpenAIClient(
+        ModelConfig(provider="openai", model_id="test-model", max_tokens=100),
+        api_key="test-key"
+    )
+    client._sdk_client = sdk
+
+    results = client.generate_batch([
+        ("First", "Static", None, None),
+        ("Second", "Static", 50, None)
+    ])
+
+    assert results == [("first", 10, 5, 0), ("second", 10, 5, 0)]
+    lines = [json.loads(line) for line in uploaded[0].decode().splitlines()]
+    assert [line["body"]["max_tokens"] for line in lines] == [100, 50]
+    assert "prompt_cache_key" in lines[0]["body"]
+    assert client.batch_cost_factor == 0.5
+
+
+def test_openai_agenerate_stream_uses_async_sdk():
+    """Test agenerate_stream() streams deltas, then usage, on the event loop."""
+    import asyncio
+    from types import SimpleNamespace
+    from atlassemi.config import ModelConfig
+    from atlassemi.config.model_router import OpenAIClient
+
+    def chunk(text, usage=None):
+        return SimpleNamespace(
+            choices=[SimpleNamespace(delta=SimpleNamespace(content=text))] if text else [],
+            usage=usage
+        )
+
+    async def create(**kwargs):
+        assert kwargs["stream"] is True
+
+        async def stream():
+            yield chunk("Hel")
+            yield chunk("lo")
+            yield chunk(None, SimpleNamespace(
+                prompt_tokens=10,
+                completion_tokens=5,
+                prompt_tokens_details=SimpleNamespace(cached_tokens=8)
+            ))
+
+        return stream()
+
+    created = []
+    client = OpenAIClient(
+        ModelConfig(provider="openai", model_id="test-model", max_tokens=100),
+        api_key="test-key",
+        async_http_client=lambda: "shared-async-http"
+    )
+
+    def create_async_client(http_client):
+        created.append(http_client)
+        return SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+
+    client._create_async_client = create_async_client
+
+    async def collect():
+        first = [item async for item in client.agenerate_stream("Hi")]
+        second = [item async for item in client.agenerate_stream("Hi")]
+        return first, second
+
+    first, second = asyncio.run(collect())
+
+    assert first == [("Hel", None), ("lo", None), (None, (10, 5, 8))]
+    assert second == first
+    assert created == ["shared-async-http"]  # One SDK client per loop
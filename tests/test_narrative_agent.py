@@ -4,6 +4,7 @@ import pytest
 import json
 from atlassemi.agents import NarrativeAgent
 from atlassemi.agents.base import AgentInput, ProblemMode, SecurityTier
+from atlassemi.config import MockModelRouter
 
 
 def test_narrative_agent_basic_execution():
@@ -26,8 +27,6 @@ def test_narrative_agent_basic_execution():
 
 def test_narrative_agent_json_parsing():
     """Test narrative agent parses JSON response correctly."""
-    agent = NarrativeAgent(model_router=None)
-
     # Mock LLM response
     mock_response = json.dumps({
         "observations": [
@@ -45,7 +44,8 @@ def test_narrative_agent_json_parsing():
         "reflection": "Sounds like a post-PM excursion with time pressure"
     })
 
-    agent._call_llm = lambda **kwargs: mock_response
+    router = MockModelRouter({"reasoning": mock_response})
+    agent = NarrativeAgent(model_router=router)
 
     agent_input = AgentInput(
         mode=ProblemMode.EXCURSION,
@@ -55,6 +55,7 @@ def test_narrative_agent_json_parsing():
 
     output = agent.execute(agent_input)
 
+    assert len(router.usage) == 1
     assert len(output.facts) == 2
     assert "Yield dropped" in output.facts[0]
     assert len(output.hypotheses) == 1
@@ -117,3 +118,263 @@ def test_narrative_agent_mode_awareness():
         prompt = agent.generate_prompt(agent_input)
         # Prompt should contain mode-specific information
         assert len(prompt) > 0
+
+
+def test_extract_eight_d_mapping_matches_whole_words():
+    """Test 8D keywords match whole words (with inflections) only."""
+    agent = NarrativeAgent(model_router=None)
+
+    assert agent.extract_eight_d_mapping("Household threshold, latest lot") == []
+    assert agent.extract_eight_d_mapping(
+        "Teams fixed the SOP after the hold"
+    ) == ["D1", "D3", "D5", "D7"]
+
+
+def test_narrative_agent_sends_response_schema():
+    """Test the agent's response schema reaches schema-capable clients."""
+    from atlassemi.config import ModelConfig
+
+    agent = NarrativeAgent(model_router=None)
+    received = {}
+
+    class SchemaClient:
+        supports_response_schema = True
+        config = ModelConfig(provider="onprem", model_id="test", max_tokens=100)
+
+        def generate(self, prompt, **kwargs):
+            received.update(kwargs)
+            return json.dumps({"observations": ["Yield dropped"]}), 10, 5
+
+    agent._call_llm(prompt="Test", client=SchemaClient(), max_tokens=100)
+
+    schema = received["response_schema"]
+    assert schema["additionalProperties"] is False
+    assert set(schema["required"]) == set(schema["properties"])
+    assert "reflection" in schema["properties"]
+
+
+def test_narrative_analysis_from_any():
+    """Test analysis metadata normalizes from instances, dicts and None."""
+    from atlassemi.agents import NarrativeAnalysis
+
+    analysis = NarrativeAnalysis.from_any({"constraints": ["Ships Friday"]})
+    assert analysis.constraints == ["Ships Friday"]
+    assert analysis.urgency_signals == []
+    assert NarrativeAnalysis.from_any(analysis) is analysis
+    assert NarrativeAnalysis.from_any(None).reflection == ""
+
+
+def test_narrative_agent_structured_alert_skips_llm():
+    """Test structured alerts are analyzed without an LLM call."""
+    agent = NarrativeAgent(model_router=None)
+
+    def fail(**kwargs):
+        raise AssertionError("LLM should not be called")
+
+    agent._call_llm = fail
+
+    alert = json.dumps({
+        "alert_type": "SPC Western Electric rule 1",
+        "tool": "ETCH-B",
+        "severity": "High",
+        "source": "SPC"
+    })
+    output = agent.execute(AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": alert}
+    ))
+
+    assert "Tool: ETCH-B" in output.facts
+    assert output.hypotheses == []
+    analysis = output.metadata["analysis"]
+    assert analysis.urgency_signals == ["Severity: High"]
+    assert analysis.data_sources_mentioned == ["SPC"]
+
+    key_value = "Alarm: FDC chamber pressure high\nTool = ETCH-B"
+    assert agent.local_response(AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": key_value}
+    )) is not None
+    assert agent.local_response(AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": "Tool: ETCH-B\nYield dropped after the PM"}
+    )) is None
+
+
+def test_narrative_agent_decodes_response_into_analysis():
+    """Test complete responses decode straight into NarrativeAnalysis."""
+    pytest.importorskip("msgspec")
+    from atlassemi.agents import NarrativeAnalysis
+
+    agent = NarrativeAgent(model_router=None)
+    fields = {
+        "observations": ["Yield dropped"],
+        "interpretations": [],
+        "constraints": [],
+        "urgency_signals": [],
+        "data_sources_mentioned": [],
+        "suspected_causes": [],
+        "reflection": "Post-PM excursion"
+    }
+
+    parsed, warnings = agent._parse_json_response(json.dumps(fields))
+    assert isinstance(parsed, NarrativeAnalysis)
+    assert parsed.observations == ["Yield dropped"]
+    assert warnings == ()
+
+    # Partial responses fall back to plain JSON
+    assert agent._parse_json_response('{"observations": ["A"]}') == (
+        {"observations": ["A"]}, ()
+    )
+    with pytest.raises(json.JSONDecodeError):
+        agent._parse_json_response("{ not JSON }")
+
+    # The decoder is compiled once per class
+    assert NarrativeAgent._response_decoder is not None
+    assert agent._response_decoder is NarrativeAgent._response_decoder
+
+
+def test_narrative_agent_salvages_malformed_json():
+    """Test surrounding prose and truncated responses are parsed tolerantly."""
+    agent = NarrativeAgent(model_router=None)
+    agent_input = AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": "Test problem"}
+    )
+
+    agent._call_llm = lambda **kwargs: (
+        'Here is the analysis:\n{"observations": ["Yield dropped"]}\nHope this helps!'
+    )
+    output = agent.execute(agent_input)
+    assert output.facts == ["Yield dropped"]
+    assert len(output.warnings) == 2
+
+    # Cut off mid-array: complete items are kept
+    agent._call_llm = lambda **kwargs: (
+        '{"observations": ["Yield dropped", "Cpk fell"], '
+        '"suspected_causes": ["PM activity", "Chamber sea'
+    )
+    output = agent.execute(agent_input)
+    assert output.facts == ["Yield dropped", "Cpk fell"]
+    assert output.hypotheses == ["PM activity"]
+    assert output.warnings
+
+
+def test_narrative_agent_trivial_narrative_skips_llm():
+    """Test empty or near-empty narratives are answered without an LLM call."""
+    agent = NarrativeAgent(model_router=None)
+
+    def fail(**kwargs):
+        raise AssertionError("LLM should not be called")
+
+    agent._call_llm = fail
+
+    for narrative in ["", "   ", "help"]:
+        output = agent.execute(AgentInput(
+            mode=ProblemMode.EXCURSION,
+            security_tier=SecurityTier.GENERAL_LLM,
+            context={"narrative": narrative}
+        ))
+        assert output.facts == []
+        assert output.hypotheses == []
+        assert output.cost_usd == 0.0
+
+
+def test_narrative_agent_extracts_entities():
+    """Test chambers, Cpk values, lots and tool IDs are found in the narrative."""
+    agent = NarrativeAgent(model_router=None)
+
+    output = agent.execute(AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": (
+            "Yield dropped on Chamber B of ETCH-B after the PM. "
+            "Cpk went from 1.8 to 0.9; lot W1234 is at risk, another lot is fine."
+        )}
+    ))
+
+    assert output.metadata["entities"] == {
+        "chamber": ["Chamber B"],
+        "tool": ["ETCH-B"],
+        "cpk": ["Cpk went from 1.8 to 0.9"],
+        "lot": ["lot W1234"]
+    }
+
+
+def test_narrative_agent_streams_observations():
+    """Test observations are yielded before the rest of the response arrives."""
+    from atlassemi.config import ModelConfig
+
+    agent = NarrativeAgent(model_router=None)
+    response = json.dumps({
+        "observations": ["Yield dropped on Chamber B", "Cpk fell to 0.9"],
+        "suspected_causes": ["PM activity yesterday"],
+        "reflection": "Post-PM excursion"
+    })
+    seen = []
+
+    class StreamingClient:
+        config = ModelConfig(provider="onprem", model_id="test", max_tokens=100)
+
+        def generate_stream(self, prompt, **kwargs):
+            for i in range(0, len(response), 7):
+                seen.append(response[i:i + 7])
+                yield response[i:i + 7]
+            return 10, 5
+
+    agent._get_client = lambda agent_input: StreamingClient()
+    agent_input = AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": "Yield dropped after the PM"}
+    )
+
+    stream = agent.execute_streaming(agent_input)
+    assert next(stream) == "Yield dropped on Chamber B"
+    assert len("".join(seen)) < len(response)  # Before the stream finished
+    assert next(stream) == "Cpk fell to 0.9"
+    with pytest.raises(StopIteration) as stop:
+        next(stream)
+    assert stop.value.value.hypotheses == ["PM activity yesterday"]
+
+    # Local responses yield their observations at once
+    alert = AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": "Alarm: FDC chamber pressure high\nTool = ETCH-B"}
+    )
+    facts = agent.execute(alert).facts
+    assert facts
+    assert list(agent.execute_streaming(alert)) == facts
+
+
+def test_agent_output_to_bytes(monkeypatch):
+    """Test outputs serialize to the same JSON values with every encoder."""
+    import atlassemi.agents.base as base
+
+    output = NarrativeAgent(model_router=None).execute(AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": "Alarm: FDC chamber pressure high\nTool = ETCH-B"}
+    ))
+    output.cost_usd = 8e-05
+    output.metadata["tools"] = {"ETCH-B", "ETCH-C", "LITHO-2"}
+    output.metadata["lots_by_slot"] = {1: "W1234"}
+
+    decoded = json.loads(output.to_bytes())
+    assert decoded["agent_type"] == "narrative"
+    assert decoded["facts"] == list(output.facts)
+    assert decoded["cost_usd"] == 8e-05
+    assert decoded["metadata"]["lots_by_slot"] == {"1": "W1234"}
+    assert decoded["metadata"]["analysis"]["reflection"] == (
+        output.metadata["analysis"].reflection
+    )
+
+    monkeypatch.setattr(base, "msgspec", None)
+    assert json.loads(output.to_bytes()) == decoded
+    monkeypatch.setattr(base, "orjson", None)
+    assert json.loads(output.to_bytes()) == decoded
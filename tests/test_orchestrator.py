@@ -40,6 +40,9 @@ def test_orchestrator_full_workflow_mock():
     # Verify metrics
     assert result.facts_identified >= 0
     assert result.hypotheses_identified >= 0
+    assert set(result.diagnostics) == {
+        "phase_0_ms", "phase_1_ms", "phase_2_ms", "phase_3_ms"
+    }
 
 
 def test_orchestrator_context_passing():
@@ -108,3 +111,566 @@ def test_orchestrator_different_modes():
         )
 
         assert len(result.phases_completed) == 4
+
+
+def test_orchestrator_async_workflow_mock():
+    """Test async workflow matches the sync workflow."""
+    import asyncio
+
+    orchestrator = WorkflowOrchestrator(model_router=None)
+
+    result = asyncio.run(orchestrator.arun_workflow(
+        narrative="Async test yield excursion",
+        mode=ProblemMode.EXCURSION,
+        tier=SecurityTier.GENERAL_LLM,
+        answer_collector=lambda q: {}
+    ))
+
+    assert result.phases_completed == [
+        "Phase 0: Narrative",
+        "Phase 1: Clarification",
+        "Phase 2: Analysis",
+        "Phase 3: Prevention"
+    ]
+    assert "Async test" in result.narrative_output.metadata.get("narrative", "")
+
+
+def test_orchestrator_async_speculative_clarification(monkeypatch):
+    """Test speculative clarification is reused only when its prompt matches."""
+    import asyncio
+
+    orchestrator = WorkflowOrchestrator(model_router=None)
+    agent = orchestrator.clarification_agent
+    original = agent.aexecute
+    runs = []
+
+    async def aexecute(agent_input, on_chunk=None):
+        runs.append(agent_input)
+        return await original(agent_input, on_chunk)
+
+    # Agents are pooled across orchestrators: undo the patch afterwards
+    monkeypatch.setattr(agent, "aexecute", aexecute)
+
+    def run():
+        return asyncio.run(orchestrator.arun_workflow(
+            narrative="Speculative test",
+            mode=ProblemMode.EXCURSION,
+            tier=SecurityTier.GENERAL_LLM,
+            answer_collector=lambda q: {}
+        ))
+
+    # Phase 0 output does not change the clarification prompt: one run
+    run()
+    assert len(runs) == 1
+
+    # Phase 0 output changes the prompt (as it would once narrative_analysis
+    # is passed): speculation is discarded
+    runs.clear()
+    build_input = orchestrator._clarification_input
+
+    def clarification_input(narrative_output, shared_context, mode, tier):
+        agent_input = build_input(narrative_output, shared_context, mode, tier)
+        agent_input.context["narrative_analysis"] = {"observations": ["Drift"]}
+        return agent_input
+
+    orchestrator._clarification_input = clarification_input
+    run()
+    assert len(runs) == 2
+    assert "narrative_analysis" in runs[1].context
+
+
+def test_orchestrator_async_streams_questions(monkeypatch, caplog):
+    """Test async Phase 1 shows each question before the response is complete."""
+    import asyncio
+    import json
+    import logging
+    from atlassemi.config import ModelConfig
+
+    orchestrator = WorkflowOrchestrator(model_router=None)
+    questions = ["Which lot?", "Which chamber?"]
+    shown_before_end = []
+
+    class StreamingClient:
+        """Streams a fixed clarification response in small chunks."""
+
+        config = ModelConfig(provider="onprem", model_id="stream", max_tokens=100)
+
+        def generate_stream(self, prompt, **kwargs):
+            response = json.dumps({"questions": questions, "rationale": "Scope"})
+            for i in range(0, len(response), 8):
+                yield response[i:i + 8]
+            shown_before_end.extend(caplog.messages)
+            return 10, 5
+
+    monkeypatch.setattr(
+        orchestrator.clarification_agent,
+        "_get_client",
+        lambda agent_input: StreamingClient()
+    )
+
+    with caplog.at_level(logging.INFO, logger="atlassemi.orchestrator"):
+        result = asyncio.run(orchestrator.arun_workflow(
+            narrative="Streamed questions test",
+            mode=ProblemMode.EXCURSION,
+            tier=SecurityTier.GENERAL_LLM,
+            answer_collector=lambda q: {}
+        ))
+
+    assert "1. Which lot?" in shown_before_end
+    assert "2. Which chamber?" in caplog.messages
+    assert [q["question"] for q in result.clarification_questions] == questions
+
+
+def test_orchestrator_run_batch_mock():
+    """Test batch runs return one result per narrative with supplied answers."""
+    orchestrator = WorkflowOrchestrator(model_router=None)
+
+    results = orchestrator.run_batch(
+        narratives=["Particle spike on Chamber A", "CD drift on Litho 2"],
+        modes=[ProblemMode.EXCURSION, ProblemMode.IMPROVEMENT],
+        tiers=[SecurityTier.GENERAL_LLM, SecurityTier.GENERAL_LLM],
+        answers_per_narrative=[{"Which lot?": "L123"}, {}]
+    )
+
+    assert len(results) == 2
+    assert results[0].clarification_answers == {"Which lot?": "L123"}
+    assert results[1].clarification_answers == {}
+    for result in results:
+        # Answers were supplied, so Phase 1 did not run
+        assert result.clarification_questions == []
+        assert "Phase 1: Clarification" not in result.phases_completed
+        assert len(result.phases_completed) == 3
+        assert "phase_2_ms" in result.diagnostics
+
+    with pytest.raises(ValueError):
+        orchestrator.run_batch(
+            narratives=["Only one"],
+            modes=[],
+            tiers=[SecurityTier.GENERAL_LLM]
+        )
+
+
+def test_orchestrators_share_pooled_agents():
+    """Test orchestrators with the same configuration reuse their agents."""
+    import gc
+    import weakref
+
+    class Router:
+        pass
+
+    router, other_router = Router(), Router()
+
+    first = WorkflowOrchestrator(model_router=router)
+    second = WorkflowOrchestrator(model_router=router)
+    third = WorkflowOrchestrator(model_router=other_router)
+
+    assert first.narrative_agent is second.narrative_agent
+    assert first.prevention_agent is second.prevention_agent
+    assert first.narrative_agent is not third.narrative_agent
+
+    # Dropping the router releases its pooled agents
+    agent = weakref.ref(third.narrative_agent)
+    del third, other_router
+    gc.collect()
+    assert agent() is None
+
+
+def test_default_answer_collector_reads_piped_answers(monkeypatch, capsys):
+    """Test answers piped on stdin are read one line per question."""
+    import io
+
+    orchestrator = WorkflowOrchestrator(model_router=None)
+    questions = [
+        {"question": "Which lot?", "rationale": "Scope"},
+        {"question": "Which chamber?", "rationale": "Scope"},
+        {"question": "Since when?", "rationale": "Timeline"}
+    ]
+    monkeypatch.setattr("sys.stdin", io.StringIO("L123\nskip\nMonday\n"))
+
+    answers = orchestrator._default_answer_collector(questions)
+
+    assert answers == {"Which lot?": "L123", "Since when?": "Monday"}
+    assert "Q3. Since when?" in capsys.readouterr().out
+
+
+def test_answers_from_file(tmp_path):
+    """Test prepared answers are read one line per question from a file."""
+    from atlassemi.orchestrator import answers_from_file
+
+    questions = [
+        {"question": "Which lot?", "rationale": "Scope"},
+        {"question": "Which chamber?", "rationale": "Scope"},
+        {"question": "Since when?", "rationale": "Timeline"}
+    ]
+    path = tmp_path / "answers.txt"
+    path.write_text("L123\nskip\nMonday\n", encoding="utf-8")
+
+    collect = answers_from_file(str(path))
+
+    assert collect(questions) == {"Which lot?": "L123", "Since when?": "Monday"}
+    with pytest.raises(OSError):
+        answers_from_file(str(tmp_path / "missing.txt"))
+
+
+def test_orchestrator_async_speculative_prevention(monkeypatch):
+    """Test Phase 3 starts from streamed D2-D4 findings and is rerun on revision."""
+    import asyncio
+    import json
+    from atlassemi.config import ModelConfig
+
+    orchestrator = WorkflowOrchestrator(model_router=None)
+    runs = []
+    original = orchestrator.prevention_agent.aexecute
+
+    async def aexecute(agent_input, **kwargs):
+        runs.append(agent_input)
+        return await original(agent_input, **kwargs)
+
+    monkeypatch.setattr(orchestrator.prevention_agent, "aexecute", aexecute)
+
+    class StreamingClient:
+        """Streams a fixed analysis response in small chunks."""
+
+        def __init__(self, model_id, response):
+            self.config = ModelConfig(provider="onprem", model_id=model_id, max_tokens=100)
+            self.response = response
+
+        def generate_stream(self, prompt, **kwargs):
+            for i in range(0, len(self.response), 16):
+                yield self.response[i:i + 16]
+            return 10, 5
+
+    def run(model_id, phases):
+        response = json.dumps({"phases": phases, "facts": ["Fact"] * 10})
+        client = StreamingClient(model_id, response)
+        monkeypatch.setattr(
+            orchestrator.analysis_agent, "_get_client", lambda agent_input: client
+        )
+        return asyncio.run(orchestrator.arun_workflow(
+            narrative="Speculative prevention test",
+            mode=ProblemMode.EXCURSION,
+            tier=SecurityTier.GENERAL_LLM,
+            answer_collector=lambda q: {}
+        ))
+
+    phases = [
+        {"phase": "D2", "findings": ["Yield drop on Chamber B"]},
+        {"phase": "D3", "findings": ["Lots on hold"]},
+        {"phase": "D4", "findings": ["Worn focus ring"]}
+    ]
+
+    # Final report agrees with the streamed findings: one Phase 3 run
+    run("agree", phases)
+    assert len(runs) == 1
+    assert runs[0].context["root_causes"] == ["Worn focus ring"]
+
+    # Final report revises D4: speculation is discarded and Phase 3 reruns
+    runs.clear()
+    run("revise", phases + [{"phase": "D4", "findings": ["Chiller drift"]}])
+    assert [r.context["root_causes"] for r in runs] == [
+        ["Worn focus ring"], ["Chiller drift"]
+    ]
+
+
+def test_workflow_result_from_outputs():
+    """Test metrics are accumulated across the phase outputs."""
+    from atlassemi.agents.base import AgentOutput
+    from atlassemi.orchestrator.workflow import WorkflowResult
+
+    def output(cost, facts, phases):
+        return AgentOutput(
+            agent_type="test",
+            content="",
+            metadata={},
+            eight_d_phases_addressed=phases,
+            facts=facts,
+            hypotheses=["H"],
+            cost_usd=cost
+        )
+
+    result = WorkflowResult.from_outputs(
+        output(0.5, ["F1"], ["D0"]), [], {},
+        output(0.25, ["F2", "F3"], ["D4", "D2"]),
+        output(0.25, [], ["D5", "D4"]),
+        ["Phase 0: Narrative"], []
+    )
+
+    assert result.total_cost_usd == 1.0
+    assert result.facts_identified == 3
+    assert result.hypotheses_identified == 3
+    assert result.eight_d_phases_addressed == ["D0", "D2", "D4", "D5"]
+
+
+def test_orchestrator_logs_progress_instead_of_printing(capsys, caplog):
+    """Test banners and questions are logged when answers come from a collector."""
+    import logging
+
+    orchestrator = WorkflowOrchestrator(model_router=None)
+
+    with caplog.at_level(logging.INFO, logger="atlassemi.orchestrator"):
+        orchestrator.run_workflow(
+            narrative="Logged yield excursion",
+            mode=ProblemMode.EXCURSION,
+            tier=SecurityTier.GENERAL_LLM,
+            answer_collector=lambda q: {}
+        )
+
+    assert capsys.readouterr().out == ""
+    assert "PHASE 0: NARRATIVE ANALYSIS" in caplog.text
+    assert "Clarification questions:" in caplog.text
+
+
+def test_phase_inputs_share_narrative_context():
+    """Test Phases 1-3 layer their context over one shared Phase 0 mapping."""
+    from atlassemi.agents.base import AgentOutput
+    from atlassemi.orchestrator.workflow import _narrative_context
+
+    orchestrator = WorkflowOrchestrator(model_router=None)
+    narrative_output = AgentOutput(
+        agent_type="narrative",
+        content="",
+        metadata={"narrative": "Yield drop on Chamber B"},
+        facts=["Yield dropped"]
+    )
+    analysis_output = AgentOutput(agent_type="analysis", content="", metadata={})
+    mode, tier = ProblemMode.EXCURSION, SecurityTier.GENERAL_LLM
+
+    shared = _narrative_context(narrative_output)
+    inputs = [
+        orchestrator._clarification_input(narrative_output, shared, mode, tier),
+        orchestrator._analysis_input(narrative_output, shared, {}, mode, tier),
+        orchestrator._prevention_input(analysis_output, shared, mode, tier)
+    ]
+
+    assert "shared_context" not in narrative_output.metadata
+    for agent_input in inputs:
+        assert agent_input.context.parents.maps == [shared]
+        assert agent_input.context["narrative"] == "Yield drop on Chamber B"
+        assert agent_input.context["observations"] == ["Yield dropped"]
+    assert inputs[1].context["clarifications"] == {}
+    with pytest.raises(TypeError):
+        shared["narrative"] = "changed"
+
+
+def test_orchestrator_max_parallel_agents(monkeypatch):
+    """Test speculative runs never exceed the max_parallel_agents cap."""
+    import asyncio
+
+    with pytest.raises(ValueError):
+        WorkflowOrchestrator(model_router=None, max_parallel_agents=0)
+
+    orchestrator = WorkflowOrchestrator(model_router=None, max_parallel_agents=1)
+    running = []
+    peak = 0
+
+    for agent in (orchestrator.narrative_agent, orchestrator.clarification_agent):
+        original = agent.aexecute
+
+        async def aexecute(agent_input, on_chunk=None, original=original):
+            nonlocal peak
+            running.append(1)
+            peak = max(peak, len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+            return await original(agent_input, on_chunk)
+
+        monkeypatch.setattr(agent, "aexecute", aexecute)
+
+    result = asyncio.run(orchestrator.arun_workflow(
+        narrative="Capped test",
+        mode=ProblemMode.EXCURSION,
+        tier=SecurityTier.GENERAL_LLM,
+        answer_collector=lambda q: {}
+    ))
+
+    assert len(result.phases_completed) == 4
+    assert peak == 1
+
+
+def test_orchestrator_defers_prevention():
+    """Test Phase 3 can run in the background after the analysis returns."""
+    orchestrator = WorkflowOrchestrator(model_router=None)
+
+    result = orchestrator.run_workflow(
+        narrative="Deferred prevention test",
+        mode=ProblemMode.EXCURSION,
+        tier=SecurityTier.GENERAL_LLM,
+        answer_collector=lambda questions: {},
+        defer_prevention=True
+    )
+
+    assert result.prevention_output is None
+    assert "Phase 3: Prevention" not in result.phases_completed
+
+    completed = result.wait_for_prevention(timeout=10)
+
+    assert completed.prevention_output.agent_type == "prevention"
+    assert completed.phases_completed[-1] == "Phase 3: Prevention"
+    assert completed.total_cost_usd == pytest.approx(
+        result.total_cost_usd + completed.prevention_output.cost_usd
+    )
+    assert completed.wait_for_prevention() is completed
+
+
+def test_orchestrator_batch_workflow_mock():
+    """Test several workflows run phase by phase as batches."""
+    orchestrator = WorkflowOrchestrator(model_router=None)
+    modes = [
+        ProblemMode.EXCURSION,
+        ProblemMode.IMPROVEMENT,
+        ProblemMode.OPERATIONS
+    ]
+
+    tiers = [SecurityTier.GENERAL_LLM] * 3
+
+    results = orchestrator.run_batch(
+        narratives=[f"Test for {mode.value} mode" for mode in modes],
+        modes=modes,
+        tiers=tiers,
+        answer_collector=lambda q: {}
+    )
+
+    assert len(results) == 3
+    for result, mode in zip(results, modes):
+        assert len(result.phases_completed) == 4
+        assert result.clarification_questions
+        assert result.analysis_output.metadata["mode"] == mode.value
+
+    with pytest.raises(ValueError, match="not both"):
+        orchestrator.run_batch(
+            ["One narrative"], modes[:1], tiers[:1],
+            answers_per_narrative=[{}], answer_collector=lambda q: {}
+        )
+
+
+def test_orchestrator_appends_phase_outputs_to_store():
+    """Test workflow stores aggregate costs and counts across runs."""
+    from atlassemi.orchestrator import WorkflowStore
+
+    store = WorkflowStore()
+    orchestrator = WorkflowOrchestrator(model_router=None, store=store)
+
+    results = [
+        orchestrator.run_workflow(
+            narrative=f"Store test narrative {i}",
+            mode=ProblemMode.EXCURSION,
+            tier=SecurityTier.GENERAL_LLM,
+            answer_collector=lambda q: {}
+        )
+        for i in range(2)
+    ]
+    deferred = orchestrator.run_workflow(
+        narrative="Store test with deferred prevention",
+        mode=ProblemMode.EXCURSION,
+        tier=SecurityTier.GENERAL_LLM,
+        answer_collector=lambda q: {},
+        defer_prevention=True
+    )
+    results.append(deferred.wait_for_prevention(timeout=10))
+
+    assert len(store) == 9
+    assert set(store.cost_by_agent()) == {"narrative", "analysis", "prevention"}
+    assert store.total_cost_usd() == pytest.approx(
+        sum(r.total_cost_usd for r in results)
+    )
+    assert store.total_facts() == sum(r.facts_identified for r in results)
+    assert store.total_hypotheses() == sum(r.hypotheses_identified for r in results)
+
+
+def test_gather_answers_fans_out():
+    """Test gather_answers looks up all answers at once."""
+    import asyncio
+    import threading
+    from atlassemi.orchestrator import gather_answers
+
+    questions = [
+        {"question": q, "rationale": ""} for q in ("Which tool?", "When?", "Lot?")
+    ]
+    # Each blocking lookup only returns once all three are in flight
+    barrier = threading.Barrier(len(questions), timeout=5)
+
+    def lookup(q):
+        barrier.wait()
+        return "" if q["question"] == "Lot?" else f"{q['question']} answered"
+
+    assert asyncio.run(gather_answers(lookup)(questions)) == {
+        "Which tool?": "Which tool? answered",
+        "When?": "When? answered"
+    }
+
+    async def alookup(q):
+        await asyncio.sleep(0)
+        return "A"
+
+    assert asyncio.run(gather_answers(alookup)(questions)) == dict.fromkeys(
+        ["Which tool?", "When?", "Lot?"], "A"
+    )
+
+
+def test_orchestrator_accepts_async_answer_collector():
+    """Test async answer collectors work in sync and async workflows."""
+    import asyncio
+
+    orchestrator = WorkflowOrchestrator(model_router=None)
+
+    async def collector(questions):
+        await asyncio.sleep(0)
+        return {questions[0]["question"]: "Since Monday"}
+
+    result = orchestrator.run_workflow(
+        narrative="Async collector test",
+        mode=ProblemMode.EXCURSION,
+        tier=SecurityTier.GENERAL_LLM,
+        answer_collector=collector
+    )
+    assert list(result.clarification_answers.values()) == ["Since Monday"]
+
+    loops = []
+
+    async def run():
+        loops.append(asyncio.get_running_loop())
+
+        async def on_loop(questions):
+            loops.append(asyncio.get_running_loop())
+            return await collector(questions)
+
+        # A sync callable returning an awaitable is awaited on this loop
+        result = await orchestrator.arun_workflow(
+            narrative="Async collector test",
+            mode=ProblemMode.EXCURSION,
+            tier=SecurityTier.GENERAL_LLM,
+            answer_collector=lambda questions: on_loop(questions)
+        )
+
+        # The sync API cannot run an async collector inside a running loop
+        with pytest.raises(RuntimeError, match="arun_workflow"):
+            orchestrator.run_workflow(
+                narrative="Async collector test",
+                mode=ProblemMode.EXCURSION,
+                tier=SecurityTier.GENERAL_LLM,
+                answer_collector=collector
+            )
+        return result
+
+    result = asyncio.run(run())
+    assert list(result.clarification_answers.values()) == ["Since Monday"]
+    assert loops[0] is loops[1]
+
+
+def test_workflow_result_pickles():
+    """Test results round-trip through pickle (e.g. from worker processes)."""
+    import pickle
+
+    orchestrator = WorkflowOrchestrator(model_router=None)
+    result = orchestrator.run_workflow(
+        narrative="Pickle test yield excursion on Chamber B",
+        mode=ProblemMode.EXCURSION,
+        tier=SecurityTier.GENERAL_LLM,
+        answer_collector=lambda questions: {}
+    )
+
+    restored = pickle.loads(pickle.dumps(result))
+
+    assert restored.phases_completed == result.phases_completed
+    assert restored.narrative_output.facts == result.narrative_output.facts
+    assert restored.total_cost_usd == result.total_cost_usd
@@ -0,0 +1,81 @@
+"""Tests for the concurrent agent pipeline"""
+
+import asyncio
+
+import pytest
+from atlassemi.agents import (
+    AnalysisAgent,
+    ClarificationAgent,
+    NarrativeAgent,
+    PreventionAgent,
+    run_pipeline
+)
+from atlassemi.agents.base import AgentInput, ProblemMode, SecurityTier
+
+
+def make_input():
+    return AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": "Yield drop on Chamber B"}
+    )
+
+
+def test_run_pipeline_passes_upstream_outputs():
+    """Test each agent sees the outputs of the agents it depends on."""
+    agents = [
+        NarrativeAgent(), ClarificationAgent(), AnalysisAgent(), PreventionAgent()
+    ]
+    seen = {}
+
+    for agent in agents:
+        original = agent.aexecute
+
+        async def aexecute(agent_input, agent=agent, original=original):
+            seen[agent.agent_type] = set(agent_input.context)
+            return await original(agent_input)
+
+        agent.aexecute = aexecute
+
+    outputs = asyncio.run(run_pipeline(agents, make_input()))
+
+    assert set(outputs) == {"narrative", "clarification", "analysis", "prevention"}
+    assert seen["narrative"] == {"narrative"}
+    assert seen["analysis"] == {
+        "narrative", "narrative_output", "clarification_output"
+    }
+    assert seen["prevention"] == {"narrative", "narrative_output", "analysis_output"}
+
+
+def test_run_pipeline_overlaps_independent_agents():
+    """Test agents without a data dependency run concurrently."""
+    narrative, clarification = NarrativeAgent(), ClarificationAgent()
+    clarification.dependencies = frozenset()
+    running = []
+    peak = 0
+
+    for agent in (narrative, clarification):
+        original = agent.aexecute
+
+        async def aexecute(agent_input, original=original):
+            nonlocal peak
+            running.append(1)
+            peak = max(peak, len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+            return await original(agent_input)
+
+        agent.aexecute = aexecute
+
+    asyncio.run(run_pipeline([narrative, clarification], make_input()))
+
+    assert peak == 2
+
+
+def test_run_pipeline_rejects_cycles():
+    """Test circular dependencies are reported instead of deadlocking."""
+    narrative = NarrativeAgent()
+    narrative.dependencies = frozenset({"clarification"})
+
+    with pytest.raises(ValueError, match="Circular"):
+        asyncio.run(run_pipeline([narrative, ClarificationAgent()], make_input()))
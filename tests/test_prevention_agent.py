@@ -4,6 +4,7 @@ import pytest
 import json
 from atlassemi.agents import PreventionAgent
 from atlassemi.agents.base import AgentInput, ProblemMode, SecurityTier
+from atlassemi.config import MockModelRouter
 
 
 def test_prevention_agent_execution():
@@ -25,8 +26,6 @@ def test_prevention_agent_execution():
 
 def test_prevention_agent_prevention_plan():
     """Test prevention agent generates prevention plan."""
-    agent = PreventionAgent(model_router=None)
-
     mock_response = json.dumps({
         "permanent_actions": [
             {
@@ -71,7 +70,9 @@ def test_prevention_agent_prevention_plan():
         ]
     })
 
-    agent._call_llm = lambda **kwargs: mock_response
+    agent = PreventionAgent(
+        model_router=MockModelRouter({"synthesis": mock_response})
+    )
 
     agent_input = AgentInput(
         mode=ProblemMode.EXCURSION,
@@ -89,6 +90,14 @@ def test_prevention_agent_prevention_plan():
     assert "D5" in output.eight_d_phases_addressed
     assert "D7" in output.eight_d_phases_addressed
     assert "D8" in output.eight_d_phases_addressed
+    # The plan is pretty-printed for display
+    assert output.content == json.dumps(json.loads(mock_response), indent=2)
+
+    # Also when the JSON arrives minified inside prose
+    agent._call_llm = lambda **kwargs: (
+        f"Here is the plan:\n{json.dumps(json.loads(mock_response))}"
+    )
+    assert agent.execute(agent_input).content == output.content
 
 
 def test_prevention_agent_mode_awareness():
@@ -126,3 +135,23 @@ def test_prevention_agent_mode_awareness():
                 "operations" in prompt.lower() or
                 "workflow" in prompt.lower()
             )
+
+
+def test_prevention_agent_sends_static_instructions_as_system_prompt():
+    """Test the static instructions are split off for prompt caching."""
+    agent = PreventionAgent(model_router=None)
+    calls = []
+    agent._call_llm = lambda **kwargs: calls.append(kwargs) or "{}"
+
+    agent_input = AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"analysis": {}, "root_causes": ["Worn RF match"]}
+    )
+
+    agent.execute(agent_input)
+    system_prompt, prompt = calls[0]["system_prompt"], calls[0]["prompt"]
+
+    assert "Worn RF match" in prompt and "Worn RF match" not in system_prompt
+    assert "## Your Task" in system_prompt and "## Your Task" not in prompt
+    assert sorted(agent.generate_prompt(agent_input)) == sorted(system_prompt + prompt)
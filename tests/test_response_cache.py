@@ -0,0 +1,350 @@
+"""Tests for Response Cache"""
+
+import dataclasses
+
+import pytest
+from atlassemi.config import ResponseCache, SemanticCache, ModelConfig
+from atlassemi.agents import NarrativeAgent
+from atlassemi.agents.base import AgentInput, ProblemMode, SecurityTier
+
+
+class CountingClient:
+    """Model client stub that counts generate() calls."""
+
+    def __init__(self):
+        self.config = ModelConfig(
+            provider="anthropic", model_id="test-model", max_tokens=1000
+        )
+        self.calls = 0
+
+    def generate(self, prompt, system_prompt=None, max_tokens=None):
+        self.calls += 1
+        return '{"observations": ["Cached fact"]}', 10, 20
+
+
+class StubRouter:
+    """Router stub that always returns the same client."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def get_model_client(self, task_type, tier):
+        return self.client
+
+    def track_usage(self, **kwargs):
+        pass
+
+
+def keyword_embed(text):
+    """Toy embedding: unit vector over a few fab keywords."""
+    np = pytest.importorskip("numpy")
+    words = ["yield", "chamber", "overlay", "queue"]
+    vector = np.array(
+        [float(w in text.lower()) for w in words] + [0.1], dtype=np.float32
+    )
+    return vector / np.linalg.norm(vector)
+
+
+def test_response_cache_roundtrip(tmp_path):
+    """Test stored entries are returned on lookup."""
+    cache = ResponseCache(cache_dir=tmp_path)
+    key = cache.make_key(model_id="m", prompt="p")
+
+    assert cache.get(key) is None
+
+    cache.set(key, {"response": "hello"})
+
+    assert cache.get(key) == {"response": "hello"}
+
+
+def test_response_cache_key_depends_on_fields():
+    """Test keys are deterministic and field-sensitive."""
+    key = ResponseCache.make_key(model_id="m", prompt="p")
+
+    assert key == ResponseCache.make_key(prompt="p", model_id="m")
+    assert key != ResponseCache.make_key(model_id="m", prompt="q")
+
+
+def test_agent_reuses_cached_response(tmp_path):
+    """Test identical agent calls hit the LLM only once."""
+    client = CountingClient()
+    agent = NarrativeAgent(
+        model_router=StubRouter(client),
+        response_cache=ResponseCache(cache_dir=tmp_path)
+    )
+
+    agent_input = AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": "Yield drop on Chamber B"}
+    )
+
+    first = agent.execute(agent_input)
+    second = agent.execute(agent_input)
+
+    assert client.calls == 1
+    assert first.facts == second.facts == ["Cached fact"]
+
+
+def test_semantic_cache_matches_similar_text(tmp_path):
+    """Test near-duplicate text hits and unrelated text misses."""
+    pytest.importorskip("numpy")
+    cache = SemanticCache(cache_dir=tmp_path, embed=keyword_embed)
+
+    cache.add("Yield drop on Chamber B", {"response": "r1"})
+
+    assert cache.lookup("Chamber B yield is down") == {"response": "r1"}
+    assert cache.lookup("Overlay shift on lot X") is None
+
+    # Looser per-lookup threshold
+    assert cache.lookup("Yield drop on lot X") is None
+    assert cache.lookup("Yield drop on lot X", threshold=0.7) == {"response": "r1"}
+
+
+def test_semantic_cache_persists_by_namespace(tmp_path):
+    """Test entries survive reload and stay within their namespace."""
+    pytest.importorskip("numpy")
+    SemanticCache(cache_dir=tmp_path, embed=keyword_embed).add(
+        "Yield drop on Chamber B", {"response": "r1"}, namespace="model-a"
+    )
+
+    reloaded = SemanticCache(cache_dir=tmp_path, embed=keyword_embed)
+
+    assert reloaded.lookup("yield chamber", namespace="model-a") == {"response": "r1"}
+    assert reloaded.lookup("yield chamber", namespace="model-b") is None
+
+
+def test_semantic_cache_quantized(tmp_path):
+    """Test int8 embeddings still match, persist, and convert on reload."""
+    np = pytest.importorskip("numpy")
+    cache = SemanticCache(cache_dir=tmp_path, embed=keyword_embed, quantize=True)
+
+    cache.add("Yield drop on Chamber B", {"response": "r1"})
+    cache.add("Overlay shift on lot X", {"response": "r2"})
+
+    assert cache.lookup("Chamber B yield is down") == {"response": "r1"}
+    assert cache.lookup("lot X overlay") == {"response": "r2"}
+    assert cache.lookup("Particle count high") is None
+    assert np.load(cache._dir("default") / "embeddings.npy").dtype == np.int8
+
+    for quantize in (True, False):
+        reloaded = SemanticCache(
+            cache_dir=tmp_path, embed=keyword_embed, quantize=quantize
+        )
+        assert reloaded.lookup("Chamber B yield is down") == {"response": "r1"}
+
+
+def test_narrative_agent_uses_semantic_cache(tmp_path):
+    """Test paraphrased narratives reuse the cached analysis."""
+    pytest.importorskip("numpy")
+    client = CountingClient()
+    agent = NarrativeAgent(
+        model_router=StubRouter(client),
+        semantic_cache=SemanticCache(cache_dir=tmp_path, embed=keyword_embed)
+    )
+
+    for narrative in ["Yield drop on Chamber B", "Chamber B yield went down"]:
+        agent.execute(AgentInput(
+            mode=ProblemMode.EXCURSION,
+            security_tier=SecurityTier.GENERAL_LLM,
+            context={"narrative": narrative}
+        ))
+
+    assert client.calls == 1
+
+
+def test_semantic_cache_is_namespaced_by_tier(tmp_path):
+    """Test a cached analysis is never served to another security tier."""
+    pytest.importorskip("numpy")
+    client = CountingClient()
+    agent = NarrativeAgent(
+        model_router=StubRouter(client),
+        semantic_cache=SemanticCache(cache_dir=tmp_path, embed=keyword_embed),
+        enable_cache=False
+    )
+
+    for tier in [SecurityTier.TOP_SECRET, SecurityTier.GENERAL_LLM]:
+        agent.execute(AgentInput(
+            mode=ProblemMode.EXCURSION,
+            security_tier=tier,
+            context={"narrative": "Yield drop on Chamber B"}
+        ))
+
+    assert client.calls == 2
+
+
+def test_agent_memoizes_responses_in_memory():
+    """Test repeated prompts skip the LLM unless the memo is disabled."""
+    agent_input = AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": "Overlay shift on lot X"}
+    )
+
+    for enable_cache, expected_calls in [(True, 1), (False, 2)]:
+        client = CountingClient()
+        agent = NarrativeAgent(
+            model_router=StubRouter(client), enable_cache=enable_cache
+        )
+
+        agent.execute(agent_input)
+        agent.execute(agent_input)
+
+        assert client.calls == expected_calls
+
+
+def test_response_cache_hits_and_misses_are_tracked(tmp_path):
+    """Test persistent cache lookups are counted by the router."""
+    from atlassemi.config import ModelRouter, RuntimeMode
+
+    client = CountingClient()
+    router = ModelRouter(mode=RuntimeMode.DEV)
+    router.get_model_client = lambda task_type, tier: client
+
+    agent_input = AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": "Particle spike after PM"}
+    )
+
+    # Fresh agents (no in-memory memo) sharing one on-disk cache
+    for _ in range(2):
+        NarrativeAgent(
+            model_router=router, response_cache=ResponseCache(cache_dir=tmp_path)
+        ).execute(agent_input)
+
+    assert client.calls == 1
+    assert router.usage_stats["cache_misses"] == 1
+    assert router.usage_stats["cache_hits"] == 1
+
+
+def test_response_cache_key_is_independent_of_orjson(monkeypatch):
+    """Test keys are identical with and without orjson installed."""
+    from atlassemi.config import response_cache
+
+    fields = {"prompt": "Überlast auf Kammer B", "temperature": 0.7, "n": [1, None]}
+    key = ResponseCache.make_key(**fields)
+
+    monkeypatch.setattr(response_cache, "orjson", None)
+    assert ResponseCache.make_key(**fields) == key
+
+
+def test_agent_reuses_cached_output_at_temperature_zero():
+    """Test the action cache serves whole outputs for deterministic calls."""
+    from atlassemi.agents import MemoryActionCache
+
+    client = CountingClient()
+    agent = NarrativeAgent(
+        model_router=StubRouter(client),
+        enable_cache=False,
+        action_cache=MemoryActionCache()
+    )
+    agent_input = AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": "Yield drop on Chamber B"}
+    )
+
+    # Sampled calls are never served from the action cache
+    agent.execute(agent_input)
+    agent.execute(agent_input)
+    assert client.calls == 2
+
+    client.config = dataclasses.replace(client.config, temperature=0.0)
+    first = agent.execute(agent_input)
+    second = agent.execute(agent_input)
+
+    assert client.calls == 3
+    assert not first.cache_hit
+    assert second.cache_hit
+    assert second.facts == first.facts == ["Cached fact"]
+
+    # Other modes are cached separately
+    agent.execute(AgentInput(
+        mode=ProblemMode.IMPROVEMENT,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": "Yield drop on Chamber B"}
+    ))
+    assert client.calls == 4
+
+
+def test_sqlite_action_cache_persists(tmp_path):
+    """Test outputs stored on disk are returned by a new cache instance."""
+    from atlassemi.agents import AgentOutput, SQLiteActionCache
+
+    path = tmp_path / "actions.sqlite3"
+    cache = SQLiteActionCache(path)
+    assert cache.get("key") is None
+    cache.set("key", AgentOutput(
+        agent_type="narrative", content="Done", metadata={}, facts=("A",)
+    ))
+    cache.close()
+
+    reopened = SQLiteActionCache(path)
+    output = reopened.get("key")
+    reopened.close()
+
+    assert output.content == "Done"
+    assert output.facts == ("A",)
+
+
+def test_orchestrator_passes_similarity_threshold(tmp_path):
+    """Test the orchestrator's similarity threshold reaches Phase 0 lookups."""
+    pytest.importorskip("numpy")
+    from atlassemi.orchestrator import WorkflowOrchestrator
+
+    client = CountingClient()
+    orchestrator = WorkflowOrchestrator(
+        model_router=StubRouter(client),
+        semantic_cache=SemanticCache(cache_dir=tmp_path, embed=keyword_embed),
+        similarity_threshold=0.7
+    )
+
+    for narrative in ["Yield drop on Chamber B", "Yield drop on lot X"]:
+        orchestrator.narrative_agent.execute(AgentInput(
+            mode=ProblemMode.EXCURSION,
+            security_tier=SecurityTier.GENERAL_LLM,
+            context={"narrative": narrative}
+        ))
+
+    assert client.calls == 1
+
+    with pytest.raises(ValueError, match="similarity_threshold"):
+        WorkflowOrchestrator(model_router=None, similarity_threshold=1.5)
+
+
+def test_deterministic_router_enables_action_cache(tmp_path):
+    """Test deterministic routers reach the action cache, one lookup per call."""
+    from atlassemi.agents import MemoryActionCache
+    from atlassemi.config import ModelRouter, RuntimeMode
+
+    assert ModelRouter(mode=RuntimeMode.DEV).get_model_config(
+        "reasoning", SecurityTier.GENERAL_LLM
+    ).temperature != 0
+
+    router = ModelRouter(mode=RuntimeMode.DEV, deterministic=True)
+    config = router.get_model_config("reasoning", SecurityTier.GENERAL_LLM)
+    assert config.temperature == 0
+
+    client = CountingClient()
+    client.config = config
+    router.get_model_client = lambda task_type, tier: client
+    agent_input = AgentInput(
+        mode=ProblemMode.EXCURSION,
+        security_tier=SecurityTier.GENERAL_LLM,
+        context={"narrative": "Particle spike after PM"}
+    )
+
+    # Fresh agents (no in-memory memo) sharing both caches
+    action_cache = MemoryActionCache()
+    for _ in range(2):
+        output = NarrativeAgent(
+            model_router=router,
+            response_cache=ResponseCache(cache_dir=tmp_path),
+            action_cache=action_cache
+        ).execute(agent_input)
+
+    assert client.calls == 1
+    assert output.cache_hit
+    assert router.usage_stats["cache_misses"] == 1
+    assert router.usage_stats["cache_hits"] == 1
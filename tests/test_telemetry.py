@@ -0,0 +1,73 @@
+"""Tests for performance counters"""
+
+import json
+import logging
+
+from atlassemi.telemetry import Counter
+
+
+def test_counter_incr_and_time():
+    """Test counters accumulate increments and timed blocks."""
+    counters = Counter()
+    counters.incr("calls")
+    counters.incr("tokens_in", 120)
+    counters.incr("tokens_in", 30)
+
+    with counters.time("step_ms"):
+        pass
+    counters.lap("lap_ms")
+
+    values = counters.snapshot()
+    assert values["calls"] == 1.0
+    assert values["tokens_in"] == 150.0
+    assert values["step_ms"] >= 0.0
+    assert values["lap_ms"] >= 0.0
+
+    total = Counter()
+    total.merge(counters)
+    total.merge(counters)
+    assert total.snapshot()["tokens_in"] == 300.0
+
+
+def test_counter_dump(tmp_path, monkeypatch, caplog):
+    """Test dump writes JSON to ATLASSEMI_COUNTERS_FILE, else the log."""
+    counters = Counter()
+    counters.incr("workflows")
+
+    path = tmp_path / "counters.json"
+    monkeypatch.setenv("ATLASSEMI_COUNTERS_FILE", str(path))
+    counters.dump()
+    assert json.loads(path.read_text()) == {"workflows": 1.0}
+
+    monkeypatch.delenv("ATLASSEMI_COUNTERS_FILE")
+    with caplog.at_level(logging.INFO, logger="atlassemi.telemetry.counters"):
+        counters.dump()
+    assert '"workflows": 1.0' in caplog.text
+
+    counters.reset()
+    assert counters.snapshot() == {}
+
+
+def test_start_queue_logging_hands_records_to_handlers():
+    """Test records reach the handlers through the background listener."""
+    from atlassemi.telemetry import start_queue_logging
+
+    class ListHandler(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.messages = []
+
+        def emit(self, record):
+            self.messages.append(record.getMessage())
+
+    handler = ListHandler()
+    listener = start_queue_logging(handler, logger_name="atlassemi.test_queue")
+    try:
+        logging.getLogger("atlassemi.test_queue.child").info("Phase %d", 0)
+    finally:
+        listener.stop()
+        logger = logging.getLogger("atlassemi.test_queue")
+        for queue_handler in list(logger.handlers):
+            logger.removeHandler(queue_handler)
+
+    assert handler.messages == ["Phase 0"]
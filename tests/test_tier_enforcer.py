@@ -4,7 +4,8 @@ import pytest
 from atlassemi.security.tier_enforcer import (
     TierEnforcer,
     SecurityViolationError,
-    SecurityTier
+    SecurityTier,
+    ToolCategory
 )
 
 
@@ -50,3 +51,63 @@ def test_tier_enforcer_allows_local_tools():
         enforcer = TierEnforcer(current_tier=tier)
         # Should not raise
         assert enforcer.validate_tool_use("git") is True
+
+
+def test_tier_enforcer_accepts_agent_security_tier():
+    """Test tiers from agents.base are matched by value."""
+    from atlassemi.agents.base import SecurityTier as AgentSecurityTier
+
+    enforcer = TierEnforcer(current_tier=AgentSecurityTier.CONFIDENTIAL_FAB)
+
+    assert enforcer.current_tier is SecurityTier.CONFIDENTIAL_FAB
+    assert enforcer.get_allowed_tools() == sorted(enforcer.get_allowed_tools())
+    assert "factory_spc" in enforcer.get_allowed_tools()
+    assert "anthropic" not in enforcer.get_allowed_tools()
+
+
+def test_tier_violation_suggestion():
+    """Test violations carry a tier-specific suggestion naming the tool."""
+    enforcer = TierEnforcer(current_tier=SecurityTier.TOP_SECRET)
+
+    with pytest.raises(SecurityViolationError):
+        enforcer.validate_tool_use("openai")
+
+    violation = enforcer.violations[0]
+    assert violation.suggestion == "Use onprem_llm instead of openai"
+    assert violation.required_tier is SecurityTier.GENERAL_LLM
+
+
+def test_tier_violations_summary():
+    """Test the summary lists every violation in order."""
+    enforcer = TierEnforcer(current_tier=SecurityTier.TOP_SECRET)
+    assert enforcer.get_violations_summary() == (
+        "No security violations in this session."
+    )
+
+    for tool in ("openai", "anthropic"):
+        with pytest.raises(SecurityViolationError):
+            enforcer.validate_tool_use(tool)
+
+    lines = enforcer.get_violations_summary().split("\n")
+
+    assert lines[:4] == [
+        "# Security Violations (2)", "", "Current Tier: TOP_SECRET", ""
+    ]
+    assert lines[4:6] == ["## Violation 1", "- **Tool:** openai"]
+    assert lines[11:13] == ["## Violation 2", "- **Tool:** anthropic"]
+    assert lines[16] == "- **Suggestion:** Use onprem_llm instead of anthropic"
+    assert len(lines) == 4 + 7 * 2
+
+
+def test_tier_enforcer_subclass_tables():
+    """Test subclasses overriding the tool table get their own allow-sets."""
+    class CustomEnforcer(TierEnforcer):
+        TOOL_CATEGORIES = {
+            **TierEnforcer.TOOL_CATEGORIES,
+            "wafer_map_viewer": ToolCategory.LOCAL_TOOL
+        }
+
+    assert CustomEnforcer(SecurityTier.TOP_SECRET).validate_tool_use("wafer_map_viewer")
+    assert "wafer_map_viewer" not in TierEnforcer(
+        SecurityTier.TOP_SECRET
+    ).get_allowed_tools()